@@ -1,13 +1,15 @@
 """API Gateway service for Microservices Health Monitor."""
+import atexit
 import logging
 import time
 from flask import Flask, jsonify, request, g
 from prometheus_client import Counter, Histogram, Gauge, generate_latest, CONTENT_TYPE_LATEST
 from config import Config
-from redis_client import RedisClient
+from redis_client import create_redis_client, parse_addresses, parse_bulkheads, pool_size_for, workload
 from structured_logger import setup_logger, LoggerAdapter
-from request_context import RequestContextMiddleware, get_trace_id
+from request_context import RequestContextMiddleware, get_remaining_budget, get_trace_id
 from rate_limiter import RateLimiter, rate_limit
+from local_limiter import LocalRateLimiter, SharedMemoryRateLimiter
 
 # Initialize Flask app
 app = Flask(__name__)
@@ -23,26 +25,66 @@ base_logger = setup_logger(
 # Create logger adapter for contextual logging
 logger = LoggerAdapter(base_logger, {})
 
-# Initialize Redis connection with connection pool
-redis_client = RedisClient(
+# One pooled connection per request thread, within this worker's share of
+# the deployment's connection budget
+redis_pool_size = Config.REDIS_MAX_CONNECTIONS or pool_size_for(
+    threads=Config.GUNICORN_THREADS,
+    processes=Config.GUNICORN_WORKERS,
+    replicas=Config.REDIS_MAX_REPLICAS,
+    budget=Config.REDIS_CONNECTION_BUDGET
+)
+# Separate pools for rate limiting, data and health check commands (REDIS_BULKHEADS)
+redis_bulkheads = parse_bulkheads(Config.REDIS_BULKHEADS)
+
+# Initialize Redis connection with connection pool (one per node when sharded)
+redis_client = create_redis_client(
     host=Config.REDIS_HOST,
     port=Config.REDIS_PORT,
     password=Config.REDIS_PASSWORD if Config.REDIS_PASSWORD else None,
     db=Config.REDIS_DB,
-    max_connections=50,
+    shards=parse_addresses(Config.REDIS_SHARDS),
+    max_connections=redis_pool_size,
     socket_timeout=5,
     socket_connect_timeout=5,
     retry_on_timeout=True,
-    health_check_interval=30
+    health_check_interval=30,
+    slow_command_threshold_ms=Config.REDIS_SLOW_COMMAND_MS,
+    trace_id_getter=get_trace_id,
+    budget_getter=get_remaining_budget,
+    replicas=parse_addresses(Config.REDIS_REPLICAS),
+    sentinels=parse_addresses(Config.REDIS_SENTINELS, default_port=26379),
+    sentinel_service=Config.REDIS_SENTINEL_SERVICE,
+    warm_connections=Config.REDIS_WARM_CONNECTIONS,
+    preload_scripts=Config.REDIS_PRELOAD_SCRIPTS,
+    idle_timeout=Config.REDIS_IDLE_TIMEOUT or None,
+    bulkheads=redis_bulkheads
 )
 
+# In-process limiter used while Redis is unavailable
+local_limiter = None
+if Config.RATE_LIMIT_SHARED_MEMORY_PATH:
+    local_limiter = SharedMemoryRateLimiter(
+        Config.RATE_LIMIT_SHARED_MEMORY_PATH,
+        slots=Config.RATE_LIMIT_LOCAL_MAX_KEYS
+    )
+elif Config.RATE_LIMIT_LOCAL_FALLBACK:
+    local_limiter = LocalRateLimiter(max_keys=Config.RATE_LIMIT_LOCAL_MAX_KEYS)
+
 # Initialize rate limiter
 rate_limiter = RateLimiter(
     redis_client=redis_client,
     default_limit=100,  # 100 requests
-    default_window=60   # per 60 seconds
+    default_window=60,  # per 60 seconds
+    default_algorithm=Config.RATE_LIMIT_ALGORITHM,
+    lease_fraction=Config.RATE_LIMIT_LEASE_FRACTION,
+    lease_error_bound=Config.RATE_LIMIT_LEASE_ERROR_BOUND,
+    lease_ttl=Config.RATE_LIMIT_LEASE_TTL,
+    local_limiter=local_limiter,
+    deny_cache_size=Config.RATE_LIMIT_DENY_CACHE_SIZE,
+    redis_workload='ratelimit'
 )
 app.rate_limiter = rate_limiter
+atexit.register(rate_limiter.release_leases)
 
 # Prometheus metrics
 REQUEST_COUNT = Counter(
@@ -82,8 +124,29 @@ REDIS_POOL_MAX = Gauge(
     'Maximum number of connections in the Redis pool'
 )
 
+REDIS_CONNECTION_BUDGET = Gauge(
+    'api_gateway_redis_connection_budget',
+    'Redis connections the gateway may open, per worker process, pod and deployment',
+    ['scope']
+)
+
+
+def connection_budget() -> dict:
+    """Redis connections (to each Redis server) this gateway may open at most."""
+    per_process = redis_pool_size + sum(settings['max_connections'] for settings in redis_bulkheads.values())
+    per_pod = per_process * Config.GUNICORN_WORKERS
+    return {
+        'per_process': per_process,
+        'per_pod': per_pod,
+        'deployment': per_pod * Config.REDIS_MAX_REPLICAS
+    }
+
+
+for _scope, _connections in connection_budget().items():
+    REDIS_CONNECTION_BUDGET.labels(scope=_scope).set(_connections)
+
 # Initialize request context middleware for trace ID management
-RequestContextMiddleware(app)
+RequestContextMiddleware(app, default_timeout=Config.REQUEST_TIMEOUT, min_timeout=Config.REQUEST_MIN_TIMEOUT)
 
 
 def update_redis_status():
@@ -162,10 +225,14 @@ def liveness():
 def readiness():
     """Enhanced readiness probe endpoint with dependency checks.
 
+    Not ready until this worker has warmed its Redis connections, so
+    rolling updates and scale-outs only route traffic to warm pods.
+
     Returns:
         JSON response indicating if the service is ready to accept requests
     """
     redis_ready = update_redis_status()
+    redis_warm = redis_client.is_warm()
     pool_stats = redis_client.get_pool_stats()
 
     # Check dependencies
@@ -173,6 +240,7 @@ def readiness():
         'redis': {
             'status': 'healthy' if redis_ready else 'unhealthy',
             'connected': redis_ready,
+            'warm': redis_warm,
             'pool': {
                 'available': pool_stats.get('available', 0),
                 'in_use': pool_stats.get('in_use', 0),
@@ -181,8 +249,9 @@ def readiness():
         }
     }
 
-    # Service is ready if Redis is connected (or not required in dev)
-    all_healthy = redis_ready or not Config.REDIS_PASSWORD
+    # Service is ready if Redis is connected and warm (or not required in dev,
+    # where an unreachable Redis would otherwise keep warm-up pending)
+    all_healthy = not Config.REDIS_PASSWORD or (redis_ready and redis_warm)
 
     if all_healthy:
         return jsonify({
@@ -214,7 +283,8 @@ def get_status():
     total_requests = 0
     if redis_ready:
         try:
-            result = redis_client.incr('api:total_requests')
+            with workload('data'):
+                result = redis_client.incr('api:total_requests')
             total_requests = result if result is not None else 0
         except Exception as e:
             logger.error(f"Error incrementing request count in Redis: {e}")
@@ -231,7 +301,9 @@ def get_status():
         'redis_pool': {
             'available': pool_stats.get('available', 0),
             'in_use': pool_stats.get('in_use', 0),
-            'max_connections': pool_stats.get('max_connections', 0)
+            'max_connections': pool_stats.get('max_connections', 0),
+            'budget': connection_budget(),
+            'bulkheads': pool_stats.get('bulkheads', {})
         },
         'timestamp': time.time()
     }), 200
@@ -257,7 +329,10 @@ def get_info():
                 'status': '/api/status',
                 'info': '/api/info'
             },
-            'metrics': '/metrics'
+            'metrics': '/metrics',
+            'debug': {
+                'redis_slow_commands': '/debug/redis/slow-commands'
+            }
         }
     }), 200
 
@@ -272,6 +347,17 @@ def metrics():
     return generate_latest(), 200, {'Content-Type': CONTENT_TYPE_LATEST}
 
 
+@app.route('/debug/redis/slow-commands', methods=['GET'])
+def slow_redis_commands():
+    """Recent Redis commands slower than REDIS_SLOW_COMMAND_MS.
+
+    Returns:
+        JSON response with the slowest commands first
+    """
+    limit = request.args.get('limit', type=int)
+    return jsonify(redis_client.get_slow_commands(limit)), 200
+
+
 @app.route('/', methods=['GET'])
 def root():
     """Root endpoint.
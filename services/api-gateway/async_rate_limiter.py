@@ -0,0 +1,159 @@
+"""Asyncio rate limiting module using Redis.
+
+This module provides the asyncio counterpart of rate_limiter.RateLimiter
+for an ASGI gateway. It shares the Lua scripts, algorithm names and
+fail-open/local-fallback semantics of the sync limiter, but awaits Redis
+instead of blocking a worker thread.
+"""
+import math
+import time
+import uuid
+from typing import Optional
+from rate_limiter import (
+    GCRA,
+    REDIS_COMMANDS,
+    SLIDING_WINDOW,
+    SLIDING_WINDOW_COUNTER,
+    resolve_algorithm,
+)
+
+
+class AsyncRateLimiter:
+    """Asyncio rate limiter backed by AsyncRedisClient."""
+
+    def __init__(
+        self,
+        redis_client,
+        default_limit: int = 100,
+        default_window: int = 60,
+        default_algorithm: str = SLIDING_WINDOW,
+        local_limiter=None
+    ):
+        """Initialize async rate limiter.
+
+        Args:
+            redis_client: AsyncRedisClient instance
+            default_limit: Default maximum requests per window
+            default_window: Default time window in seconds
+            default_algorithm: Default algorithm (sliding_window, sliding_window_counter,
+                gcra, token_bucket)
+            local_limiter: In-process backend used when Redis is absent or down
+        """
+        self.redis_client = redis_client
+        self.default_limit = default_limit
+        self.default_window = default_window
+        self.default_algorithm = resolve_algorithm(default_algorithm)
+        self.local_limiter = local_limiter
+
+    async def check_rate_limit(
+        self,
+        key: str,
+        limit: Optional[int] = None,
+        window: Optional[int] = None,
+        algorithm: Optional[str] = None,
+        cost: int = 1
+    ) -> tuple[bool, dict]:
+        """Check if request is within rate limit.
+
+        Args:
+            key: Rate limit key (e.g., IP address, user ID)
+            limit: Maximum requests allowed (uses default if None)
+            window: Time window in seconds (uses default if None)
+            algorithm: Rate limit algorithm (uses default if None)
+            cost: Units of the limit this request consumes
+
+        Returns:
+            tuple: (is_allowed, rate_limit_info)
+        """
+        limit = limit or self.default_limit
+        window = window or self.default_window
+        algorithm = resolve_algorithm(algorithm) if algorithm else self.default_algorithm
+
+        now = time.time()
+        now_ms = int(now * 1000)
+
+        if self.redis_client is None or not await self.redis_client.is_connected():
+            return self._fallback(key, now, now_ms, limit, window, cost)
+
+        try:
+            if algorithm == GCRA:
+                allowed, remaining, reset_ms = await self._run_script(
+                    GCRA,
+                    keys=[f"rate_limit:gcra:{key}"],
+                    args=[now_ms, window * 1000, limit, cost]
+                )
+            elif algorithm == SLIDING_WINDOW_COUNTER:
+                allowed, remaining, reset_ms = await self._check_sliding_window_counter(
+                    key, now_ms, limit, window, cost)
+            else:
+                allowed, remaining, reset_ms = await self._run_script(
+                    SLIDING_WINDOW,
+                    keys=[f"rate_limit:{key}"],
+                    args=[now_ms, window * 1000, limit, f"{now_ms}:{uuid.uuid4().hex}", cost]
+                )
+            return bool(allowed), {
+                'limit': limit,
+                'remaining': int(remaining),
+                'reset': math.ceil(int(reset_ms) / 1000)
+            }
+        except Exception as e:
+            allowed, info = self._fallback(key, now, now_ms, limit, window, cost)
+            if info.get('fail_open'):
+                info['error'] = str(e)
+            return allowed, info
+
+    async def _run_script(self, name: str, keys: list, args: list):
+        """Run one of the rate limit scripts registered by rate_limiter.
+
+        Args:
+            name: Script name without the "rate_limit:" prefix
+            keys: Script KEYS
+            args: Script ARGV
+
+        Returns:
+            Script result
+        """
+        REDIS_COMMANDS.labels(algorithm=name).inc()
+        return await self.redis_client.run_script(f"rate_limit:{name}", keys=keys, args=args)
+
+    async def _check_sliding_window_counter(
+        self,
+        key: str,
+        now_ms: int,
+        limit: int,
+        window: int,
+        cost: int = 1
+    ) -> list:
+        """Run the sliding window counter check for a key in one script call."""
+        window_ms = window * 1000
+        index, elapsed_ms = divmod(now_ms, window_ms)
+        return await self._run_script(
+            SLIDING_WINDOW_COUNTER,
+            keys=[f"rate_limit:swc:{key}:{index}", f"rate_limit:swc:{key}:{index - 1}"],
+            args=[elapsed_ms, window_ms, limit, cost, index * window_ms]
+        )
+
+    def _fallback(
+        self,
+        key: str,
+        now: float,
+        now_ms: int,
+        limit: int,
+        window: int,
+        cost: int = 1
+    ) -> tuple[bool, dict]:
+        """Decide locally, or fail open if no local backend is configured."""
+        if self.local_limiter is not None:
+            allowed, remaining, reset_ms = self.local_limiter.check(key, now_ms, limit, window, cost)
+            return bool(allowed), {
+                'limit': limit,
+                'remaining': int(remaining),
+                'reset': math.ceil(reset_ms / 1000),
+                'backend': 'local'
+            }
+        return True, {
+            'limit': limit,
+            'remaining': limit,
+            'reset': int(now) + window,
+            'fail_open': True
+        }
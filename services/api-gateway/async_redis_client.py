@@ -0,0 +1,514 @@
+"""Asyncio Redis Client with Connection Pool and Error Handling.
+
+This module provides the asyncio counterpart of redis_client.RedisClient,
+built on redis.asyncio, for running the gateway under an ASGI server:
+- Connection pooling shared by all coroutines in the event loop, with pool metrics
+- The sync client's circuit breaker, probed by a background health check task,
+  so requests never wait on a PING
+- Fail-soft defaults on connection and response errors
+- Named Lua scripts from the shared registry, run via EVALSHA and reloaded on NOSCRIPT
+- Script and pipeline helpers so callers never touch the raw client
+"""
+import asyncio
+import logging
+import time
+from typing import Optional, Any
+import redis.asyncio as aioredis
+from redis.asyncio.connection import ConnectionPool
+from redis.exceptions import ConnectionError, NoScriptError, TimeoutError, ResponseError
+from redis_client import POOL_CONNECTIONS, POOL_CONNECTIONS_CREATED, SCRIPTS, CircuitBreaker, HealthMonitor
+
+logger = logging.getLogger(__name__)
+
+
+class InstrumentedAsyncConnectionPool(ConnectionPool):
+    """redis.asyncio ConnectionPool that tracks its own usage.
+
+    Exports the connection metrics of redis_client.InstrumentedConnectionPool
+    per target, and stats() reports usage without reading private lists.
+    """
+
+    def __init__(self, target: str = 'redis', **kwargs):
+        """Initialize instrumented pool.
+
+        Args:
+            target: Redis host:port used in metric labels
+            **kwargs: ConnectionPool arguments (max_connections, connection settings)
+        """
+        self.target = target
+        self._created_counter = POOL_CONNECTIONS_CREATED.labels(target=target)
+        self._in_use_gauge = POOL_CONNECTIONS.labels(target=target, state='in_use')
+        self._idle_gauge = POOL_CONNECTIONS.labels(target=target, state='idle')
+        self._created = 0
+        self._checked_out = set()
+        super().__init__(**kwargs)
+        POOL_CONNECTIONS.labels(target=target, state='max').set(self.max_connections)
+
+    def reset(self) -> None:
+        """Forget every connection, as ConnectionPool.reset() does."""
+        super().reset()
+        self._created = 0
+        self._checked_out = set()
+        self._update_gauges()
+
+    def make_connection(self):
+        """Create a new connection and count it."""
+        connection = super().make_connection()
+        self._created += 1
+        self._created_counter.inc()
+        return connection
+
+    async def get_connection(self, command_name, *keys, **options):
+        """Check out a connection."""
+        connection = await super().get_connection(command_name, *keys, **options)
+        self._checked_out.add(connection)
+        self._update_gauges()
+        return connection
+
+    async def release(self, connection) -> None:
+        """Return a connection to the pool."""
+        self._checked_out.discard(connection)
+        await super().release(connection)
+        self._update_gauges()
+
+    def _update_gauges(self) -> None:
+        """Publish the in-use and idle connection counts."""
+        in_use = len(self._checked_out)
+        self._in_use_gauge.set(in_use)
+        self._idle_gauge.set(max(0, self._created - in_use))
+
+    def stats(self) -> dict:
+        """Current pool usage.
+
+        Returns:
+            dict: available (idle connections), in_use, created and max_connections
+        """
+        in_use = len(self._checked_out)
+        return {
+            'available': max(0, self._created - in_use),
+            'in_use': in_use,
+            'created': self._created,
+            'max_connections': self.max_connections
+        }
+
+
+class AsyncPipeline:
+    """redis.asyncio pipeline whose connection errors count against its client.
+
+    Commands are queued on the wrapped pipeline as usual; execute() reports
+    connection failures to the client's circuit breaker before re-raising.
+    """
+
+    def __init__(self, client, pipe):
+        """Initialize pipeline wrapper.
+
+        Args:
+            client: AsyncRedisClient that created the pipeline
+            pipe: redis.asyncio pipeline to queue commands on
+        """
+        self._owner = client
+        self._pipe = pipe
+
+    def __getattr__(self, name: str):
+        return getattr(self._pipe, name)
+
+    def __len__(self) -> int:
+        return len(self._pipe)
+
+    async def execute(self, raise_on_error: bool = True) -> list:
+        """Send the queued commands in one round trip.
+
+        Returns:
+            list: One reply per command
+
+        Raises:
+            ConnectionError, TimeoutError: If Redis could not be reached
+        """
+        queued = len(self._pipe)
+        try:
+            return await self._pipe.execute(raise_on_error=raise_on_error)
+        except (ConnectionError, TimeoutError) as e:
+            self._owner._mark_failed('PIPELINE', f"{queued} commands", e)
+            raise
+
+
+class AsyncRedisClient:
+    """Asyncio Redis client with connection pooling and error handling."""
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        password: Optional[str] = None,
+        db: int = 0,
+        max_connections: int = 50,
+        socket_timeout: int = 5,
+        socket_connect_timeout: int = 5,
+        retry_on_timeout: bool = True,
+        health_check_interval: int = 30,
+        failure_threshold: int = 3,
+        backoff_base: float = 0.5,
+        backoff_max: float = 30.0,
+        health_monitor: bool = True
+    ):
+        """Initialize async Redis client.
+
+        The pool is created immediately but connections are opened lazily;
+        call ``connect()`` from the event loop to verify connectivity and
+        start the health check task.
+
+        Args:
+            host: Redis server host
+            port: Redis server port
+            password: Redis password (optional)
+            db: Redis database number
+            max_connections: Maximum number of connections in the pool
+            socket_timeout: Socket timeout in seconds
+            socket_connect_timeout: Socket connection timeout in seconds
+            retry_on_timeout: Whether to retry on timeout
+            health_check_interval: Health check interval in seconds
+            failure_threshold: Consecutive failures that open the circuit breaker
+            backoff_base: Seconds the circuit stays open after the first trip
+            backoff_max: Maximum seconds the circuit stays open
+            health_monitor: Run health checks on a background task
+        """
+        self.host = host
+        self.port = port
+        self.password = password
+        self.db = db
+        self._pool_kwargs = {
+            'max_connections': max_connections,
+            'socket_timeout': socket_timeout,
+            'socket_connect_timeout': socket_connect_timeout,
+            'retry_on_timeout': retry_on_timeout
+        }
+        self._client: Optional[aioredis.Redis] = None
+        self._pool: Optional[InstrumentedAsyncConnectionPool] = None
+        self._is_connected = False
+        self._last_health_check = 0
+        self._health_check_interval = health_check_interval
+        self._connection_failures = 0
+        self._breaker = CircuitBreaker(
+            name=f"{self.host}:{self.port}",
+            failure_threshold=failure_threshold,
+            backoff_base=backoff_base,
+            backoff_max=backoff_max
+        )
+        self._health_monitor = health_monitor
+        self._monitor_task: Optional[asyncio.Task] = None
+        self._wake = asyncio.Event()
+        # Set once connect() has run; is_connected() calls it on first use
+        self._started = False
+
+        self._init_pool()
+
+    def _init_pool(self) -> None:
+        """Initialize Redis connection pool."""
+        self._pool = InstrumentedAsyncConnectionPool(
+            target=f"{self.host}:{self.port}",
+            host=self.host,
+            port=self.port,
+            password=self.password if self.password else None,
+            db=self.db,
+            decode_responses=True,
+            socket_keepalive=True,
+            health_check_interval=self._health_check_interval,
+            **self._pool_kwargs
+        )
+        self._client = aioredis.Redis(connection_pool=self._pool)
+
+    async def connect(self) -> bool:
+        """Verify connectivity with a PING and start the health check task.
+
+        Must run inside the event loop that will use the client, e.g. at
+        ASGI startup; otherwise the first is_connected() call runs it.
+
+        Returns:
+            bool: True if connected, False otherwise
+        """
+        self._started = True
+        if await self._check_health():
+            logger.info(f"Async Redis connection pool initialized: {self.host}:{self.port}")
+        if self._health_monitor and (self._monitor_task is None or self._monitor_task.done()):
+            self._monitor_task = asyncio.create_task(self._monitor(), name='redis-health-monitor')
+        return self._is_connected
+
+    async def is_connected(self) -> bool:
+        """Check if Redis is connected.
+
+        Reads the state maintained by the health check task and by command
+        failures, so it never waits on the network once connect() has run.
+
+        Returns:
+            bool: True if connected, False otherwise
+        """
+        if not self._started:
+            await self.connect()
+        return self._is_connected
+
+    async def _check_health(self) -> bool:
+        """Ping Redis and report the outcome to the circuit breaker.
+
+        While the breaker is open nothing is sent; the half-open probe
+        starts from a fresh pool.
+
+        Returns:
+            bool: True if Redis answered, False otherwise
+        """
+        if not self._client or not self._breaker.allow_request():
+            return False
+
+        if self._breaker.state == CircuitBreaker.HALF_OPEN:
+            await self._reconnect()
+
+        self._last_health_check = time.time()
+        try:
+            await self._client.ping()
+        except (ConnectionError, TimeoutError, OSError) as e:
+            logger.warning(f"Redis health check failed: {e}")
+            self._mark_disconnected()
+            return False
+
+        self._is_connected = True
+        self._connection_failures = 0
+        self._breaker.record_success()
+        return True
+
+    async def _monitor(self) -> None:
+        """Health check loop, the asyncio counterpart of redis_client.HealthMonitor."""
+        while self._client is not None:
+            if self._is_connected:
+                delay = self._health_check_interval
+            else:
+                delay = max(self._breaker.retry_after(), HealthMonitor.MIN_PROBE_DELAY)
+            try:
+                await asyncio.wait_for(self._wake.wait(), delay)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+
+            try:
+                await self._check_health()
+            except Exception as e:
+                logger.error(f"Redis health monitor error: {e}")
+
+    async def _reconnect(self) -> None:
+        """Attempt to reconnect to Redis."""
+        try:
+            if self._pool:
+                await self._pool.disconnect()
+            self._init_pool()
+        except Exception as e:
+            logger.error(f"Reconnection attempt failed: {e}")
+
+    def _mark_disconnected(self) -> None:
+        """Record a failed health check or command.
+
+        The client only reads as disconnected once the failure opens the
+        circuit breaker; below ``failure_threshold`` later commands still
+        go through.
+        """
+        self._connection_failures += 1
+        self._breaker.record_failure()
+        if self._breaker.state != CircuitBreaker.CLOSED:
+            self._is_connected = False
+
+    def _mark_failed(self, command: str, target: Any, error: Exception) -> None:
+        """Record a connection-level failure seen by a command.
+
+        The health check task, woken here, re-probes as soon as the
+        breaker allows.
+        """
+        logger.error(f"Redis {command} error for '{target}': {error}")
+        self._mark_disconnected()
+        self._wake.set()
+
+    async def get(self, key: str, default: Any = None) -> Any:
+        """Get value from Redis with error handling.
+
+        Args:
+            key: Redis key
+            default: Default value if key not found or error occurs
+
+        Returns:
+            Value from Redis or default value
+        """
+        if not await self.is_connected():
+            logger.debug(f"Redis not connected, returning default for key: {key}")
+            return default
+
+        try:
+            value = await self._client.get(key)
+            return value if value is not None else default
+        except (ConnectionError, TimeoutError) as e:
+            self._mark_failed('GET', key, e)
+            return default
+        except ResponseError as e:
+            logger.error(f"Redis response error for key '{key}': {e}")
+            return default
+
+    async def set(
+        self,
+        key: str,
+        value: Any,
+        ex: Optional[int] = None,
+        px: Optional[int] = None,
+        nx: bool = False,
+        xx: bool = False
+    ) -> bool:
+        """Set value in Redis with error handling.
+
+        Args:
+            key: Redis key
+            value: Value to set
+            ex: Expiration time in seconds
+            px: Expiration time in milliseconds
+            nx: Only set if key does not exist
+            xx: Only set if key exists
+
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        if not await self.is_connected():
+            logger.debug(f"Redis not connected, skipping SET for key: {key}")
+            return False
+
+        try:
+            result = await self._client.set(key, value, ex=ex, px=px, nx=nx, xx=xx)
+            return bool(result)
+        except (ConnectionError, TimeoutError) as e:
+            self._mark_failed('SET', key, e)
+            return False
+        except ResponseError as e:
+            logger.error(f"Redis response error for key '{key}': {e}")
+            return False
+
+    async def incr(self, key: str, amount: int = 1) -> Optional[int]:
+        """Increment value in Redis with error handling.
+
+        Args:
+            key: Redis key
+            amount: Amount to increment by
+
+        Returns:
+            int: New value after increment, or None if error
+        """
+        if not await self.is_connected():
+            logger.debug(f"Redis not connected, skipping INCR for key: {key}")
+            return None
+
+        try:
+            return await self._client.incr(key, amount)
+        except (ConnectionError, TimeoutError) as e:
+            self._mark_failed('INCR', key, e)
+            return None
+        except ResponseError as e:
+            logger.error(f"Redis response error for key '{key}': {e}")
+            return None
+
+    async def delete(self, *keys: str) -> int:
+        """Delete keys from Redis with error handling.
+
+        Args:
+            *keys: Keys to delete
+
+        Returns:
+            int: Number of keys deleted, or 0 if error
+        """
+        if not await self.is_connected():
+            logger.debug(f"Redis not connected, skipping DELETE for keys: {keys}")
+            return 0
+
+        try:
+            return await self._client.delete(*keys)
+        except (ConnectionError, TimeoutError) as e:
+            self._mark_failed('DELETE', keys, e)
+            return 0
+        except ResponseError as e:
+            logger.error(f"Redis response error for keys '{keys}': {e}")
+            return 0
+
+    async def run_script(self, name: str, keys: Optional[list] = None, args: Optional[list] = None) -> Any:
+        """Run a registered Lua script via EVALSHA.
+
+        Scripts come from the registry shared with RedisClient (see
+        redis_client.register_script). If Redis does not know the script
+        (NOSCRIPT) it is loaded and the call retried once. Unlike the
+        fail-soft accessors this raises, so callers such as the rate
+        limiter can apply their own fallback.
+
+        Args:
+            name: Name the script was registered under
+            keys: Script KEYS
+            args: Script ARGV
+
+        Returns:
+            Script result
+        """
+        source, sha = SCRIPTS.get(name)
+        keys = list(keys or ())
+        args = list(args or ())
+        try:
+            try:
+                return await self._client.evalsha(sha, len(keys), *keys, *args)
+            except NoScriptError:
+                logger.info(f"Redis script '{name}' not cached by the server, loading it")
+                await self._client.script_load(source)
+                return await self._client.evalsha(sha, len(keys), *keys, *args)
+        except (ConnectionError, TimeoutError) as e:
+            self._mark_failed('EVALSHA', keys, e)
+            raise
+
+    def pipeline(self, transaction: bool = False) -> AsyncPipeline:
+        """Create a pipeline on the pooled client.
+
+        Args:
+            transaction: Wrap the commands in MULTI/EXEC
+
+        Returns:
+            AsyncPipeline: redis.asyncio pipeline whose connection errors
+                are recorded by this client
+        """
+        return AsyncPipeline(self, self._client.pipeline(transaction=transaction))
+
+    async def ping(self) -> bool:
+        """Ping Redis server.
+
+        Returns:
+            bool: True if ping successful, False otherwise
+        """
+        return await self.is_connected()
+
+    async def close(self) -> None:
+        """Stop the health check task and close the connection pool."""
+        if self._monitor_task is not None:
+            self._monitor_task.cancel()
+            try:
+                await self._monitor_task
+            except asyncio.CancelledError:
+                pass
+            self._monitor_task = None
+        try:
+            if self._pool:
+                await self._pool.disconnect()
+                logger.info("Async Redis connection pool closed")
+        except Exception as e:
+            logger.error(f"Error closing async Redis connection pool: {e}")
+        finally:
+            self._client = None
+            self._pool = None
+            self._is_connected = False
+
+    def get_pool_stats(self) -> dict:
+        """Get connection pool statistics.
+
+        Returns:
+            dict: Pool statistics
+        """
+        if not self._pool:
+            return {
+                'available': 0,
+                'in_use': 0,
+                'max_connections': 0
+            }
+        return self._pool.stats()
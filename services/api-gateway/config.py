@@ -14,6 +14,54 @@ class Config:
     REDIS_PORT = int(os.getenv('REDIS_PORT', '6379'))
     REDIS_PASSWORD = os.getenv('REDIS_PASSWORD', '')
     REDIS_DB = int(os.getenv('REDIS_DB', '0'))
+    # Commands at least this slow are kept for /debug/redis/slow-commands
+    REDIS_SLOW_COMMAND_MS = float(os.getenv('REDIS_SLOW_COMMAND_MS', '10'))
+    # Read replicas as "host:port,host:port"; Sentinels, if set, discover both
+    REDIS_REPLICAS = os.getenv('REDIS_REPLICAS', '')
+    REDIS_SENTINELS = os.getenv('REDIS_SENTINELS', '')
+    REDIS_SENTINEL_SERVICE = os.getenv('REDIS_SENTINEL_SERVICE', 'mymaster')
+    # Shard keys over these nodes ("host:port,host:port") instead of REDIS_HOST
+    REDIS_SHARDS = os.getenv('REDIS_SHARDS', '')
+    # Connections each gunicorn worker opens before /health/ready reports ready
+    REDIS_WARM_CONNECTIONS = int(os.getenv('REDIS_WARM_CONNECTIONS', '4'))
+    # SCRIPT LOAD every registered Lua script (the rate limiter's) during warm-up
+    REDIS_PRELOAD_SCRIPTS = os.getenv('REDIS_PRELOAD_SCRIPTS', 'True').lower() == 'true'
+    # Pool size per gunicorn worker; unset sizes it from GUNICORN_THREADS,
+    # capped by REDIS_CONNECTION_BUDGET spread over every worker of
+    # REDIS_MAX_REPLICAS pods (the HPA maximum)
+    REDIS_MAX_CONNECTIONS = int(os.getenv('REDIS_MAX_CONNECTIONS') or 0) or None
+    REDIS_CONNECTION_BUDGET = int(os.getenv('REDIS_CONNECTION_BUDGET') or 0) or None
+    REDIS_MAX_REPLICAS = int(os.getenv('REDIS_MAX_REPLICAS', '10'))
+    # Close pool connections unused for this many seconds (0 keeps them open)
+    REDIS_IDLE_TIMEOUT = float(os.getenv('REDIS_IDLE_TIMEOUT', '300'))
+    # Separate pools per workload class, "name:max_connections[:pool_timeout[:socket_timeout]],...";
+    # rate limit checks use "ratelimit", /api/status "data" and health checks
+    # "health", and anything without a bulkhead uses the shared pool
+    REDIS_BULKHEADS = os.getenv('REDIS_BULKHEADS', '')
+
+    # Gunicorn (read by gunicorn.conf.py as well)
+    GUNICORN_WORKERS = int(os.getenv('GUNICORN_WORKERS', '2'))
+    GUNICORN_THREADS = int(os.getenv('GUNICORN_THREADS', '4'))
+
+    # Rate limiting
+    RATE_LIMIT_ALGORITHM = os.getenv('RATE_LIMIT_ALGORITHM', 'sliding_window')
+    # Token leasing: fraction of the limit each worker leases (empty disables)
+    RATE_LIMIT_LEASE_FRACTION = float(os.getenv('RATE_LIMIT_LEASE_FRACTION') or 0) or None
+    RATE_LIMIT_LEASE_ERROR_BOUND = int(os.getenv('RATE_LIMIT_LEASE_ERROR_BOUND', '10'))
+    RATE_LIMIT_LEASE_TTL = float(os.getenv('RATE_LIMIT_LEASE_TTL', '1.0'))
+    # In-process limiter used while Redis is down
+    RATE_LIMIT_LOCAL_FALLBACK = os.getenv('RATE_LIMIT_LOCAL_FALLBACK', 'True').lower() == 'true'
+    RATE_LIMIT_LOCAL_MAX_KEYS = int(os.getenv('RATE_LIMIT_LOCAL_MAX_KEYS', '10000'))
+    # Deny decisions cached in-process until the client's window resets (0 disables)
+    RATE_LIMIT_DENY_CACHE_SIZE = int(os.getenv('RATE_LIMIT_DENY_CACHE_SIZE', '10000'))
+    # Share local limiter state between gunicorn workers via this file (empty = per process)
+    RATE_LIMIT_SHARED_MEMORY_PATH = os.getenv('RATE_LIMIT_SHARED_MEMORY_PATH', '')
+
+    # Time budget (seconds) for requests without an X-Request-Timeout or
+    # X-Request-Deadline header; Redis calls never outlive it (empty = none)
+    REQUEST_TIMEOUT = float(os.getenv('REQUEST_TIMEOUT') or 0) or None
+    # Least budget a caller's deadline header can give a request
+    REQUEST_MIN_TIMEOUT = float(os.getenv('REQUEST_MIN_TIMEOUT', '0.1'))
 
     # Application
     APP_ENV = os.getenv('APP_ENV', 'development')
@@ -0,0 +1,24 @@
+"""Gunicorn configuration for API Gateway service.
+
+The app is imported once in the master (``preload_app``) and shared
+copy-on-write by the workers. RedisClient opens nothing at import; each
+worker connects right after fork, so warm-up starts before the first
+request and /health/ready waits for it.
+"""
+import os
+
+bind = f"0.0.0.0:{os.getenv('PORT', '8080')}"
+# Config reads the same variables to size each worker's Redis pool
+workers = int(os.getenv('GUNICORN_WORKERS', '2'))
+threads = int(os.getenv('GUNICORN_THREADS', '4'))
+timeout = 60
+accesslog = '-'
+errorlog = '-'
+preload_app = True
+
+
+def post_fork(server, worker):
+    """Open the worker's own Redis connections and start its background threads."""
+    from app import redis_client
+
+    redis_client.connect()
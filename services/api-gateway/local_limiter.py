@@ -0,0 +1,243 @@
+"""In-process rate limiting backends.
+
+This module provides rate limiters that need no Redis, for single-node
+setups and as a fallback while Redis is unavailable:
+- LocalRateLimiter: per-process table with LRU eviction
+- SharedMemoryRateLimiter: fixed-size table in a memory-mapped file shared
+  by every worker process in a pod
+
+Both use GCRA, so each client costs one timestamp regardless of the limit.
+"""
+import fcntl
+import hashlib
+import math
+import mmap
+import os
+import struct
+import threading
+from collections import OrderedDict
+
+
+def _gcra(tat: float, now_ms: int, limit: int, window: int, cost: int = 1) -> tuple:
+    """Evaluate one GCRA decision.
+
+    Args:
+        tat: Stored theoretical arrival time in ms (0 if unknown)
+        now_ms: Current time in ms
+        limit: Maximum requests per window
+        window: Window in seconds
+        cost: Units of the limit this request consumes
+
+    Returns:
+        tuple: (allowed, remaining, reset_ms, new_tat)
+    """
+    window_ms = window * 1000
+    interval = window_ms / limit
+    tat = max(tat, now_ms)
+    new_tat = tat + interval * cost
+    allow_at = new_tat - window_ms
+    if now_ms < allow_at:
+        return 0, 0, math.ceil(allow_at), tat
+    return 1, math.floor((now_ms - allow_at) / interval), math.ceil(new_tat), new_tat
+
+
+class _ClientState:
+    """Per-client limiter state."""
+
+    __slots__ = ('tat',)
+
+    def __init__(self, tat: float = 0.0):
+        self.tat = tat
+
+
+class LocalRateLimiter:
+    """Per-process GCRA limiter with a bounded, LRU-evicted state table."""
+
+    def __init__(self, max_keys: int = 10000):
+        """Initialize local rate limiter.
+
+        Args:
+            max_keys: Maximum number of client keys tracked
+        """
+        self.max_keys = max_keys
+        self._states = OrderedDict()
+        self._lock = threading.Lock()
+        self._evictions = 0
+
+    def check(self, key: str, now_ms: int, limit: int, window: int, cost: int = 1) -> tuple:
+        """Check and record one request.
+
+        Args:
+            key: Rate limit key
+            now_ms: Current time in ms
+            limit: Maximum requests per window
+            window: Window in seconds
+            cost: Units of the limit this request consumes
+
+        Returns:
+            tuple: (allowed, remaining, reset_ms)
+        """
+        state_key = (key, limit, window)
+        with self._lock:
+            state = self._states.get(state_key)
+            if state is None:
+                state = _ClientState()
+                self._states[state_key] = state
+                if len(self._states) > self.max_keys:
+                    self._states.popitem(last=False)
+                    self._evictions += 1
+            else:
+                self._states.move_to_end(state_key)
+
+            allowed, remaining, reset_ms, state.tat = _gcra(state.tat, now_ms, limit, window, cost)
+        return allowed, remaining, reset_ms
+
+    def __len__(self) -> int:
+        return len(self._states)
+
+    def get_stats(self) -> dict:
+        """Get state table statistics.
+
+        Returns:
+            dict: Table statistics
+        """
+        return {
+            'keys': len(self._states),
+            'max_keys': self.max_keys,
+            'evictions': self._evictions
+        }
+
+
+class SharedMemoryRateLimiter:
+    """GCRA limiter whose state table is shared by all processes on a node.
+
+    The table is a memory-mapped file of fixed-size slots (8-byte key hash,
+    8-byte TAT) with bounded linear probing. When every probed slot is in
+    use, the slot whose client has recovered the most is overwritten, so
+    memory never grows. Access is serialized with flock across processes
+    and a thread lock within a process.
+    """
+
+    SLOT = struct.Struct('<Qd')
+
+    def __init__(self, path: str, slots: int = 16384, probe: int = 8):
+        """Initialize shared memory rate limiter.
+
+        Args:
+            path: File backing the shared table (e.g. on /dev/shm or an emptyDir)
+            slots: Number of table slots
+            probe: Slots inspected per lookup
+        """
+        self.path = path
+        self.slots = slots
+        self.probe = probe
+        self._lock = threading.Lock()
+        self._pid = None
+        self._fd = None
+        self._map = None
+        self._evictions = 0
+
+    def _open(self) -> None:
+        """Map the shared table, once per process."""
+        if self._pid == os.getpid():
+            return
+        if self._pid is not None:
+            # Forked: drop the parent's mapping and descriptor before reopening
+            self._map.close()
+            os.close(self._fd)
+        size = self.slots * self.SLOT.size
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        try:
+            if os.fstat(fd).st_size < size:
+                os.ftruncate(fd, size)
+        finally:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+        # A forked child must not share the parent's open file description,
+        # otherwise flock would not exclude between them.
+        self._fd = fd
+        self._map = mmap.mmap(fd, size)
+        self._pid = os.getpid()
+
+    @staticmethod
+    def _hash(key: str) -> int:
+        """Stable, non-zero 64-bit hash of a state key."""
+        digest = hashlib.blake2b(key.encode(), digest_size=8).digest()
+        return int.from_bytes(digest, 'little') or 1
+
+    def check(self, key: str, now_ms: int, limit: int, window: int, cost: int = 1) -> tuple:
+        """Check and record one request.
+
+        Args:
+            key: Rate limit key
+            now_ms: Current time in ms
+            limit: Maximum requests per window
+            window: Window in seconds
+            cost: Units of the limit this request consumes
+
+        Returns:
+            tuple: (allowed, remaining, reset_ms)
+        """
+        key_hash = self._hash(f"{key}:{limit}:{window}")
+        start = key_hash % self.slots
+
+        with self._lock:
+            self._open()
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+            try:
+                slot, tat = self._find_slot(key_hash, start, now_ms)
+                allowed, remaining, reset_ms, new_tat = _gcra(tat, now_ms, limit, window, cost)
+                self.SLOT.pack_into(self._map, slot * self.SLOT.size, key_hash, new_tat)
+            finally:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+        return allowed, remaining, reset_ms
+
+    def _find_slot(self, key_hash: int, start: int, now_ms: int) -> tuple:
+        """Find the slot for a key, claiming or evicting one if needed.
+
+        The whole probe window is searched for the key before a free slot
+        is claimed, so a client whose slot lies past a recovered one keeps
+        its state. Duplicate slots of the key are cleared, keeping the
+        latest TAT.
+        """
+        own, own_tat = None, None
+        free = None
+        victim, victim_tat = None, None
+        for i in range(self.probe):
+            slot = (start + i) % self.slots
+            stored_hash, tat = self.SLOT.unpack_from(self._map, slot * self.SLOT.size)
+            if stored_hash == key_hash:
+                if own is None or tat > own_tat:
+                    if own is not None:
+                        self._clear(own)
+                    own, own_tat = slot, tat
+                else:
+                    self._clear(slot)
+            elif stored_hash == 0 or tat <= now_ms:
+                # Empty or fully recovered: free to reuse
+                if free is None:
+                    free = slot
+            elif victim is None or tat < victim_tat:
+                victim, victim_tat = slot, tat
+        if own is not None:
+            return own, own_tat
+        if free is not None:
+            return free, 0.0
+        self._evictions += 1
+        return victim, 0.0
+
+    def _clear(self, slot: int) -> None:
+        """Mark a slot empty."""
+        self.SLOT.pack_into(self._map, slot * self.SLOT.size, 0, 0.0)
+
+    def get_stats(self) -> dict:
+        """Get state table statistics.
+
+        Returns:
+            dict: Table statistics
+        """
+        return {
+            'path': self.path,
+            'slots': self.slots,
+            'evictions': self._evictions
+        }
@@ -3,33 +3,629 @@
 This module provides rate limiting functionality to protect APIs
 from abuse and ensure fair resource usage.
 """
+import math
+import os
+import threading
 import time
+import uuid
+from collections import OrderedDict
 from functools import wraps
 from flask import request, jsonify, make_response
+from prometheus_client import Counter, Gauge, Histogram
+from redis.exceptions import RedisError
 from typing import Optional, Callable
 from request_context import get_trace_id
+from local_limiter import LocalRateLimiter
+from redis_client import ignore_deadline, register_script, workload
+
+# Decision metrics
+DECISION_DURATION = Histogram(
+    'api_gateway_rate_limit_decision_duration_seconds',
+    'Time spent deciding whether a request is rate limited',
+    ['route', 'algorithm'],
+    buckets=(0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0)
+)
+
+DECISIONS = Counter(
+    'api_gateway_rate_limit_decisions_total',
+    'Rate limit decisions by route, outcome (allow, deny, fail_open) and backend',
+    ['route', 'outcome', 'backend']
+)
+
+REDIS_COMMANDS = Counter(
+    'api_gateway_rate_limit_redis_commands_total',
+    'Redis commands issued by rate limit decisions',
+    ['algorithm']
+)
+
+TRACKED_KEYS = Gauge(
+    'api_gateway_rate_limit_tracked_keys',
+    'Client keys tracked in-process by the rate limiter',
+    ['table']
+)
+
+# Token leasing metrics
+LEASE_SIZE_FRACTION = Gauge(
+    'api_gateway_rate_limit_lease_fraction',
+    'Fraction of the limit leased to a worker process per client key'
+)
+
+LEASE_ERROR_BOUND = Gauge(
+    'api_gateway_rate_limit_lease_error_bound_tokens',
+    'Maximum tokens a worker process may hold locally per client key'
+)
+
+LEASE_TOKENS_OUTSTANDING = Gauge(
+    'api_gateway_rate_limit_lease_tokens_outstanding',
+    'Unspent leased tokens held by this worker process'
+)
+
+LEASE_DECISIONS = Counter(
+    'api_gateway_rate_limit_lease_decisions_total',
+    'Rate limit decisions served from a local lease or from Redis',
+    ['source']
+)
+
+LEASE_TOKENS_RETURNED = Counter(
+    'api_gateway_rate_limit_lease_tokens_returned_total',
+    'Unspent leased tokens returned to Redis'
+)
+
+
+# Sliding window log evaluated atomically on the Redis server.
+# KEYS[1] = rate limit key
+# ARGV[1] = current time (ms), ARGV[2] = window (ms), ARGV[3] = limit,
+# ARGV[4] = unique member prefix for this request, ARGV[5] = cost
+# Returns {allowed (0/1), remaining, reset (ms)}
+SLIDING_WINDOW_SCRIPT = """
+local key = KEYS[1]
+local now = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local limit = tonumber(ARGV[3])
+local cost = tonumber(ARGV[5] or 1)
+
+redis.call('ZREMRANGEBYSCORE', key, 0, now - window)
+local count = redis.call('ZCARD', key)
+
+if count + cost <= limit then
+    for i = 1, cost do
+        redis.call('ZADD', key, now, ARGV[4] .. ':' .. i)
+    end
+    redis.call('PEXPIRE', key, window)
+    return {1, limit - count - cost, now + window}
+end
+
+-- Reset once enough of the oldest entries have left the window
+local reset = now + window
+local needed = count + cost - limit
+if cost <= limit and needed <= count then
+    local entry = redis.call('ZRANGE', key, needed - 1, needed - 1, 'WITHSCORES')
+    if entry[2] then
+        reset = tonumber(entry[2]) + window
+    end
+end
+return {0, 0, reset}
+"""
+
+# Generic cell rate algorithm (GCRA), the constant-memory equivalent of a
+# token bucket. Only the theoretical arrival time (TAT) is stored.
+# KEYS[1] = rate limit key
+# ARGV[1] = current time (ms), ARGV[2] = window (ms), ARGV[3] = limit,
+# ARGV[4] = cost
+# Returns {allowed (0/1), remaining, reset (ms)}
+GCRA_SCRIPT = """
+local key = KEYS[1]
+local now = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local limit = tonumber(ARGV[3])
+local cost = tonumber(ARGV[4] or 1)
+local interval = window / limit
+
+local tat = tonumber(redis.call('GET', key))
+if not tat or tat < now then
+    tat = now
+end
+
+local new_tat = tat + interval * cost
+local allow_at = new_tat - window
+if now < allow_at then
+    return {0, 0, math.ceil(allow_at)}
+end
+
+redis.call('SET', key, string.format('%.3f', new_tat), 'PX', math.ceil(new_tat - now))
+return {1, math.floor((now - allow_at) / interval), math.ceil(new_tat)}
+"""
+
+# Sliding window counter: the previous fixed window's count, weighted by
+# how much of it still overlaps the sliding window, plus the current
+# window's count. Only admitted requests are added to the current window.
+# KEYS[1] = current window key, KEYS[2] = previous window key
+# ARGV[1] = time elapsed in the current window (ms), ARGV[2] = window (ms),
+# ARGV[3] = limit, ARGV[4] = cost, ARGV[5] = current window start (ms)
+# Returns {allowed (0/1), remaining, reset (ms)}
+SLIDING_WINDOW_COUNTER_SCRIPT = """
+local elapsed = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local limit = tonumber(ARGV[3])
+local cost = tonumber(ARGV[4])
+local start = tonumber(ARGV[5])
+
+local previous = tonumber(redis.call('GET', KEYS[2]) or 0)
+local current = tonumber(redis.call('GET', KEYS[1]) or 0)
+local estimate = previous * (1 - elapsed / window) + current + cost
+
+if estimate <= limit then
+    redis.call('INCRBY', KEYS[1], cost)
+    redis.call('PEXPIRE', KEYS[1], window * 2)
+    return {1, math.floor(limit - estimate), start + window}
+end
+
+-- Reset once the decaying previous count leaves room again
+local reset = start + window
+if current + cost <= limit and previous > 0 then
+    reset = math.ceil(start + window * (1 - (limit - current - cost) / previous))
+end
+return {0, 0, reset}
+"""
+
+# Reserve a batch of slots in the sliding window log for one worker.
+# KEYS[1] = rate limit key
+# ARGV[1] = current time (ms), ARGV[2] = window (ms), ARGV[3] = limit,
+# ARGV[4] = tokens wanted, ARGV[5] = lease id used as member prefix
+# Returns {granted, remaining, reset (ms)}
+LEASE_SCRIPT = """
+local key = KEYS[1]
+local now = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local limit = tonumber(ARGV[3])
+local wanted = tonumber(ARGV[4])
+
+redis.call('ZREMRANGEBYSCORE', key, 0, now - window)
+local count = redis.call('ZCARD', key)
+local granted = math.min(wanted, limit - count)
+
+if granted > 0 then
+    for i = 1, granted do
+        redis.call('ZADD', key, now, ARGV[5] .. ':' .. i)
+    end
+    redis.call('PEXPIRE', key, window)
+    return {granted, limit - count - granted, now + window}
+end
+
+local oldest = redis.call('ZRANGE', key, 0, 0, 'WITHSCORES')
+local reset = now + window
+if oldest[2] then
+    reset = tonumber(oldest[2]) + window
+end
+return {0, 0, reset}
+"""
+
+# Per-client cap on in-flight requests. Members are lease ids scored by
+# their expiry, so leases lost to crashes or timeouts are reclaimed; the
+# key lives as long as its latest lease.
+# KEYS[1] = concurrency key
+# ARGV[1] = current time (ms), ARGV[2] = max in flight,
+# ARGV[3] = lease id, ARGV[4] = lease timeout (ms)
+# Returns {allowed (0/1), remaining, reset (ms)}
+CONCURRENCY_SCRIPT = """
+local key = KEYS[1]
+local now = tonumber(ARGV[1])
+local limit = tonumber(ARGV[2])
+local timeout = tonumber(ARGV[4])
+
+redis.call('ZREMRANGEBYSCORE', key, '-inf', now)
+local count = redis.call('ZCARD', key)
+
+if count < limit then
+    redis.call('ZADD', key, now + timeout, ARGV[3])
+    local latest = redis.call('ZRANGE', key, -1, -1, 'WITHSCORES')
+    redis.call('PEXPIRE', key, tonumber(latest[2]) - now)
+    return {1, limit - count - 1, now + timeout}
+end
+
+local oldest = redis.call('ZRANGE', key, 0, 0, 'WITHSCORES')
+local reset = now + timeout
+if oldest[2] then
+    reset = tonumber(oldest[2])
+end
+return {0, 0, reset}
+"""
+
+SLIDING_WINDOW = 'sliding_window'
+SLIDING_WINDOW_COUNTER = 'sliding_window_counter'
+GCRA = 'gcra'
+TOKEN_BUCKET = 'token_bucket'
+
+# Supported algorithms; token bucket is served by GCRA, which is its
+# single-key formulation.
+ALGORITHMS = {
+    SLIDING_WINDOW: SLIDING_WINDOW,
+    SLIDING_WINDOW_COUNTER: SLIDING_WINDOW_COUNTER,
+    GCRA: GCRA,
+    TOKEN_BUCKET: GCRA,
+}
+
+# Declared with RedisClient, which runs them via EVALSHA and loads them
+# during warm-up; _run_script() looks them up as "rate_limit:<name>"
+for _name, _source in (
+    (SLIDING_WINDOW, SLIDING_WINDOW_SCRIPT),
+    (SLIDING_WINDOW_COUNTER, SLIDING_WINDOW_COUNTER_SCRIPT),
+    (GCRA, GCRA_SCRIPT),
+    ('lease', LEASE_SCRIPT),
+    ('concurrency', CONCURRENCY_SCRIPT),
+):
+    register_script(f"rate_limit:{_name}", _source)
+
+
+def resolve_algorithm(algorithm: str) -> str:
+    """Resolve an algorithm name to the implementation that serves it.
+
+    Args:
+        algorithm: Algorithm name
+
+    Returns:
+        str: Canonical algorithm name
+
+    Raises:
+        ValueError: If the algorithm is not supported
+    """
+    try:
+        return ALGORITHMS[algorithm]
+    except KeyError:
+        raise ValueError(
+            f"Unknown rate limit algorithm '{algorithm}', expected one of: {', '.join(ALGORITHMS)}"
+        ) from None
+
+
+class _Lease:
+    """Tokens reserved in Redis and spent locally by one worker process."""
+
+    __slots__ = ('node', 'redis_key', 'lease_id', 'granted', 'used', 'remaining', 'reset_ms', 'expires_ms')
+
+    def __init__(self, node, redis_key, lease_id, granted, remaining, reset_ms, expires_ms):
+        self.node = node
+        self.redis_key = redis_key
+        self.lease_id = lease_id
+        self.granted = granted
+        self.used = 0
+        self.remaining = remaining
+        self.reset_ms = reset_ms
+        self.expires_ms = expires_ms
+
+    @property
+    def unused(self) -> int:
+        """Tokens still available in this lease."""
+        return self.granted - self.used
+
+    def unused_members(self) -> list:
+        """Sorted set members of the tokens that were never spent."""
+        return [f"{self.lease_id}:{i}" for i in range(self.used + 1, self.granted + 1)]
+
+
+class TokenLeaser:
+    """Per-process token leases for the sliding window log.
+
+    A worker reserves ``lease_fraction`` of the limit (capped at
+    ``error_bound`` tokens) in one script call and then admits requests
+    from that batch without touching Redis. Reserved slots are already in
+    the log, so the global limit is never exceeded; the error is
+    under-admission of at most ``error_bound`` tokens per worker and key
+    while another worker holds unspent tokens. A lease is only spent for
+    ``lease_ttl`` seconds and never past the point its slots leave the
+    window, after which unspent tokens are handed back with ZREM.
+    """
+
+    def __init__(self, limiter, lease_fraction: float = 0.1, error_bound: int = 10, lease_ttl: float = 1.0):
+        """Initialize token leaser.
+
+        Args:
+            limiter: Owning RateLimiter
+            lease_fraction: Fraction of the limit leased per Redis call
+            error_bound: Maximum tokens held locally per client key
+            lease_ttl: Seconds a lease may be spent locally
+        """
+        self.limiter = limiter
+        self.lease_fraction = lease_fraction
+        self.error_bound = error_bound
+        self.lease_ttl = lease_ttl
+        self._leases = {}
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+
+        LEASE_SIZE_FRACTION.set(lease_fraction)
+        LEASE_ERROR_BOUND.set(error_bound)
+
+    def lease_size(self, limit: int) -> int:
+        """Number of tokens to request for a given limit."""
+        return max(1, min(int(limit * self.lease_fraction), self.error_bound))
+
+    def acquire(self, node, key: str, now_ms: int, limit: int, window: int) -> tuple:
+        """Spend one token, leasing a new batch from Redis if needed.
+
+        Args:
+            node: RedisClient holding the client's keys
+            key: Rate limit key
+            now_ms: Current time in milliseconds
+            limit: Maximum requests per window
+            window: Window in seconds
+
+        Returns:
+            tuple: (allowed, remaining, reset_ms)
+        """
+        redis_key = f"rate_limit:{key}"
+        lease_key = (redis_key, limit, window)
+
+        with self._lock:
+            self._check_fork()
+            lease = self._leases.get(lease_key)
+            if lease is not None and lease.unused > 0 and now_ms < lease.expires_ms:
+                lease.used += 1
+                LEASE_TOKENS_OUTSTANDING.dec()
+                LEASE_DECISIONS.labels(source='local').inc()
+                return 1, lease.remaining + lease.unused, lease.reset_ms
+            stale = self._leases.pop(lease_key, None)
+
+        if stale is not None:
+            self._return(stale)
+
+        lease_id = uuid.uuid4().hex
+        granted, remaining, reset_ms = self.limiter._run_script(
+            node,
+            'lease',
+            keys=[redis_key],
+            args=[now_ms, window * 1000, limit, self.lease_size(limit), lease_id]
+        )
+        LEASE_DECISIONS.labels(source='redis').inc()
+        if not granted:
+            return 0, 0, reset_ms
+
+        lease = _Lease(
+            node, redis_key, lease_id, int(granted), int(remaining), int(reset_ms),
+            min(now_ms + int(self.lease_ttl * 1000), now_ms + window * 1000)
+        )
+        lease.used = 1
+        LEASE_TOKENS_OUTSTANDING.inc(lease.unused)
+
+        with self._lock:
+            previous = self._leases.get(lease_key)
+            self._leases[lease_key] = lease
+
+        if previous is not None:
+            # Another thread leased concurrently; hand its batch back
+            self._return(previous)
+        return 1, lease.remaining + lease.unused, lease.reset_ms
+
+    def release_all(self) -> None:
+        """Return every unspent token to Redis (e.g. at shutdown).
+
+        All leases are handed back in a single pipeline per Redis node.
+        """
+        with self._lock:
+            self._check_fork()
+            leases = [lease for lease in self._leases.values() if lease.unused > 0]
+            self._leases.clear()
+
+        if not leases:
+            return
+        LEASE_TOKENS_OUTSTANDING.dec(sum(lease.unused for lease in leases))
+        by_node = {}
+        for lease in leases:
+            by_node.setdefault(lease.node, []).append(lease)
+        for node, node_leases in by_node.items():
+            REDIS_COMMANDS.labels(algorithm='lease').inc()
+            with node.pipeline() as pipe:
+                for lease in node_leases:
+                    pipe.zrem(lease.redis_key, *lease.unused_members())
+            if pipe.results is not None:
+                LEASE_TOKENS_RETURNED.inc(sum(lease.unused for lease in node_leases))
+
+    def get_stats(self) -> dict:
+        """Get lease table statistics.
+
+        Returns:
+            dict: Lease statistics
+        """
+        with self._lock:
+            return {
+                'keys': len(self._leases),
+                'outstanding_tokens': sum(lease.unused for lease in self._leases.values()),
+                'lease_fraction': self.lease_fraction,
+                'error_bound': self.error_bound,
+                'lease_ttl': self.lease_ttl
+            }
+
+    def _return(self, lease: _Lease) -> None:
+        """Give a lease's unspent tokens back to Redis."""
+        members = lease.unused_members()
+        if not members:
+            return
+        LEASE_TOKENS_OUTSTANDING.dec(len(members))
+        try:
+            REDIS_COMMANDS.labels(algorithm='lease').inc()
+            with lease.node.pipeline() as pipe:
+                pipe.zrem(lease.redis_key, *members)
+            if pipe.results is not None:
+                LEASE_TOKENS_RETURNED.inc(len(members))
+        except Exception:
+            # Unreturned tokens expire with the window
+            pass
+
+    def _check_fork(self) -> None:
+        """Drop leases inherited from a parent process (lock held)."""
+        if self._pid != os.getpid():
+            self._pid = os.getpid()
+            self._leases.clear()
+            LEASE_TOKENS_OUTSTANDING.set(0)
+
+
+class DenyCache:
+    """Bounded, expiring in-process cache of deny decisions.
+
+    Clients already over their limit are answered from here until their
+    ``reset`` time, so repeat offenders cause no Redis traffic.
+    """
+
+    def __init__(self, max_entries: int = 10000):
+        """Initialize deny cache.
+
+        Args:
+            max_entries: Maximum number of cached deny decisions
+        """
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+
+    def get(self, cache_key, now: Optional[float] = None) -> Optional[dict]:
+        """Get a cached deny decision that has not reset yet.
+
+        Args:
+            cache_key: Client and limit identifier
+            now: Current time in seconds (uses time.time() if None)
+
+        Returns:
+            dict: Cached rate limit info, or None
+        """
+        now = time.time() if now is None else now
+        with self._lock:
+            rate_info = self._entries.get(cache_key)
+            if rate_info is None:
+                return None
+            if rate_info['reset'] <= now:
+                del self._entries[cache_key]
+                return None
+            self.hits += 1
+            return rate_info
+
+    def put(self, cache_key, rate_info: dict) -> None:
+        """Cache a deny decision until its reset time.
+
+        Args:
+            cache_key: Client and limit identifier
+            rate_info: Rate limit info of the deny decision
+        """
+        with self._lock:
+            self._entries[cache_key] = rate_info
+            self._entries.move_to_end(cache_key)
+            if len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop all cached deny decisions."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
 
 
 class RateLimiter:
-    """Rate limiter using sliding window algorithm with Redis."""
+    """Rate limiter backed by Redis with pluggable algorithms.
+
+    - ``sliding_window``: exact sliding window log, one ZSET member per request
+    - ``sliding_window_counter``: weighted current/previous fixed-window
+      counters, two small keys per client
+    - ``gcra`` / ``token_bucket``: one small string key per client
+
+    Every check costs a single round trip. The log and GCRA checks run as
+    Lua scripts, so concurrent requests for the same key cannot overshoot
+    the limit. With ``lease_fraction`` set, sliding window checks are served
+    from per-process token leases (see TokenLeaser).
 
-    def __init__(self, redis_client, default_limit: int = 100, default_window: int = 60):
+    A ``local_limiter`` (see local_limiter.py) enforces limits in-process
+    while Redis is unavailable; with ``redis_client=None`` it is used alone.
+    With ``redis_workload`` set, the limiter's Redis commands go through
+    that bulkhead of the client (see RedisClient's ``bulkheads``). They
+    are never capped by the request deadline, so a caller cannot turn a
+    decision into a fail-open by sending a tiny one.
+    """
+
+    def __init__(
+        self,
+        redis_client,
+        default_limit: int = 100,
+        default_window: int = 60,
+        default_algorithm: str = SLIDING_WINDOW,
+        lease_fraction: Optional[float] = None,
+        lease_error_bound: int = 10,
+        lease_ttl: float = 1.0,
+        local_limiter=None,
+        deny_cache_size: int = 10000,
+        redis_workload: Optional[str] = None
+    ):
         """Initialize rate limiter.
 
         Args:
             redis_client: Redis client instance
             default_limit: Default maximum requests per window
             default_window: Default time window in seconds
+            default_algorithm: Default algorithm (sliding_window, sliding_window_counter,
+                gcra, token_bucket)
+            lease_fraction: Fraction of the limit each worker leases (None disables
+                leasing); needs the sliding_window algorithm and only applies to
+                requests of cost 1
+            lease_error_bound: Maximum tokens a worker holds locally per client key
+            lease_ttl: Seconds a lease may be spent locally
+            local_limiter: In-process backend used when Redis is absent or down
+            deny_cache_size: Maximum cached deny decisions (0 disables the cache)
+            redis_workload: Redis client bulkhead for rate limit commands
+                (None uses the shared pool)
+
+        Raises:
+            ValueError: If the algorithm is unknown, or leasing is asked for
+                with an algorithm other than sliding_window
         """
         self.redis_client = redis_client
+        self.redis_workload = redis_workload
         self.default_limit = default_limit
         self.default_window = default_window
+        self.default_algorithm = resolve_algorithm(default_algorithm)
+        self.local_limiter = local_limiter
+        self.deny_cache = DenyCache(deny_cache_size) if deny_cache_size else None
+        self.leaser = None
+        if lease_fraction and self.default_algorithm != SLIDING_WINDOW:
+            raise ValueError(
+                f"Token leasing only works with the {SLIDING_WINDOW} algorithm, not {default_algorithm}"
+            )
+        if lease_fraction:
+            self.leaser = TokenLeaser(self, lease_fraction, lease_error_bound, lease_ttl)
+
+        if self.deny_cache is not None:
+            TRACKED_KEYS.labels(table='deny_cache').set_function(lambda: len(self.deny_cache))
+        if self.leaser is not None:
+            TRACKED_KEYS.labels(table='lease').set_function(lambda: len(self.leaser._leases))
+        if isinstance(self.local_limiter, LocalRateLimiter):
+            TRACKED_KEYS.labels(table='local').set_function(lambda: len(self.local_limiter))
+
+    def _run_script(self, node, name: str, keys: list, args: list):
+        """Run one of the registered rate limit scripts.
+
+        Args:
+            node: RedisClient holding the keys
+            name: Script name without the "rate_limit:" prefix
+            keys: Script KEYS
+            args: Script ARGV
+
+        Returns:
+            Script result
+
+        Raises:
+            RedisError: If the script could not be run; the client has
+                already counted connection errors towards its breaker
+        """
+        REDIS_COMMANDS.labels(algorithm=name).inc()
+        result = node.run_script(f"rate_limit:{name}", keys, args)
+        if result is None:
+            raise RedisError(f"Rate limit script '{name}' failed")
+        return result
 
     def check_rate_limit(
         self,
         key: str,
         limit: Optional[int] = None,
-        window: Optional[int] = None
+        window: Optional[int] = None,
+        algorithm: Optional[str] = None,
+        cost: int = 1
     ) -> tuple[bool, dict]:
         """Check if request is within rate limit.
 
@@ -37,64 +633,185 @@ class RateLimiter:
             key: Rate limit key (e.g., IP address, user ID)
             limit: Maximum requests allowed (uses default if None)
             window: Time window in seconds (uses default if None)
+            algorithm: Rate limit algorithm (uses default if None)
+            cost: Units of the limit this request consumes
 
         Returns:
             tuple: (is_allowed, rate_limit_info)
         """
         limit = limit or self.default_limit
         window = window or self.default_window
+        algorithm = resolve_algorithm(algorithm) if algorithm else self.default_algorithm
+
+        now = time.time()
+        now_ms = int(now * 1000)
 
-        # If Redis is not connected, allow the request
-        if not self.redis_client.is_connected():
+        # All of a client's keys live on one node when Redis is sharded
+        node = self.redis_client.node_for(key) if self.redis_client is not None else None
+
+        # If Redis is not connected, enforce locally or allow the request
+        if node is None or not node.is_connected():
+            if self.local_limiter is not None:
+                return self._check_local(key, now_ms, limit, window, cost)
             return True, {
                 'limit': limit,
                 'remaining': limit,
-                'reset': int(time.time()) + window
+                'reset': int(now) + window,
+                'fail_open': True
             }
 
-        redis_key = f"rate_limit:{key}"
-        current_time = int(time.time())
-        window_start = current_time - window
-
         try:
-            # Remove old entries outside the current window
-            self.redis_client._client.zremrangebyscore(redis_key, 0, window_start)
-
-            # Count requests in current window
-            current_count = self.redis_client._client.zcard(redis_key)
-
-            if current_count < limit:
-                # Add current request
-                self.redis_client._client.zadd(redis_key, {str(current_time): current_time})
-                self.redis_client._client.expire(redis_key, window)
-
-                remaining = limit - current_count - 1
-                return True, {
+            with workload(self.redis_workload), ignore_deadline():
+                if algorithm == GCRA:
+                    allowed, remaining, reset_ms = self._check_gcra(node, key, now_ms, limit, window, cost)
+                elif algorithm == SLIDING_WINDOW_COUNTER:
+                    allowed, remaining, reset_ms = self._check_sliding_window_counter(
+                        node, key, now_ms, limit, window, cost)
+                elif self.leaser is not None and cost == 1:
+                    # Weighted requests go straight to the log so a lease is never split
+                    allowed, remaining, reset_ms = self.leaser.acquire(node, key, now_ms, limit, window)
+                else:
+                    allowed, remaining, reset_ms = self._check_sliding_window(node, key, now_ms, limit, window, cost)
+                return bool(allowed), {
                     'limit': limit,
-                    'remaining': remaining,
-                    'reset': current_time + window
-                }
-            else:
-                # Rate limit exceeded
-                remaining = 0
-                # Get the oldest request timestamp to calculate reset time
-                oldest = self.redis_client._client.zrange(redis_key, 0, 0, withscores=True)
-                reset_time = int(oldest[0][1]) + window if oldest else current_time + window
-
-                return False, {
-                    'limit': limit,
-                    'remaining': remaining,
-                    'reset': reset_time
+                    'remaining': int(remaining),
+                    'reset': math.ceil(int(reset_ms) / 1000)
                 }
         except Exception as e:
+            if self.local_limiter is not None:
+                return self._check_local(key, now_ms, limit, window, cost)
             # On error, allow the request (fail open)
             return True, {
                 'limit': limit,
                 'remaining': limit,
-                'reset': current_time + window,
-                'error': str(e)
+                'reset': int(now) + window,
+                'error': str(e),
+                'fail_open': True
             }
 
+    def _check_local(self, key: str, now_ms: int, limit: int, window: int, cost: int = 1) -> tuple[bool, dict]:
+        """Decide with the in-process backend."""
+        allowed, remaining, reset_ms = self.local_limiter.check(key, now_ms, limit, window, cost)
+        return bool(allowed), {
+            'limit': limit,
+            'remaining': int(remaining),
+            'reset': math.ceil(reset_ms / 1000),
+            'backend': 'local'
+        }
+
+    def _check_sliding_window(self, node, key: str, now_ms: int, limit: int, window: int, cost: int = 1) -> list:
+        """Run the sliding window log check for a key."""
+        return self._run_script(
+            node,
+            SLIDING_WINDOW,
+            keys=[f"rate_limit:{key}"],
+            args=[now_ms, window * 1000, limit, f"{now_ms}:{uuid.uuid4().hex}", cost]
+        )
+
+    def _check_sliding_window_counter(
+        self,
+        node,
+        key: str,
+        now_ms: int,
+        limit: int,
+        window: int,
+        cost: int = 1
+    ) -> list:
+        """Run the sliding window counter check for a key.
+
+        The check and the increment run in one script, so a decision costs
+        one round trip and a rejected request never touches the counters.
+        """
+        window_ms = window * 1000
+        index, elapsed_ms = divmod(now_ms, window_ms)
+        return self._run_script(
+            node,
+            SLIDING_WINDOW_COUNTER,
+            keys=[f"rate_limit:swc:{key}:{index}", f"rate_limit:swc:{key}:{index - 1}"],
+            args=[elapsed_ms, window_ms, limit, cost, index * window_ms]
+        )
+
+    def _check_gcra(self, node, key: str, now_ms: int, limit: int, window: int, cost: int = 1) -> list:
+        """Run the GCRA check for a key."""
+        return self._run_script(
+            node,
+            GCRA,
+            keys=[f"rate_limit:gcra:{key}"],
+            args=[now_ms, window * 1000, limit, cost]
+        )
+
+    def acquire_concurrency(self, key: str, max_in_flight: int, timeout: int = 60) -> tuple[bool, dict, Optional[str]]:
+        """Take an in-flight slot for a client.
+
+        Args:
+            key: Concurrency key (e.g., IP address, user ID)
+            max_in_flight: Maximum concurrent requests allowed
+            timeout: Seconds after which an unreleased slot is reclaimed
+
+        Returns:
+            tuple: (is_allowed, concurrency_info, lease_id); lease_id is None
+            when no slot was taken and nothing needs releasing
+        """
+        now = time.time()
+        now_ms = int(now * 1000)
+
+        node = self.redis_client.node_for(key) if self.redis_client is not None else None
+        if node is None or not node.is_connected():
+            return True, {
+                'limit': max_in_flight,
+                'remaining': max_in_flight,
+                'reset': int(now) + timeout,
+                'fail_open': True
+            }, None
+
+        lease_id = uuid.uuid4().hex
+        try:
+            with workload(self.redis_workload), ignore_deadline():
+                allowed, remaining, reset_ms = self._run_script(
+                    node,
+                    'concurrency',
+                    keys=[f"concurrency:{key}"],
+                    args=[now_ms, max_in_flight, lease_id, timeout * 1000]
+                )
+        except Exception as e:
+            # On error, allow the request (fail open)
+            return True, {
+                'limit': max_in_flight,
+                'remaining': max_in_flight,
+                'reset': int(now) + timeout,
+                'error': str(e),
+                'fail_open': True
+            }, None
+
+        return bool(allowed), {
+            'limit': max_in_flight,
+            'remaining': int(remaining),
+            'reset': math.ceil(int(reset_ms) / 1000)
+        }, lease_id if allowed else None
+
+    def release_concurrency(self, key: str, lease_id: Optional[str]) -> None:
+        """Give back an in-flight slot taken by acquire_concurrency.
+
+        Args:
+            key: Concurrency key
+            lease_id: Lease id returned by acquire_concurrency
+        """
+        if lease_id is None:
+            return
+        try:
+            REDIS_COMMANDS.labels(algorithm='concurrency').inc()
+            with workload(self.redis_workload), ignore_deadline(), self.redis_client.node_for(key).pipeline() as pipe:
+                pipe.zrem(f"concurrency:{key}", lease_id)
+        except Exception:
+            # An unreleased slot is reclaimed after its timeout
+            pass
+
+    def release_leases(self) -> None:
+        """Return unspent leased tokens to Redis."""
+        if self.leaser is not None:
+            with workload(self.redis_workload), ignore_deadline():
+                self.leaser.release_all()
+
     def get_client_identifier(self) -> str:
         """Get client identifier for rate limiting.
 
@@ -110,46 +827,109 @@ class RateLimiter:
         return client_ip
 
 
-def rate_limit(limit: int = 100, window: int = 60, key_func: Optional[Callable] = None):
+def _limiter_and_key(key_func: Optional[Callable]) -> tuple:
+    """Rate limiter of the current app and the key of the current client.
+
+    Returns:
+        tuple: (rate_limiter, key); both None if no limiter is configured
+    """
+    from flask import current_app
+    rate_limiter = getattr(current_app, 'rate_limiter', None)
+    if not rate_limiter:
+        return None, None
+    return rate_limiter, key_func() if key_func else rate_limiter.get_client_identifier()
+
+
+def _check_with_deny_cache(rate_limiter, key: str, limit: int, window: int, algorithm: Optional[str], cost: int) -> tuple:
+    """Check a rate limit, answering repeat offenders from the deny cache until reset.
+
+    Returns:
+        tuple: (is_allowed, rate_info, backend that decided)
+    """
+    cache_key = (key, limit, window, algorithm, cost)
+    deny_cache = rate_limiter.deny_cache
+    rate_info = deny_cache.get(cache_key) if deny_cache is not None else None
+    if rate_info is not None:
+        return False, rate_info, 'deny_cache'
+
+    is_allowed, rate_info = rate_limiter.check_rate_limit(key, limit, window, algorithm, cost)
+    if not is_allowed and deny_cache is not None:
+        deny_cache.put(cache_key, rate_info)
+    return is_allowed, rate_info, rate_info.get('backend', 'none' if rate_info.get('fail_open') else 'redis')
+
+
+def _record_decision(route: str, is_allowed: bool, info: dict, backend: Optional[str] = None) -> None:
+    """Count a rate or concurrency limit decision.
+
+    Args:
+        route: Flask endpoint the request was for
+        is_allowed: Whether the request was let through
+        info: Info returned by the limiter
+        backend: What decided (defaults to redis, or none when failing open)
+    """
+    if info.get('fail_open'):
+        outcome = 'fail_open'
+    else:
+        outcome = 'allow' if is_allowed else 'deny'
+    if backend is None:
+        backend = 'none' if info.get('fail_open') else 'redis'
+    DECISIONS.labels(route=route, outcome=outcome, backend=backend).inc()
+
+
+def rate_limit(
+    limit: int = 100,
+    window: int = 60,
+    key_func: Optional[Callable] = None,
+    algorithm: Optional[str] = None,
+    cost: int = 1
+):
     """Decorator to apply rate limiting to an endpoint.
 
     Args:
         limit: Maximum requests allowed
         window: Time window in seconds
         key_func: Optional function to generate rate limit key
+        algorithm: Rate limit algorithm (uses the limiter default if None)
+        cost: Units of the limit each request consumes, so expensive
+            endpoints can share a budget with cheap ones
 
     Returns:
         Decorated function with rate limiting
     """
+    if algorithm:
+        resolve_algorithm(algorithm)
+    if cost < 1:
+        raise ValueError(f"Rate limit cost must be at least 1, got {cost}")
+
     def decorator(func):
         @wraps(func)
         def wrapper(*args, **kwargs):
-            # Get rate limiter from app context
-            from flask import current_app
-            rate_limiter = getattr(current_app, 'rate_limiter', None)
-
+            rate_limiter, key = _limiter_and_key(key_func)
             if not rate_limiter:
                 # If rate limiter not configured, allow request
                 return func(*args, **kwargs)
 
-            # Get client identifier
-            if key_func:
-                key = key_func()
-            else:
-                key = rate_limiter.get_client_identifier()
-
-            # Check rate limit
-            is_allowed, rate_info = rate_limiter.check_rate_limit(key, limit, window)
+            route = request.endpoint or 'unknown'
+            start = time.perf_counter()
+            is_allowed, rate_info, backend = _check_with_deny_cache(
+                rate_limiter, key, limit, window, algorithm, cost)
+            DECISION_DURATION.labels(
+                route=route,
+                algorithm=algorithm or rate_limiter.default_algorithm
+            ).observe(time.perf_counter() - start)
+            _record_decision(route, is_allowed, rate_info, backend)
 
             if not is_allowed:
                 trace_id = get_trace_id()
+                retry_after = max(rate_info['reset'] - int(time.time()), 0)
                 response = jsonify({
                     'error': 'Rate Limit Exceeded',
                     'message': f'Too many requests. Limit: {limit} requests per {window} seconds',
-                    'retry_after': rate_info['reset'] - int(time.time()),
+                    'retry_after': retry_after,
                     'trace_id': trace_id
                 })
                 response.status_code = 429
+                response.headers['Retry-After'] = str(retry_after)
                 response.headers['X-RateLimit-Limit'] = str(rate_info['limit'])
                 response.headers['X-RateLimit-Remaining'] = str(rate_info['remaining'])
                 response.headers['X-RateLimit-Reset'] = str(rate_info['reset'])
@@ -164,3 +944,62 @@ def rate_limit(limit: int = 100, window: int = 60, key_func: Optional[Callable]
             return response
         return wrapper
     return decorator
+
+
+def concurrency_limit(
+    max_in_flight: int,
+    timeout: int = 60,
+    key_func: Optional[Callable] = None
+):
+    """Decorator to cap the number of concurrent requests per client.
+
+    Complements rate_limit for slow endpoints, where a client can stay
+    under its request rate while still tying up many workers. Each
+    decorated route keeps its own count.
+
+    Args:
+        max_in_flight: Maximum concurrent requests allowed
+        timeout: Seconds after which a slot that was never released
+            (e.g. the worker died) is reclaimed
+        key_func: Optional function to generate concurrency key
+
+    Returns:
+        Decorated function with concurrency limiting
+    """
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            rate_limiter, key = _limiter_and_key(key_func)
+            if not rate_limiter:
+                return func(*args, **kwargs)
+
+            route = request.endpoint or 'unknown'
+            # Per route, so routes with different caps or timeouts never share leases
+            key = f"{route}:{key}"
+            is_allowed, info, lease_id = rate_limiter.acquire_concurrency(key, max_in_flight, timeout)
+            _record_decision(route, is_allowed, info)
+
+            if not is_allowed:
+                trace_id = get_trace_id()
+                retry_after = max(info['reset'] - int(time.time()), 0)
+                response = jsonify({
+                    'error': 'Too Many Concurrent Requests',
+                    'message': f'Too many requests in flight. Limit: {max_in_flight} concurrent requests',
+                    'retry_after': retry_after,
+                    'trace_id': trace_id
+                })
+                response.status_code = 429
+                response.headers['Retry-After'] = str(retry_after)
+                response.headers['X-ConcurrencyLimit-Limit'] = str(info['limit'])
+                response.headers['X-ConcurrencyLimit-Remaining'] = str(info['remaining'])
+                return response
+
+            try:
+                response = make_response(func(*args, **kwargs))
+            finally:
+                rate_limiter.release_concurrency(key, lease_id)
+            response.headers['X-ConcurrencyLimit-Limit'] = str(info['limit'])
+            response.headers['X-ConcurrencyLimit-Remaining'] = str(info['remaining'])
+            return response
+        return wrapper
+    return decorator
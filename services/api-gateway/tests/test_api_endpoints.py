@@ -53,6 +53,16 @@ class TestStatusEndpoint:
         assert 'in_use' in pool
         assert 'max_connections' in pool
 
+    def test_status_shows_connection_budget(self, client):
+        """Test that status reports the Redis connection budget per worker, pod and deployment."""
+        from config import Config
+
+        budget = json.loads(client.get('/api/status').data)['redis_pool']['budget']
+
+        assert budget['per_process'] == (Config.REDIS_MAX_CONNECTIONS or Config.GUNICORN_THREADS + 2)
+        assert budget['per_pod'] == budget['per_process'] * Config.GUNICORN_WORKERS
+        assert budget['deployment'] == budget['per_pod'] * Config.REDIS_MAX_REPLICAS
+
     def test_status_increments_request_count(self, client, mock_redis_client):
         """Test that status endpoint increments request counter."""
         # Mock incr to return incrementing values
@@ -159,6 +169,27 @@ class TestMetricsEndpoint:
         assert '#' in data or 'HELP' in data or 'TYPE' in data
 
 
+@pytest.mark.unit
+class TestSlowRedisCommandsEndpoint:
+    """Tests for /debug/redis/slow-commands endpoint."""
+
+    def test_lists_slowest_commands_first(self, client, mock_redis_client):
+        """Test that logged commands are returned slowest first, with a limit."""
+        mock_redis_client._slow_log.record('GET', 'worker:tasks:cleanup', 12_000_000, 'trace-1')
+        mock_redis_client._slow_log.record('EVALSHA', 'rate_limit:10.0.0.1', 50_000_000, 'trace-2')
+        mock_redis_client._slow_log.record('INCR', 'api:total_requests', 20_000_000)
+
+        response = client.get('/debug/redis/slow-commands?limit=2')
+        data = json.loads(response.data)
+
+        assert response.status_code == 200
+        assert data['threshold_ms'] == 10.0
+        assert [(c['command'], c['key'], c['trace_id']) for c in data['commands']] == [
+            ('EVALSHA', 'rate_limit:*', 'trace-2'),
+            ('INCR', 'api:total_requests', None),
+        ]
+
+
 @pytest.mark.unit
 class TestErrorHandlers:
     """Tests for error handlers."""
@@ -0,0 +1,267 @@
+"""Unit tests and benchmark for the asyncio rate limiter and Redis client."""
+import asyncio
+import time
+import pytest
+import fakeredis
+import fakeredis.aioredis
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import AsyncMock, Mock, patch
+from redis.exceptions import ConnectionError
+
+
+# Simulated slow Redis round trip per command for the benchmark
+ROUND_TRIP_SECONDS = 0.02
+CONCURRENCY = 200
+DECISIONS = 400
+
+
+class LatencyFakeAsyncRedis(fakeredis.FakeAsyncRedis):
+    """FakeAsyncRedis that awaits one round trip on every command."""
+
+    async def execute_command(self, *args, **options):
+        await asyncio.sleep(ROUND_TRIP_SECONDS)
+        return await super().execute_command(*args, **options)
+
+
+class LatencyFakeRedis(fakeredis.FakeRedis):
+    """FakeRedis that blocks for one round trip on every command."""
+
+    def execute_command(self, *args, **options):
+        time.sleep(ROUND_TRIP_SECONDS)
+        return super().execute_command(*args, **options)
+
+
+def _async_client(fake_client):
+    """Build an AsyncRedisClient backed by a fake client."""
+    from async_redis_client import AsyncRedisClient
+
+    client = AsyncRedisClient(host='localhost', port=6379, health_check_interval=3600)
+    client._client = fake_client
+    client._is_connected = True
+    client._started = True
+    return client
+
+
+def _fake_pool(server):
+    """Pool factory that connects to a fakeredis server instead of the network."""
+    from async_redis_client import InstrumentedAsyncConnectionPool
+
+    def pool_factory(**kwargs):
+        # fakeredis connections do not answer redis-py's per-connection health PING
+        kwargs['health_check_interval'] = 0
+        return InstrumentedAsyncConnectionPool(
+            connection_class=fakeredis.aioredis.FakeAsyncRedisConnection, server=server, **kwargs)
+    return pool_factory
+
+
+@pytest.fixture
+def async_redis_client():
+    """AsyncRedisClient with FakeAsyncRedis backend."""
+    return _async_client(fakeredis.FakeAsyncRedis(decode_responses=True))
+
+
+@pytest.mark.unit
+class TestAsyncRedisClient:
+    """Tests for AsyncRedisClient."""
+
+    @pytest.mark.asyncio
+    async def test_get_set_incr_delete(self, async_redis_client):
+        """Test the basic accessors."""
+        assert await async_redis_client.set('key', 'value') is True
+        assert await async_redis_client.get('key') == 'value'
+        assert await async_redis_client.incr('counter') == 1
+        assert await async_redis_client.delete('key', 'counter') == 2
+        assert await async_redis_client.get('key', default='missing') == 'missing'
+
+    @pytest.mark.asyncio
+    async def test_connection_error_returns_default(self, async_redis_client):
+        """Test fail-soft defaults, and that only enough failures open the breaker."""
+        async_redis_client._client.get = AsyncMock(side_effect=ConnectionError("Connection lost"))
+
+        assert await async_redis_client.get('key', default='default') == 'default'
+        assert async_redis_client._is_connected is True
+
+        for _ in range(2):
+            await async_redis_client.get('key')
+        assert async_redis_client._is_connected is False
+        assert async_redis_client._breaker.state == 'open'
+
+    @pytest.mark.asyncio
+    async def test_not_connected_skips_commands(self, async_redis_client):
+        """Test that commands are skipped while disconnected."""
+        async_redis_client._is_connected = False
+
+        assert await async_redis_client.set('key', 'value') is False
+        assert await async_redis_client.incr('counter') is None
+        assert await async_redis_client.delete('key') == 0
+
+    @pytest.mark.asyncio
+    async def test_health_check_marks_disconnected(self):
+        """Test that a failed health check reports disconnected without pinging per call."""
+        from async_redis_client import AsyncRedisClient
+
+        client = AsyncRedisClient(host='localhost', port=6379)
+        client._client.ping = AsyncMock(side_effect=ConnectionError("refused"))
+
+        assert await client.is_connected() is False
+        assert await client.is_connected() is False
+        assert client._client.ping.await_count == 1
+        assert client.get_pool_stats()['max_connections'] == 50
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_recovers_once_redis_answers_again(self):
+        """Test that the health check task re-probes after the breaker opens."""
+        from async_redis_client import AsyncRedisClient
+
+        with patch('async_redis_client.InstrumentedAsyncConnectionPool', side_effect=_fake_pool(fakeredis.FakeServer())):
+            client = AsyncRedisClient(host='localhost', port=6379, backoff_base=0.01)
+            assert await client.connect() is True
+
+            with patch.object(client._client, 'get', AsyncMock(side_effect=ConnectionError("Connection lost"))):
+                for _ in range(3):
+                    await client.get('key')
+            assert await client.is_connected() is False
+
+            for _ in range(100):
+                if await client.is_connected():
+                    break
+                await asyncio.sleep(0.01)
+            assert await client.is_connected() is True
+            assert await client.set('key', 'value') is True
+            await client.close()
+
+    @pytest.mark.asyncio
+    async def test_pool_stats_come_from_instrumented_pool(self):
+        """Test that pool usage is reported by the pool itself."""
+        from async_redis_client import AsyncRedisClient
+
+        with patch('async_redis_client.InstrumentedAsyncConnectionPool', side_effect=_fake_pool(fakeredis.FakeServer())):
+            client = AsyncRedisClient(host='localhost', port=6379, max_connections=30, health_monitor=False)
+        assert await client.connect() is True
+        await client.set('key', 'value')
+
+        assert client.get_pool_stats() == {'available': 1, 'in_use': 0, 'created': 1, 'max_connections': 30}
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_pipeline_error_counts_as_failure(self, async_redis_client):
+        """Test that a failed pipeline is reported to the circuit breaker."""
+        raw = Mock(execute=AsyncMock(side_effect=ConnectionError("Connection lost")))
+        raw.__len__ = Mock(return_value=1)
+        async_redis_client._client.pipeline = Mock(return_value=raw)
+
+        pipe = async_redis_client.pipeline()
+        pipe.incr('counter')
+        with pytest.raises(ConnectionError):
+            await pipe.execute()
+
+        assert async_redis_client._connection_failures == 1
+
+    @pytest.mark.asyncio
+    async def test_run_script_reloads_after_script_flush(self, async_redis_client):
+        """Test that registered scripts run by name and are reloaded on NOSCRIPT."""
+        import rate_limiter  # noqa: F401 - registers the rate limit scripts
+
+        args = [1_200_000, 60_000, 3, 1]
+        assert (await async_redis_client.run_script('rate_limit:gcra', keys=['k'], args=args))[0] == 1
+        await async_redis_client._client.script_flush()
+        assert (await async_redis_client.run_script('rate_limit:gcra', keys=['k'], args=args))[0] == 1
+
+
+@pytest.mark.unit
+class TestAsyncRateLimiter:
+    """Tests for AsyncRateLimiter."""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize('algorithm', ['sliding_window', 'sliding_window_counter', 'gcra'])
+    async def test_enforces_limit(self, async_redis_client, algorithm):
+        """Test that every algorithm enforces the limit."""
+        from async_rate_limiter import AsyncRateLimiter
+
+        limiter = AsyncRateLimiter(async_redis_client, default_limit=3, default_window=60)
+
+        with patch('async_rate_limiter.time.time', return_value=1200.0):
+            results = [await limiter.check_rate_limit('10.0.0.1', algorithm=algorithm) for _ in range(4)]
+
+        assert [allowed for allowed, _ in results] == [True, True, True, False]
+        assert results[0][1]['remaining'] == 2
+
+    @pytest.mark.asyncio
+    async def test_concurrent_checks_do_not_overshoot(self, async_redis_client):
+        """Test that concurrent coroutines stay within the limit."""
+        from async_rate_limiter import AsyncRateLimiter
+
+        limiter = AsyncRateLimiter(async_redis_client, default_limit=10, default_window=60)
+        results = await asyncio.gather(*[limiter.check_rate_limit('10.0.0.1') for _ in range(50)])
+
+        assert sum(allowed for allowed, _ in results) == 10
+
+    @pytest.mark.asyncio
+    async def test_fails_open_on_redis_error(self, async_redis_client):
+        """Test that Redis errors fail open."""
+        from async_rate_limiter import AsyncRateLimiter
+
+        async_redis_client.run_script = AsyncMock(side_effect=ConnectionError("Connection lost"))
+        limiter = AsyncRateLimiter(async_redis_client, default_limit=1)
+
+        is_allowed, info = await limiter.check_rate_limit('10.0.0.1')
+
+        assert is_allowed is True
+        assert info['fail_open'] is True
+        assert 'error' in info
+
+    @pytest.mark.asyncio
+    async def test_falls_back_to_local_limiter(self, async_redis_client):
+        """Test that the local backend decides while Redis is down."""
+        from async_rate_limiter import AsyncRateLimiter
+        from local_limiter import LocalRateLimiter
+
+        async_redis_client._is_connected = False
+        limiter = AsyncRateLimiter(async_redis_client, default_limit=1, local_limiter=LocalRateLimiter())
+
+        assert (await limiter.check_rate_limit('10.0.0.1'))[0] is True
+        assert (await limiter.check_rate_limit('10.0.0.1'))[0] is False
+
+
+@pytest.mark.slow
+class TestAsyncThroughputBenchmark:
+    """Compare throughput of the async and sync paths at high concurrency."""
+
+    @pytest.mark.benchmark
+    def test_async_throughput_exceeds_thread_pool(self, mock_redis_client):
+        """Test that coroutines outrun a gthread-sized pool when Redis is slow."""
+        from async_rate_limiter import AsyncRateLimiter
+        from rate_limiter import RateLimiter
+
+        mock_redis_client._client = LatencyFakeRedis(decode_responses=True)
+        sync_limiter = RateLimiter(mock_redis_client, default_limit=10 ** 6, deny_cache_size=0)
+        sync_limiter.check_rate_limit('warmup')
+
+        # 2 gunicorn workers x 4 threads, as in the gateway Dockerfile
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(executor.map(lambda i: sync_limiter.check_rate_limit(f"10.0.{i % 256}.1"), range(DECISIONS)))
+        sync_rate = DECISIONS / (time.perf_counter() - start)
+
+        async def run_async():
+            client = _async_client(LatencyFakeAsyncRedis(decode_responses=True))
+            limiter = AsyncRateLimiter(client, default_limit=10 ** 6)
+            await limiter.check_rate_limit('warmup')
+            semaphore = asyncio.Semaphore(CONCURRENCY)
+
+            async def decide(i):
+                async with semaphore:
+                    return await limiter.check_rate_limit(f"10.0.{i % 256}.1")
+
+            start = time.perf_counter()
+            await asyncio.gather(*[decide(i) for i in range(DECISIONS)])
+            return DECISIONS / (time.perf_counter() - start)
+
+        async_rate = asyncio.run(run_async())
+        print(
+            f"\nrate limit throughput (rtt={ROUND_TRIP_SECONDS * 1000:.0f}ms): "
+            f"sync 8 threads={sync_rate:.0f}/s async {CONCURRENCY} tasks={async_rate:.0f}/s"
+        )
+
+        assert async_rate > sync_rate
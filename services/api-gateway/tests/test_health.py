@@ -102,3 +102,31 @@ class TestReadinessProbe:
         assert response.status_code == 503
         data = json.loads(response.data)
         assert data['status'] == 'not_ready'
+
+    def test_readiness_returns_503_while_redis_warms_up(self, client, mock_redis_client):
+        """Test that readiness waits for this worker's Redis warm-up."""
+        from unittest.mock import Mock, patch
+
+        mock_redis_client.is_connected.return_value = True
+        mock_redis_client._warmer = Mock(is_done=Mock(return_value=False))
+
+        with patch('app.Config') as mock_config:
+            mock_config.REDIS_PASSWORD = 'test-password'
+            response = client.get('/health/ready')
+
+        assert response.status_code == 503
+        assert json.loads(response.data)['dependencies']['redis']['warm'] is False
+
+    def test_readiness_does_not_wait_for_warm_up_without_redis(self, client, mock_redis_client):
+        """Test that a dev setup without Redis is ready while warm-up keeps retrying."""
+        from unittest.mock import Mock, patch
+
+        mock_redis_client.is_connected.return_value = False
+        mock_redis_client._warmer = Mock(is_done=Mock(return_value=False))
+
+        with patch('app.Config') as mock_config:
+            mock_config.REDIS_PASSWORD = ''
+            response = client.get('/health/ready')
+
+        assert response.status_code == 200
+        assert json.loads(response.data)['dependencies']['redis']['warm'] is False
@@ -0,0 +1,198 @@
+"""Unit tests for in-process rate limiting backends."""
+import multiprocessing
+import pytest
+from unittest.mock import Mock, patch
+
+
+@pytest.mark.unit
+class TestLocalRateLimiter:
+    """Tests for LocalRateLimiter."""
+
+    def test_enforces_limit(self):
+        """Test that the local limiter admits a burst up to the limit."""
+        from local_limiter import LocalRateLimiter
+
+        limiter = LocalRateLimiter()
+        results = [limiter.check('10.0.0.1', 1000000, 5, 60) for _ in range(6)]
+
+        assert [allowed for allowed, _, _ in results] == [1] * 5 + [0]
+        assert [remaining for _, remaining, _ in results] == [4, 3, 2, 1, 0, 0]
+        assert results[-1][2] == 1012000
+
+    def test_refills_over_time(self):
+        """Test that tokens are replenished at limit/window."""
+        from local_limiter import LocalRateLimiter
+
+        limiter = LocalRateLimiter()
+        for _ in range(5):
+            limiter.check('10.0.0.1', 1000000, 5, 60)
+
+        assert limiter.check('10.0.0.1', 1000000, 5, 60)[0] == 0
+        assert limiter.check('10.0.0.1', 1012000, 5, 60)[0] == 1
+
+    def test_evicts_least_recently_used(self):
+        """Test that the state table stays bounded with LRU eviction."""
+        from local_limiter import LocalRateLimiter
+
+        limiter = LocalRateLimiter(max_keys=3)
+        for ip in ['a', 'b', 'c']:
+            limiter.check(ip, 1000000, 1, 60)
+        limiter.check('a', 1000000, 1, 60)
+        limiter.check('d', 1000000, 1, 60)
+
+        assert len(limiter) == 3
+        assert limiter.get_stats()['evictions'] == 1
+        # 'b' was evicted and starts fresh; 'a' is still throttled
+        assert limiter.check('b', 1000000, 1, 60)[0] == 1
+        assert limiter.check('a', 1000000, 1, 60)[0] == 0
+
+    def test_state_uses_slots(self):
+        """Test that per-client state has no instance dict."""
+        from local_limiter import _ClientState
+
+        assert not hasattr(_ClientState(), '__dict__')
+
+
+def _shared_worker(path, results):
+    """Spend requests against a shared table from a child process."""
+    from local_limiter import SharedMemoryRateLimiter
+
+    limiter = SharedMemoryRateLimiter(path, slots=64)
+    results.put(sum(limiter.check('10.0.0.1', 1000000, 10, 60)[0] for _ in range(10)))
+
+
+@pytest.mark.unit
+class TestSharedMemoryRateLimiter:
+    """Tests for SharedMemoryRateLimiter."""
+
+    def test_enforces_limit(self, tmp_path):
+        """Test that the shared limiter enforces the limit."""
+        from local_limiter import SharedMemoryRateLimiter
+
+        limiter = SharedMemoryRateLimiter(str(tmp_path / 'ratelimit'), slots=64)
+        results = [limiter.check('10.0.0.1', 1000000, 3, 60)[0] for _ in range(4)]
+
+        assert results == [1, 1, 1, 0]
+
+    def test_counts_are_shared_between_processes(self, tmp_path):
+        """Test that worker processes see the same counts."""
+        path = str(tmp_path / 'ratelimit')
+        ctx = multiprocessing.get_context('fork')
+        results = ctx.Queue()
+        workers = [ctx.Process(target=_shared_worker, args=(path, results)) for _ in range(3)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join(timeout=10)
+
+        assert sum(results.get(timeout=5) for _ in workers) == 10
+
+    def test_reopening_after_fork_closes_the_inherited_table(self, tmp_path):
+        """Test that each fork reopens the table without leaking the parent's fd or mapping."""
+        import os
+        from local_limiter import SharedMemoryRateLimiter
+
+        limiter = SharedMemoryRateLimiter(str(tmp_path / 'ratelimit'), slots=64)
+        limiter.check('10.0.0.1', 1000000, 10, 60)
+        inherited_map = limiter._map
+        open_fds = len(os.listdir('/proc/self/fd'))
+
+        for pid in (1001, 1002, 1003):
+            with patch('local_limiter.os.getpid', return_value=pid):
+                limiter.check('10.0.0.1', 1000000, 10, 60)
+
+        assert inherited_map.closed
+        assert len(os.listdir('/proc/self/fd')) == open_fds
+        assert limiter.check('10.0.0.1', 1000000, 10, 60)[1] == 5
+
+    def test_table_is_bounded(self, tmp_path):
+        """Test that new clients evict old ones instead of growing the table."""
+        from local_limiter import SharedMemoryRateLimiter
+
+        path = tmp_path / 'ratelimit'
+        limiter = SharedMemoryRateLimiter(str(path), slots=8, probe=2)
+        for i in range(100):
+            limiter.check(f"10.0.0.{i}", 1000000, 10, 60)
+
+        assert path.stat().st_size == 8 * SharedMemoryRateLimiter.SLOT.size
+        assert limiter.get_stats()['evictions'] > 0
+
+    def test_colliding_slot_recovering_does_not_reset_a_client(self, tmp_path):
+        """Test that a throttled client keeps its state when an earlier colliding slot frees up."""
+        from local_limiter import SharedMemoryRateLimiter
+
+        limiter = SharedMemoryRateLimiter(str(tmp_path / 'ratelimit'), slots=4, probe=4)
+        start = limiter._hash('client:2:10') % 4
+        # A short-lived key that takes the client's first slot
+        other = next(f"other-{i}" for i in range(1000) if limiter._hash(f"other-{i}:10:1") % 4 == start)
+
+        limiter.check(other, 0, limit=10, window=1)
+        assert limiter.check('client', 0, limit=2, window=10)[0]
+        assert limiter.check('client', 0, limit=2, window=10)[0]
+        assert not limiter.check('client', 0, limit=2, window=10)[0]
+
+        # The other key has recovered by now and its slot is free again
+        allowed, remaining, _ = limiter.check('client', 1000, limit=2, window=10)
+        assert not allowed
+        assert remaining == 0
+
+    def test_duplicate_slots_keep_the_latest_state(self, tmp_path):
+        """Test that a key stored twice in its probe window is merged into one slot."""
+        from local_limiter import SharedMemoryRateLimiter
+
+        limiter = SharedMemoryRateLimiter(str(tmp_path / 'ratelimit'), slots=4, probe=4)
+        key_hash = limiter._hash('client:2:10')
+        start = key_hash % 4
+        limiter.check('warm', 0, limit=1, window=1)
+        size = SharedMemoryRateLimiter.SLOT.size
+        limiter.SLOT.pack_into(limiter._map, start * size, key_hash, 0.0)
+        limiter.SLOT.pack_into(limiter._map, ((start + 1) % 4) * size, key_hash, 20000.0)
+
+        assert not limiter.check('client', 1000, limit=2, window=10)[0]
+        slots = [limiter.SLOT.unpack_from(limiter._map, slot * size)[0] for slot in range(4)]
+        assert slots.count(key_hash) == 1
+
+
+@pytest.mark.unit
+class TestRateLimiterLocalFallback:
+    """Tests for RateLimiter falling back to the local backend."""
+
+    def test_enforces_limit_while_redis_disconnected(self, mock_redis_client):
+        """Test that limits still apply when Redis is down."""
+        from local_limiter import LocalRateLimiter
+        from rate_limiter import RateLimiter
+
+        mock_redis_client.is_connected = Mock(return_value=False)
+        limiter = RateLimiter(mock_redis_client, default_limit=2, default_window=60,
+                              local_limiter=LocalRateLimiter())
+
+        results = [limiter.check_rate_limit('10.0.0.1') for _ in range(3)]
+
+        assert [allowed for allowed, _ in results] == [True, True, False]
+        assert results[0][1]['backend'] == 'local'
+
+    def test_falls_back_on_redis_error(self, mock_redis_client):
+        """Test that Redis errors are decided locally instead of failing open."""
+        from local_limiter import LocalRateLimiter
+        from rate_limiter import RateLimiter
+
+        mock_redis_client._client.evalsha = Mock(side_effect=Exception("Redis error"))
+        limiter = RateLimiter(mock_redis_client, default_limit=1, default_window=60,
+                              local_limiter=LocalRateLimiter())
+
+        assert limiter.check_rate_limit('10.0.0.1')[0] is True
+        assert limiter.check_rate_limit('10.0.0.1')[0] is False
+
+    def test_standalone_without_redis(self):
+        """Test that the limiter works with no Redis client at all."""
+        from local_limiter import LocalRateLimiter
+        from rate_limiter import RateLimiter
+
+        limiter = RateLimiter(None, default_limit=1, default_window=60, local_limiter=LocalRateLimiter())
+
+        with patch('rate_limiter.time.time', return_value=1000.0):
+            first = limiter.check_rate_limit('10.0.0.1')
+            second = limiter.check_rate_limit('10.0.0.1')
+
+        assert first[0] is True
+        assert second == (False, {'limit': 1, 'remaining': 0, 'reset': 1060, 'backend': 'local'})
@@ -0,0 +1,190 @@
+"""Latency benchmarks for the rate limiter.
+
+These tests run against FakeRedis with an injected per-command delay so that
+the number of network round trips dominates the measured latency, the same
+way it does against a remote Redis server.
+"""
+import random
+import statistics
+import time
+import pytest
+import fakeredis
+from unittest.mock import patch
+
+
+# Simulated network round trip per Redis command
+ROUND_TRIP_SECONDS = 0.001
+ITERATIONS = 50
+
+
+class LatencyFakeRedis(fakeredis.FakeRedis):
+    """FakeRedis that sleeps for one round trip on every command."""
+
+    def execute_command(self, *args, **options):
+        time.sleep(ROUND_TRIP_SECONDS)
+        return super().execute_command(*args, **options)
+
+
+def legacy_check_rate_limit(client, key, limit, window):
+    """Reference implementation of the previous multi-command check."""
+    redis_key = f"rate_limit:{key}"
+    current_time = int(time.time())
+    window_start = current_time - window
+
+    client.zremrangebyscore(redis_key, 0, window_start)
+    current_count = client.zcard(redis_key)
+
+    if current_count < limit:
+        client.zadd(redis_key, {str(time.time()): current_time})
+        client.expire(redis_key, window)
+        return True
+
+    client.zrange(redis_key, 0, 0, withscores=True)
+    return False
+
+
+def _measure(func, iterations=ITERATIONS):
+    """Return per-call latencies in milliseconds."""
+    latencies = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        func()
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+@pytest.mark.slow
+class TestRateLimiterLatency:
+    """Compare decision latency of the script path against the legacy path."""
+
+    @pytest.fixture
+    def latency_redis_client(self, mock_redis_client):
+        """RedisClient backed by a FakeRedis with simulated round trips."""
+        mock_redis_client._client = LatencyFakeRedis(decode_responses=True)
+        return mock_redis_client
+
+    @pytest.mark.benchmark
+    @pytest.mark.parametrize('limit', [1000, 10], ids=['allow-path', 'deny-path'])
+    def test_script_path_is_faster_than_legacy_path(self, latency_redis_client, limit):
+        """Test that one EVALSHA beats four to five separate commands."""
+        from rate_limiter import RateLimiter
+
+        limiter = RateLimiter(latency_redis_client, default_limit=limit, default_window=60)
+        client = latency_redis_client._client
+
+        # Warm up: load the script and fill the window for the deny path
+        for _ in range(limit if limit < ITERATIONS else 1):
+            limiter.check_rate_limit('script')
+            legacy_check_rate_limit(client, 'legacy', limit, 60)
+
+        script_latencies = _measure(lambda: limiter.check_rate_limit('script'))
+        legacy_latencies = _measure(lambda: legacy_check_rate_limit(client, 'legacy', limit, 60))
+
+        script_median = statistics.median(script_latencies)
+        legacy_median = statistics.median(legacy_latencies)
+        print(
+            f"\nrate limit decision latency (limit={limit}, rtt={ROUND_TRIP_SECONDS * 1000:.1f}ms): "
+            f"script p50={script_median:.2f}ms legacy p50={legacy_median:.2f}ms "
+            f"speedup={legacy_median / script_median:.1f}x"
+        )
+
+        assert script_median < legacy_median
+
+    def test_script_path_does_not_overshoot_under_concurrency(self, latency_redis_client):
+        """Test that concurrent decisions through the script stay within the limit."""
+        from concurrent.futures import ThreadPoolExecutor
+        from rate_limiter import RateLimiter
+
+        limiter = RateLimiter(latency_redis_client, default_limit=20, default_window=60)
+
+        with patch('rate_limiter.time.time', return_value=1234567890.0):
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                results = list(executor.map(lambda _: limiter.check_rate_limit('shared')[0], range(100)))
+
+        assert sum(results) == 20
+
+
+def _simulate_clients(limiter, algorithm, schedule):
+    """Replay a request schedule and return admitted counts per client.
+
+    Args:
+        limiter: RateLimiter instance
+        algorithm: Algorithm to evaluate
+        schedule: Time-ordered list of (timestamp, client_ip)
+
+    Returns:
+        tuple: (admitted counts per client, seconds spent deciding)
+    """
+    clock = [0.0]
+    admitted = {}
+    elapsed = 0.0
+    with patch('rate_limiter.time.time', new=lambda: clock[0]):
+        for timestamp, client_ip in schedule:
+            clock[0] = timestamp
+            start = time.perf_counter()
+            is_allowed, _ = limiter.check_rate_limit(client_ip, algorithm=algorithm)
+            elapsed += time.perf_counter() - start
+            admitted[client_ip] = admitted.get(client_ip, 0) + int(is_allowed)
+        stored = _stored_entries(limiter.redis_client._client)
+    return admitted, elapsed, stored
+
+
+def _stored_entries(client):
+    """Count stored keys and sorted set members held by the limiter."""
+    keys = client.keys('rate_limit:*')
+    members = sum(client.zcard(key) for key in keys if client.type(key) == 'zset')
+    return len(keys), members
+
+
+@pytest.mark.slow
+class TestSlidingWindowCounterAccuracy:
+    """Accuracy-vs-cost of the sliding window counter against the exact log."""
+
+    CLIENTS = 150
+    LIMIT = 20
+    WINDOW = 60
+
+    def _schedule(self):
+        """Build a bursty schedule for many client IPs over three windows."""
+        rng = random.Random(42)
+        schedule = []
+        for i in range(self.CLIENTS):
+            client_ip = f"10.{i // 65536}.{(i // 256) % 256}.{i % 256}"
+            # Mix of quiet, near-limit and abusive clients
+            rate = rng.choice([0.5, 1.0, 1.5, 3.0]) * self.LIMIT / self.WINDOW
+            timestamp = rng.uniform(0, self.WINDOW)
+            while timestamp < self.WINDOW * 3:
+                schedule.append((1_000_020.0 + timestamp, client_ip))
+                timestamp += rng.expovariate(rate)
+        schedule.sort()
+        return schedule
+
+    def test_counter_accuracy_and_cost_against_sorted_set(self, mock_redis_client):
+        """Test that the counter stays close to the exact log at O(1) memory."""
+        from rate_limiter import RateLimiter
+
+        limiter = RateLimiter(mock_redis_client, default_limit=self.LIMIT, default_window=self.WINDOW)
+        schedule = self._schedule()
+
+        exact, exact_seconds, (exact_keys, exact_members) = _simulate_clients(
+            limiter, 'sliding_window', schedule)
+        mock_redis_client._client.flushall()
+        approx, approx_seconds, (approx_keys, approx_members) = _simulate_clients(
+            limiter, 'sliding_window_counter', schedule)
+
+        errors = [abs(approx[ip] - exact[ip]) / exact[ip] for ip in exact]
+        total_error = abs(sum(approx.values()) - sum(exact.values())) / sum(exact.values())
+        print(
+            f"\n{self.CLIENTS} clients, {len(schedule)} requests: "
+            f"mean per-client error={statistics.mean(errors):.1%} "
+            f"max={max(errors):.1%} total admitted error={total_error:.1%}\n"
+            f"sorted set: {exact_keys} keys / {exact_members} members, "
+            f"{exact_seconds / len(schedule) * 1e6:.0f}us per decision\n"
+            f"counter:    {approx_keys} keys / {approx_members} members, "
+            f"{approx_seconds / len(schedule) * 1e6:.0f}us per decision"
+        )
+
+        assert statistics.mean(errors) < 0.1
+        assert approx_members == 0
+        assert approx_keys <= 2 * self.CLIENTS
+        assert exact_members > approx_keys
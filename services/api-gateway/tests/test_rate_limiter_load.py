@@ -0,0 +1,308 @@
+"""Load and accuracy benchmarks for the rate limiter.
+
+These tests drive RateLimiter.check_rate_limit from many threads and
+processes against a Redis server over TCP: a ``redis-server`` started for
+the module when one is on PATH, otherwise fakeredis' TCP server. Set
+RATE_LIMIT_BENCH_REDIS=host:port to size an existing server instead and
+RATE_LIMIT_BENCH_DECISIONS to change the load.
+
+Every limiter mode reports decisions per second, p50/p99 decision latency
+and admission error on a few hot keys, where positive values are
+over-admission beyond the limit. Fail-open decisions (Redis errors) are
+reported separately and do not count towards admission error; a run with
+any of them fails, as its admission counts say nothing about accuracy.
+"""
+import multiprocessing
+import os
+import shutil
+import socket
+import statistics
+import subprocess
+import threading
+import time
+import uuid
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+import redis
+
+
+DECISIONS = int(os.environ.get('RATE_LIMIT_BENCH_DECISIONS', '1200'))
+HOT_KEYS = 8
+LIMIT = 50
+# Long enough that no key refills while a run is in progress
+WINDOW = 3600
+THREADS = 8
+PROCESSES = 4
+THREADS_PER_PROCESS = 2
+
+# Limiter modes: RateLimiter options, plus the in-process backend to use
+# instead of Redis for the local modes
+MODES = {
+    'sliding_window': {'default_algorithm': 'sliding_window'},
+    'sliding_window_counter': {'default_algorithm': 'sliding_window_counter'},
+    'gcra': {'default_algorithm': 'gcra'},
+    'lease': {'default_algorithm': 'sliding_window', 'lease_fraction': 0.1},
+    'local': {'backend': 'local'},
+    'shared_memory': {'backend': 'shared_memory'},
+}
+
+# Largest acceptable over-admission per mode; the counter may over-admit
+# slightly if a run straddles a fixed window boundary
+MAX_OVER_ADMISSION = {
+    'sliding_window_counter': 0.05,
+}
+
+# Largest acceptable under-admission per mode, for the same reason
+MAX_UNDER_ADMISSION = {
+    'sliding_window_counter': 0.05,
+}
+
+# Modes decided atomically in one place: every hot key admits exactly LIMIT
+EXACT_MODES = ('sliding_window', 'gcra')
+
+Result = namedtuple('Result', ['mode', 'topology', 'seconds', 'latencies', 'admitted', 'fail_open'])
+
+
+def _build_limiter(mode, address, shm_path):
+    """Build a RateLimiter for a mode in the calling process."""
+    from local_limiter import LocalRateLimiter, SharedMemoryRateLimiter
+    from rate_limiter import RateLimiter
+    from redis_client import RedisClient
+
+    options = dict(MODES[mode])
+    backend = options.pop('backend', None)
+    if backend == 'local':
+        return RateLimiter(None, local_limiter=LocalRateLimiter(), deny_cache_size=0)
+    if backend == 'shared_memory':
+        return RateLimiter(None, local_limiter=SharedMemoryRateLimiter(shm_path), deny_cache_size=0)
+
+    host, port = address
+    # Scripts are loaded before the first decision, as in a gateway worker
+    # that only gets traffic once /health/ready reports it warm
+    client = RedisClient(host=host, port=port, max_connections=THREADS * 2, preload_scripts=True)
+    client.connect()
+    assert client._warmer.wait(timeout=10)
+    return RateLimiter(client, deny_cache_size=0, **options)
+
+
+def _decide(limiter, prefix, count, offset):
+    """Make ``count`` decisions spread over the hot keys.
+
+    Returns:
+        tuple: (latencies in seconds, admitted count per hot key,
+        fail-open decisions)
+    """
+    latencies = []
+    admitted = [0] * HOT_KEYS
+    fail_open = 0
+    for i in range(offset, offset + count):
+        slot = i % HOT_KEYS
+        start = time.perf_counter()
+        is_allowed, rate_info = limiter.check_rate_limit(f"{prefix}:{slot}", LIMIT, WINDOW)
+        latencies.append(time.perf_counter() - start)
+        if rate_info.get('fail_open'):
+            fail_open += 1
+        else:
+            admitted[slot] += int(is_allowed)
+    return latencies, admitted, fail_open
+
+
+def _decide_concurrently(limiter, prefix, threads, count, offset=0):
+    """Run _decide on a thread pool and merge the results."""
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        parts = list(executor.map(
+            lambda t: _decide(limiter, prefix, count // threads, offset + t),
+            range(threads)
+        ))
+    return _merge(parts)
+
+
+def _merge(parts):
+    """Merge (latencies, admitted, fail_open) results of several workers."""
+    latencies = [latency for part, _, _ in parts for latency in part]
+    admitted = [sum(counts) for counts in zip(*(counts for _, counts, _ in parts))]
+    return latencies, admitted, sum(fail_open for _, _, fail_open in parts)
+
+
+def _process_worker(mode, address, shm_path, prefix, offset, barrier, results):
+    """Run one worker process's share of the load."""
+    limiter = _build_limiter(mode, address, shm_path)
+    barrier.wait()
+    start = time.perf_counter()
+    part = _decide_concurrently(limiter, prefix, THREADS_PER_PROCESS, DECISIONS // PROCESSES, offset)
+    results.put((start, time.perf_counter(), part))
+
+
+def _wait_for_redis(host, port, timeout=10.0):
+    """Block until a Redis server answers PING."""
+    deadline = time.time() + timeout
+    while True:
+        try:
+            redis.Redis(host=host, port=port, socket_timeout=1).ping()
+            return
+        except redis.exceptions.ConnectionError:
+            if time.time() > deadline:
+                raise
+            time.sleep(0.05)
+
+
+def _free_port():
+    """Find a free local TCP port."""
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+@pytest.fixture(scope='module')
+def redis_server():
+    """Address of a Redis server for the benchmark, and what serves it."""
+    configured = os.environ.get('RATE_LIMIT_BENCH_REDIS')
+    if configured:
+        host, port = configured.rsplit(':', 1)
+        yield (host, int(port)), 'external'
+        return
+
+    server_path = shutil.which('redis-server')
+    if server_path:
+        port = _free_port()
+        process = subprocess.Popen(
+            [server_path, '--port', str(port), '--save', '', '--appendonly', 'no'],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL
+        )
+        try:
+            _wait_for_redis('127.0.0.1', port)
+            yield ('127.0.0.1', port), 'redis-server'
+        finally:
+            process.terminate()
+            process.wait(timeout=10)
+        return
+
+    from fakeredis import TcpFakeServer
+
+    server = TcpFakeServer(('127.0.0.1', 0))
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    host, port = server.server_address
+    try:
+        _wait_for_redis(host, port)
+        yield (host, port), 'fakeredis'
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+@pytest.fixture(scope='module')
+def report(redis_server):
+    """Collect results and print one table for the module."""
+    results = []
+    yield results
+
+    _, server = redis_server
+    lines = [
+        f"\nrate limiter load ({server}, {DECISIONS} decisions on {HOT_KEYS} keys, limit {LIMIT}):",
+        f"{'mode':<24}{'topology':<22}{'decisions/s':>12}{'p50 ms':>9}{'p99 ms':>9}"
+        f"{'over':>8}{'error':>8}{'fail open':>11}",
+    ]
+    for result in results:
+        p50, p99 = _percentiles(result.latencies)
+        lines.append(
+            f"{result.mode:<24}{result.topology:<22}"
+            f"{len(result.latencies) / result.seconds:>12.0f}"
+            f"{p50 * 1000:>9.2f}{p99 * 1000:>9.2f}"
+            f"{_over_admission(result.admitted):>8.1%}{_admission_error(result.admitted):>8.1%}"
+            f"{result.fail_open:>11}"
+        )
+    print('\n'.join(lines))
+
+
+def _percentiles(latencies):
+    """Return the p50 and p99 of a list of latencies."""
+    cuts = statistics.quantiles(latencies, n=100)
+    return cuts[49], cuts[98]
+
+
+def _over_admission(admitted):
+    """Requests admitted beyond the limit, as a fraction of the limit."""
+    return sum(max(0, count - LIMIT) for count in admitted) / (LIMIT * HOT_KEYS)
+
+
+def _under_admission(admitted):
+    """Requests refused below the limit, as a fraction of the limit."""
+    return sum(max(0, LIMIT - count) for count in admitted) / (LIMIT * HOT_KEYS)
+
+
+def _check_accuracy(result, over_admission=True):
+    """Assert a run made every decision in Redis (or locally) and admitted about LIMIT per key.
+
+    Every hot key gets DECISIONS / HOT_KEYS requests, well over LIMIT, so
+    a correct limiter admits LIMIT of them.
+    """
+    assert result.fail_open == 0
+    assert _under_admission(result.admitted) <= MAX_UNDER_ADMISSION.get(result.mode, 0)
+    if over_admission:
+        assert _over_admission(result.admitted) <= MAX_OVER_ADMISSION.get(result.mode, 0)
+    if result.mode in EXACT_MODES:
+        assert result.admitted == [LIMIT] * HOT_KEYS
+
+
+def _admission_error(admitted):
+    """Signed deviation of all admitted requests from the limit."""
+    return (sum(admitted) - LIMIT * HOT_KEYS) / (LIMIT * HOT_KEYS)
+
+
+@pytest.mark.slow
+class TestRateLimiterLoad:
+    """Throughput, latency and accuracy of every limiter mode under contention."""
+
+    @pytest.mark.parametrize('mode', list(MODES))
+    def test_threads(self, redis_server, report, tmp_path, mode):
+        """Test one process with a gthread-sized pool of threads."""
+        address, _ = redis_server
+        limiter = _build_limiter(mode, address, str(tmp_path / 'ratelimit'))
+        prefix = f"bench:{uuid.uuid4().hex}"
+
+        start = time.perf_counter()
+        latencies, admitted, fail_open = _decide_concurrently(limiter, prefix, THREADS, DECISIONS)
+        result = Result(
+            mode, f"{THREADS} threads", time.perf_counter() - start, latencies, admitted, fail_open)
+        report.append(result)
+
+        assert len(latencies) == DECISIONS
+        _check_accuracy(result)
+
+    @pytest.mark.parametrize('mode', list(MODES))
+    def test_processes(self, redis_server, report, tmp_path, mode):
+        """Test several worker processes sharing the same clients."""
+        address, _ = redis_server
+        shm_path = str(tmp_path / 'ratelimit')
+        prefix = f"bench:{uuid.uuid4().hex}"
+
+        ctx = multiprocessing.get_context('fork')
+        barrier = ctx.Barrier(PROCESSES)
+        results = ctx.Queue()
+        workers = [
+            ctx.Process(
+                target=_process_worker,
+                args=(mode, address, shm_path, prefix, i * THREADS_PER_PROCESS, barrier, results)
+            )
+            for i in range(PROCESSES)
+        ]
+        for worker in workers:
+            worker.start()
+        parts = [results.get(timeout=120) for _ in workers]
+        for worker in workers:
+            worker.join(timeout=10)
+
+        latencies, admitted, fail_open = _merge([part for _, _, part in parts])
+        seconds = max(end for _, end, _ in parts) - min(start for start, _, _ in parts)
+        result = Result(
+            mode, f"{PROCESSES}x{THREADS_PER_PROCESS} processes", seconds, latencies, admitted, fail_open)
+        report.append(result)
+
+        assert len(latencies) == DECISIONS
+        # Per-process tables cannot coordinate, so 'local' may admit up to
+        # PROCESSES times the limit; that is reported, not checked.
+        _check_accuracy(result, over_admission=mode != 'local')
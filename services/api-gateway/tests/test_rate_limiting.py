@@ -23,12 +23,6 @@ class TestRateLimiter:
 
         limiter = RateLimiter(mock_redis_client, default_limit=10, default_window=60)
 
-        # Mock Redis operations
-        mock_redis_client._client.zremrangebyscore = Mock()
-        mock_redis_client._client.zcard = Mock(return_value=0)
-        mock_redis_client._client.zadd = Mock(return_value=1)
-        mock_redis_client._client.expire = Mock()
-
         is_allowed, info = limiter.check_rate_limit('test_key', limit=10, window=60)
 
         assert is_allowed is True
@@ -41,10 +35,9 @@ class TestRateLimiter:
 
         limiter = RateLimiter(mock_redis_client, default_limit=5, default_window=60)
 
-        # Mock Redis to simulate limit exceeded
-        mock_redis_client._client.zremrangebyscore = Mock()
-        mock_redis_client._client.zcard = Mock(return_value=5)
-        mock_redis_client._client.zrange = Mock(return_value=[(b'1234567890', 1234567890.0)])
+        for _ in range(5):
+            is_allowed, _ = limiter.check_rate_limit('test_key', limit=5, window=60)
+            assert is_allowed is True
 
         is_allowed, info = limiter.check_rate_limit('test_key', limit=5, window=60)
 
@@ -52,17 +45,66 @@ class TestRateLimiter:
         assert info['limit'] == 5
         assert info['remaining'] == 0
 
+    def test_check_rate_limit_counts_requests_in_same_second(self, mock_redis_client):
+        """Test that requests within the same second are counted separately."""
+        from rate_limiter import RateLimiter
+
+        limiter = RateLimiter(mock_redis_client, default_limit=3, default_window=60)
+
+        with patch('rate_limiter.time.time', return_value=1234567890.0):
+            results = [limiter.check_rate_limit('test_key')[0] for _ in range(4)]
+            stored = mock_redis_client._client.zcard('rate_limit:test_key')
+
+        assert results == [True, True, True, False]
+        assert stored == 3
+
+    def test_check_rate_limit_reset_uses_oldest_request(self, mock_redis_client):
+        """Test that the reset time on deny is derived from the oldest request."""
+        from rate_limiter import RateLimiter
+
+        limiter = RateLimiter(mock_redis_client, default_limit=2, default_window=60)
+
+        with patch('rate_limiter.time.time', return_value=1000.0):
+            limiter.check_rate_limit('test_key')
+        with patch('rate_limiter.time.time', return_value=1030.0):
+            limiter.check_rate_limit('test_key')
+            is_allowed, info = limiter.check_rate_limit('test_key')
+
+        assert is_allowed is False
+        assert info['reset'] == 1060
+
+    def test_check_rate_limit_is_atomic_under_concurrency(self, mock_redis_client):
+        """Test that concurrent checks never admit more than the limit."""
+        from concurrent.futures import ThreadPoolExecutor
+        from rate_limiter import RateLimiter
+
+        limiter = RateLimiter(mock_redis_client, default_limit=10, default_window=60)
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(lambda _: limiter.check_rate_limit('test_key')[0], range(40)))
+
+        assert sum(results) == 10
+
+    def test_check_rate_limit_uses_single_round_trip(self, mock_redis_client):
+        """Test that a decision is made with a single Redis command."""
+        from rate_limiter import RateLimiter
+
+        limiter = RateLimiter(mock_redis_client, default_limit=10, default_window=60)
+        limiter.check_rate_limit('test_key')
+
+        with patch.object(mock_redis_client._client, 'execute_command',
+                          wraps=mock_redis_client._client.execute_command) as execute:
+            limiter.check_rate_limit('test_key')
+
+        assert execute.call_count == 1
+        assert execute.call_args[0][0] == 'EVALSHA'
+
     def test_check_rate_limit_uses_default_values(self, mock_redis_client):
         """Test that rate limiter uses default values when not specified."""
         from rate_limiter import RateLimiter
 
         limiter = RateLimiter(mock_redis_client, default_limit=100, default_window=60)
 
-        mock_redis_client._client.zremrangebyscore = Mock()
-        mock_redis_client._client.zcard = Mock(return_value=0)
-        mock_redis_client._client.zadd = Mock()
-        mock_redis_client._client.expire = Mock()
-
         is_allowed, info = limiter.check_rate_limit('test_key')
 
         assert info['limit'] == 100
@@ -74,7 +116,7 @@ class TestRateLimiter:
         limiter = RateLimiter(mock_redis_client, default_limit=10, default_window=60)
 
         # Simulate Redis error
-        mock_redis_client._client.zremrangebyscore = Mock(side_effect=Exception("Redis error"))
+        mock_redis_client._client.evalsha = Mock(side_effect=Exception("Redis error"))
 
         is_allowed, info = limiter.check_rate_limit('test_key', limit=10, window=60)
 
@@ -107,21 +149,19 @@ class TestRateLimitDecorator:
 
     def test_rate_limited_endpoint_returns_429_when_exceeded(self, client, mock_redis_client):
         """Test that rate limited endpoint returns 429 when limit exceeded."""
-        # Mock Redis to simulate rate limit exceeded
-        mock_redis_client._client.zremrangebyscore = Mock()
-        mock_redis_client._client.zcard = Mock(return_value=100)  # At limit
-        mock_redis_client._client.zrange = Mock(return_value=[(b'1234567890', 1234567890.0)])
+        # Exhaust the /api/status limit (60 requests per minute)
+        for _ in range(60):
+            client.get('/api/status')
 
-        # Make multiple requests to /api/status (which has rate limit)
         response = client.get('/api/status')
 
-        # If rate limit is exceeded, should get 429
-        # Note: First request might succeed, subsequent ones should fail
-        if response.status_code == 429:
-            data = json.loads(response.data)
-            assert 'error' in data
-            assert data['error'] == 'Rate Limit Exceeded'
-            assert 'retry_after' in data
+        assert response.status_code == 429
+        data = json.loads(response.data)
+        assert 'error' in data
+        assert data['error'] == 'Rate Limit Exceeded'
+        assert 'retry_after' in data
+        assert response.headers['Retry-After'] == str(data['retry_after'])
+        assert response.headers['X-RateLimit-Remaining'] == '0'
 
     def test_rate_limit_headers_present(self, client):
         """Test that rate limit headers are present in response."""
@@ -134,13 +174,682 @@ class TestRateLimitDecorator:
 
     def test_successful_request_includes_trace_id_on_rate_limit(self, client, mock_redis_client):
         """Test that rate limit error response includes trace ID."""
-        # Mock Redis to simulate rate limit exceeded
-        mock_redis_client._client.zremrangebyscore = Mock()
-        mock_redis_client._client.zcard = Mock(return_value=100)
-        mock_redis_client._client.zrange = Mock(return_value=[(b'1234567890', 1234567890.0)])
+        for _ in range(60):
+            client.get('/api/status')
 
         response = client.get('/api/status')
 
-        if response.status_code == 429:
-            data = json.loads(response.data)
-            assert 'trace_id' in data
+        assert response.status_code == 429
+        data = json.loads(response.data)
+        assert 'trace_id' in data
+
+
+@pytest.mark.unit
+class TestGCRARateLimiter:
+    """Tests for the GCRA (token bucket) algorithm."""
+
+    def test_gcra_allows_burst_up_to_limit(self, mock_redis_client):
+        """Test that GCRA admits a full burst and then denies."""
+        from rate_limiter import RateLimiter
+
+        limiter = RateLimiter(mock_redis_client, default_limit=5, default_window=60, default_algorithm='gcra')
+
+        with patch('rate_limiter.time.time', return_value=1000.0):
+            results = [limiter.check_rate_limit('test_key') for _ in range(6)]
+
+        assert [allowed for allowed, _ in results] == [True] * 5 + [False]
+        assert [info['remaining'] for _, info in results] == [4, 3, 2, 1, 0, 0]
+
+    def test_gcra_reset_is_next_emission(self, mock_redis_client):
+        """Test that a denied GCRA request resets when one token is refilled."""
+        from rate_limiter import RateLimiter
+
+        limiter = RateLimiter(mock_redis_client, default_limit=5, default_window=60)
+
+        with patch('rate_limiter.time.time', return_value=1000.0):
+            for _ in range(5):
+                limiter.check_rate_limit('test_key', algorithm='gcra')
+            is_allowed, info = limiter.check_rate_limit('test_key', algorithm='gcra')
+
+        assert is_allowed is False
+        assert info['reset'] == 1012
+
+    def test_gcra_refills_over_time(self, mock_redis_client):
+        """Test that GCRA admits again once the emission interval has passed."""
+        from rate_limiter import RateLimiter
+
+        limiter = RateLimiter(mock_redis_client, default_limit=5, default_window=60)
+
+        with patch('rate_limiter.time.time', return_value=1000.0):
+            for _ in range(5):
+                limiter.check_rate_limit('test_key', algorithm='gcra')
+        with patch('rate_limiter.time.time', return_value=1012.0):
+            is_allowed, info = limiter.check_rate_limit('test_key', algorithm='gcra')
+
+        assert is_allowed is True
+        assert info['remaining'] == 0
+
+    def test_gcra_uses_single_string_key(self, mock_redis_client):
+        """Test that GCRA keeps one string key per client regardless of the limit."""
+        from rate_limiter import RateLimiter
+
+        limiter = RateLimiter(mock_redis_client, default_limit=100, default_window=60)
+
+        for _ in range(50):
+            limiter.check_rate_limit('test_key', algorithm='token_bucket')
+
+        client = mock_redis_client._client
+        assert client.keys('rate_limit:*') == ['rate_limit:gcra:test_key']
+        assert client.type('rate_limit:gcra:test_key') == 'string'
+        assert 0 < client.pttl('rate_limit:gcra:test_key') <= 60000
+
+    def test_unknown_algorithm_raises(self, mock_redis_client):
+        """Test that an unknown algorithm is rejected."""
+        from rate_limiter import RateLimiter, rate_limit
+
+        with pytest.raises(ValueError):
+            RateLimiter(mock_redis_client, default_algorithm='leaky')
+        with pytest.raises(ValueError):
+            rate_limit(limit=10, algorithm='leaky')
+
+    def test_decorator_selects_algorithm(self, app, mock_redis_client):
+        """Test that the decorator passes its algorithm to the limiter."""
+        from rate_limiter import rate_limit
+
+        @rate_limit(limit=2, window=60, algorithm='gcra')
+        def view():
+            return 'ok'
+
+        with app.test_request_context('/', environ_base={'REMOTE_ADDR': '10.0.0.1'}):
+            responses = [view() for _ in range(3)]
+
+        assert [r.status_code for r in responses] == [200, 200, 429]
+        assert responses[0].headers['X-RateLimit-Limit'] == '2'
+        assert responses[0].headers['X-RateLimit-Remaining'] == '1'
+        assert 'X-RateLimit-Reset' in responses[2].headers
+        assert mock_redis_client._client.exists('rate_limit:gcra:10.0.0.1')
+
+
+@pytest.mark.unit
+class TestSlidingWindowCounterRateLimiter:
+    """Tests for the sliding window counter algorithm."""
+
+    def test_counter_denies_above_limit_within_window(self, mock_redis_client):
+        """Test that the counter mode enforces the limit within one window."""
+        from rate_limiter import RateLimiter
+
+        limiter = RateLimiter(mock_redis_client, default_limit=3, default_window=60,
+                              default_algorithm='sliding_window_counter')
+
+        client = mock_redis_client._client
+        with patch('rate_limiter.time.time', return_value=1200.0):
+            results = [limiter.check_rate_limit('test_key') for _ in range(3)]
+            with patch.object(client, 'execute_command', wraps=client.execute_command) as execute:
+                results.append(limiter.check_rate_limit('test_key'))
+            stored = client.get('rate_limit:swc:test_key:20')
+
+        assert [allowed for allowed, _ in results] == [True, True, True, False]
+        # Check and increment are one script call; nothing is given back on deny
+        assert [call.args[0] for call in execute.call_args_list] == ['EVALSHA']
+        assert [info['remaining'] for _, info in results] == [2, 1, 0, 0]
+        assert results[0][1]['reset'] == 1260
+        # Rejected requests do not count against the limit
+        assert stored == '3'
+
+    def test_counter_weights_previous_window(self, mock_redis_client):
+        """Test that the previous window is weighted by its overlap."""
+        from rate_limiter import RateLimiter
+
+        limiter = RateLimiter(mock_redis_client, default_limit=4, default_window=60)
+
+        with patch('rate_limiter.time.time', return_value=1200.0):
+            for _ in range(4):
+                limiter.check_rate_limit('test_key', algorithm='sliding_window_counter')
+
+        # 15s into the next window: 4 * 0.75 = 3 weighted requests remain
+        with patch('rate_limiter.time.time', return_value=1275.0):
+            first = limiter.check_rate_limit('test_key', algorithm='sliding_window_counter')
+            second = limiter.check_rate_limit('test_key', algorithm='sliding_window_counter')
+
+        assert first[0] is True
+        assert second[0] is False
+        assert second[1]['reset'] == 1290
+
+    def test_concurrent_counter_checks_admit_exactly_the_limit(self, mock_redis_client):
+        """Test that racing requests neither overshoot nor deny each other."""
+        from concurrent.futures import ThreadPoolExecutor
+        from rate_limiter import RateLimiter
+
+        limiter = RateLimiter(mock_redis_client, default_limit=10, default_window=60,
+                              default_algorithm='sliding_window_counter', deny_cache_size=0)
+
+        with patch('rate_limiter.time.time', return_value=1200.0):
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                results = list(executor.map(lambda _: limiter.check_rate_limit('test_key'), range(50)))
+            stored = mock_redis_client._client.get('rate_limit:swc:test_key:20')
+
+        assert sum(allowed for allowed, _ in results) == 10
+        assert stored == '10'
+
+    def test_counter_uses_two_keys_and_one_round_trip(self, mock_redis_client):
+        """Test O(1) memory per client and a single script call per decision."""
+        from rate_limiter import RateLimiter
+
+        limiter = RateLimiter(mock_redis_client, default_limit=100, default_window=60)
+        client = mock_redis_client._client
+
+        with patch('rate_limiter.time.time', return_value=1200.0):
+            for _ in range(20):
+                limiter.check_rate_limit('test_key', algorithm='sliding_window_counter')
+        with patch('rate_limiter.time.time', return_value=1270.0):
+            with patch.object(client, 'execute_command', wraps=client.execute_command) as execute:
+                limiter.check_rate_limit('test_key', algorithm='sliding_window_counter')
+            keys = sorted(client.keys('rate_limit:*'))
+
+        assert [call.args[0] for call in execute.call_args_list] == ['EVALSHA']
+        assert keys == ['rate_limit:swc:test_key:20', 'rate_limit:swc:test_key:21']
+
+
+@pytest.mark.unit
+class TestTokenLeasing:
+    """Tests for per-process token leasing."""
+
+    def test_lease_serves_requests_without_redis(self, mock_redis_client):
+        """Test that leased tokens are spent locally."""
+        from rate_limiter import RateLimiter
+
+        limiter = RateLimiter(mock_redis_client, default_limit=100, default_window=60,
+                              lease_fraction=0.1, lease_error_bound=50)
+        client = mock_redis_client._client
+
+        with patch('rate_limiter.time.time', return_value=1000.0):
+            limiter.check_rate_limit('test_key')
+            with patch.object(client, 'execute_command', wraps=client.execute_command) as execute:
+                results = [limiter.check_rate_limit('test_key')[0] for _ in range(9)]
+            stored = client.zcard('rate_limit:test_key')
+
+        assert all(results)
+        assert execute.call_count == 0
+        assert stored == 10
+
+    def test_lease_size_is_capped_by_error_bound(self, mock_redis_client):
+        """Test that the error bound caps the lease size."""
+        from rate_limiter import RateLimiter
+
+        limiter = RateLimiter(mock_redis_client, default_limit=1000, default_window=60,
+                              lease_fraction=0.1, lease_error_bound=5)
+
+        assert limiter.leaser.lease_size(1000) == 5
+        assert limiter.leaser.lease_size(3) == 1
+
+    @pytest.mark.parametrize('algorithm', ['gcra', 'token_bucket', 'sliding_window_counter'])
+    def test_leasing_needs_the_sliding_window(self, mock_redis_client, algorithm):
+        """Test that leasing with an algorithm that cannot lease is rejected."""
+        from rate_limiter import LEASE_SIZE_FRACTION, RateLimiter
+
+        LEASE_SIZE_FRACTION.set(0)
+        with pytest.raises(ValueError, match='sliding_window'):
+            RateLimiter(mock_redis_client, default_algorithm=algorithm, lease_fraction=0.1)
+
+        assert LEASE_SIZE_FRACTION._value.get() == 0
+        assert RateLimiter(mock_redis_client, default_algorithm=algorithm).leaser is None
+
+    def test_global_limit_holds_across_workers(self, mock_redis_client):
+        """Test that several leasing workers never admit more than the limit."""
+        from rate_limiter import RateLimiter
+
+        workers = [
+            RateLimiter(mock_redis_client, default_limit=20, default_window=60, lease_fraction=0.25)
+            for _ in range(3)
+        ]
+
+        with patch('rate_limiter.time.time', return_value=1000.0):
+            admitted = sum(
+                workers[i % 3].check_rate_limit('test_key')[0] for i in range(60)
+            )
+
+        assert admitted <= 20
+        assert admitted >= 20 - 2 * workers[0].leaser.lease_size(20)
+
+    def test_expired_lease_returns_unused_tokens(self, mock_redis_client):
+        """Test that unspent tokens are handed back when a lease expires."""
+        from rate_limiter import RateLimiter
+
+        limiter = RateLimiter(mock_redis_client, default_limit=100, default_window=60,
+                              lease_fraction=0.1, lease_ttl=1.0)
+
+        with patch('rate_limiter.time.time', return_value=1000.0):
+            limiter.check_rate_limit('test_key')
+        with patch('rate_limiter.time.time', return_value=1002.0):
+            limiter.check_rate_limit('test_key')
+            stored = mock_redis_client._client.zcard('rate_limit:test_key')
+
+        # One spent token from the first lease plus a fresh lease of 10
+        assert stored == 11
+
+    def test_release_leases_returns_tokens(self, mock_redis_client):
+        """Test that releasing leases removes unspent reservations."""
+        from rate_limiter import RateLimiter
+
+        limiter = RateLimiter(mock_redis_client, default_limit=100, default_window=60, lease_fraction=0.1)
+
+        with patch('rate_limiter.time.time', return_value=1000.0):
+            for _ in range(3):
+                limiter.check_rate_limit('test_key')
+            limiter.release_leases()
+            stored = mock_redis_client._client.zcard('rate_limit:test_key')
+
+        assert stored == 3
+        assert limiter.leaser.get_stats()['outstanding_tokens'] == 0
+
+    def test_release_leases_uses_one_pipeline(self, mock_redis_client):
+        """Test that leases for many keys are returned in one round trip."""
+        from rate_limiter import RateLimiter
+
+        limiter = RateLimiter(mock_redis_client, default_limit=100, default_window=60, lease_fraction=0.1)
+        client = mock_redis_client._client
+
+        with patch('rate_limiter.time.time', return_value=1000.0):
+            for ip in ['10.0.0.1', '10.0.0.2', '10.0.0.3']:
+                limiter.check_rate_limit(ip)
+            with patch.object(client, 'pipeline', wraps=client.pipeline) as pipeline:
+                limiter.release_leases()
+            stored = [client.zcard(f"rate_limit:10.0.0.{i}") for i in range(1, 4)]
+
+        assert pipeline.call_count == 1
+        assert stored == [1, 1, 1]
+
+    def test_lease_denies_when_window_full(self, mock_redis_client):
+        """Test that no lease is granted once the window is full."""
+        from rate_limiter import RateLimiter
+
+        limiter = RateLimiter(mock_redis_client, default_limit=4, default_window=60, lease_fraction=0.5)
+
+        with patch('rate_limiter.time.time', return_value=1000.0):
+            results = [limiter.check_rate_limit('test_key') for _ in range(5)]
+
+        assert [allowed for allowed, _ in results] == [True] * 4 + [False]
+        assert results[-1][1]['reset'] == 1060
+
+
+@pytest.mark.unit
+class TestDenyCache:
+    """Tests for the negative cache of deny decisions."""
+
+    def test_deny_cache_expires_at_reset(self):
+        """Test that cached denials expire at their reset time."""
+        from rate_limiter import DenyCache
+
+        cache = DenyCache()
+        cache.put('client', {'limit': 5, 'remaining': 0, 'reset': 1060})
+
+        assert cache.get('client', now=1059.0)['reset'] == 1060
+        assert cache.get('client', now=1060.0) is None
+        assert len(cache) == 0
+
+    def test_deny_cache_is_bounded(self):
+        """Test that the oldest entries are evicted beyond max_entries."""
+        from rate_limiter import DenyCache
+
+        cache = DenyCache(max_entries=2)
+        for client in ['a', 'b', 'c']:
+            cache.put(client, {'limit': 1, 'remaining': 0, 'reset': 2000})
+
+        assert len(cache) == 2
+        assert cache.get('a', now=1000.0) is None
+        assert cache.get('c', now=1000.0) is not None
+
+    def test_repeat_offender_gets_429_without_redis(self, app, mock_redis_client):
+        """Test that throttled clients are answered from the cache."""
+        from rate_limiter import rate_limit
+
+        @rate_limit(limit=1, window=60)
+        def view():
+            return 'ok'
+
+        client = mock_redis_client._client
+        with app.test_request_context('/', environ_base={'REMOTE_ADDR': '10.0.0.9'}):
+            assert view().status_code == 200
+            first_deny = view()
+            with patch.object(client, 'execute_command', wraps=client.execute_command) as execute:
+                repeat_deny = view()
+
+        assert first_deny.status_code == 429
+        assert repeat_deny.status_code == 429
+        assert execute.call_count == 0
+        for header in ['X-RateLimit-Limit', 'X-RateLimit-Remaining', 'X-RateLimit-Reset']:
+            assert repeat_deny.headers[header] == first_deny.headers[header]
+        assert repeat_deny.get_json()['retry_after'] > 0
+
+    def test_deny_cache_can_be_disabled(self, mock_redis_client):
+        """Test that deny_cache_size=0 disables the cache."""
+        from rate_limiter import RateLimiter
+
+        limiter = RateLimiter(mock_redis_client, deny_cache_size=0)
+
+        assert limiter.deny_cache is None
+
+
+@pytest.mark.unit
+class TestWeightedCost:
+    """Tests for per-request cost weights."""
+
+    @pytest.mark.parametrize('algorithm', ['sliding_window', 'sliding_window_counter', 'gcra'])
+    def test_cost_consumes_multiple_units(self, mock_redis_client, algorithm):
+        """Test that a weighted request spends cost units of the limit."""
+        from rate_limiter import RateLimiter
+
+        limiter = RateLimiter(mock_redis_client, default_limit=10, default_window=60, default_algorithm=algorithm)
+
+        with patch('rate_limiter.time.time', return_value=1200.0):
+            results = [limiter.check_rate_limit('test_key', cost=4) for _ in range(3)]
+            cheap = limiter.check_rate_limit('test_key')
+
+        assert [allowed for allowed, _ in results] == [True, True, False]
+        assert results[0][1]['remaining'] == 6
+        assert cheap[0] is True
+
+    def test_denied_weighted_request_is_not_recorded(self, mock_redis_client):
+        """Test that a denied weighted request leaves no entries in the log."""
+        from rate_limiter import RateLimiter
+
+        limiter = RateLimiter(mock_redis_client, default_limit=5, default_window=60)
+
+        with patch('rate_limiter.time.time', return_value=1000.0):
+            limiter.check_rate_limit('test_key', cost=3)
+            is_allowed, info = limiter.check_rate_limit('test_key', cost=3)
+            assert mock_redis_client._client.zcard('rate_limit:test_key') == 3
+
+        assert is_allowed is False
+        assert info['reset'] == 1060
+
+    def test_weighted_request_bypasses_lease(self, mock_redis_client):
+        """Test that weighted requests are decided by the log, not a lease."""
+        from rate_limiter import RateLimiter
+
+        limiter = RateLimiter(mock_redis_client, default_limit=10, default_window=60, lease_fraction=0.5)
+
+        limiter.check_rate_limit('test_key')
+        is_allowed, _ = limiter.check_rate_limit('test_key', cost=6)
+
+        assert is_allowed is False
+        assert limiter.check_rate_limit('test_key', cost=5)[0] is True
+
+    def test_local_fallback_honours_cost(self):
+        """Test that the in-process backend applies the same cost."""
+        from local_limiter import LocalRateLimiter
+        from rate_limiter import RateLimiter
+
+        limiter = RateLimiter(None, default_limit=10, default_window=60, local_limiter=LocalRateLimiter())
+
+        assert limiter.check_rate_limit('test_key', cost=8)[0] is True
+        assert limiter.check_rate_limit('test_key', cost=8)[0] is False
+
+    def test_decorator_applies_cost(self, app, mock_redis_client):
+        """Test that the decorator charges its cost per request."""
+        from rate_limiter import rate_limit
+
+        @rate_limit(limit=10, window=60, cost=5)
+        def view():
+            return 'ok'
+
+        with app.test_request_context('/', environ_base={'REMOTE_ADDR': '10.0.0.1'}):
+            responses = [view() for _ in range(3)]
+
+        assert [r.status_code for r in responses] == [200, 200, 429]
+        assert responses[0].headers['X-RateLimit-Remaining'] == '5'
+
+    def test_invalid_cost_raises(self):
+        """Test that a cost below one is rejected."""
+        from rate_limiter import rate_limit
+
+        with pytest.raises(ValueError):
+            rate_limit(limit=10, cost=0)
+
+
+@pytest.mark.unit
+class TestConcurrencyLimit:
+    """Tests for per-client concurrency caps."""
+
+    def test_acquire_denies_above_max_in_flight(self, mock_redis_client):
+        """Test that slots are capped and freed on release."""
+        from rate_limiter import RateLimiter
+
+        limiter = RateLimiter(mock_redis_client)
+
+        first = limiter.acquire_concurrency('test_key', 2)
+        second = limiter.acquire_concurrency('test_key', 2)
+        third = limiter.acquire_concurrency('test_key', 2)
+
+        assert [first[0], second[0], third[0]] == [True, True, False]
+        assert first[1]['remaining'] == 1
+        assert third[2] is None
+
+        limiter.release_concurrency('test_key', first[2])
+        assert limiter.acquire_concurrency('test_key', 2)[0] is True
+
+    def test_unreleased_slot_is_reclaimed_after_timeout(self, mock_redis_client):
+        """Test that a slot lost by a crashed worker expires."""
+        from rate_limiter import RateLimiter
+
+        limiter = RateLimiter(mock_redis_client)
+
+        with patch('rate_limiter.time.time', return_value=1000.0):
+            limiter.acquire_concurrency('test_key', 1, timeout=30)
+            is_allowed, info, _ = limiter.acquire_concurrency('test_key', 1, timeout=30)
+        assert is_allowed is False
+        assert info['reset'] == 1030
+
+        with patch('rate_limiter.time.time', return_value=1031.0):
+            assert limiter.acquire_concurrency('test_key', 1, timeout=30)[0] is True
+
+    def test_acquire_fails_open_on_redis_error(self, mock_redis_client):
+        """Test that Redis errors do not block requests."""
+        from rate_limiter import RateLimiter
+
+        mock_redis_client._client.evalsha = Mock(side_effect=Exception("Redis error"))
+        limiter = RateLimiter(mock_redis_client)
+
+        is_allowed, info, lease_id = limiter.acquire_concurrency('test_key', 1)
+
+        assert is_allowed is True
+        assert info['fail_open'] is True
+        assert lease_id is None
+
+    def test_decorator_releases_slot_after_request(self, app, mock_redis_client):
+        """Test that the decorator frees its slot even when the view raises."""
+        from rate_limiter import concurrency_limit
+
+        @concurrency_limit(max_in_flight=1)
+        def view():
+            return 'ok'
+
+        @concurrency_limit(max_in_flight=1)
+        def failing_view():
+            raise RuntimeError('boom')
+
+        with app.test_request_context('/', environ_base={'REMOTE_ADDR': '10.0.0.1'}):
+            with pytest.raises(RuntimeError):
+                failing_view()
+            responses = [view() for _ in range(2)]
+
+        assert [r.status_code for r in responses] == [200, 200]
+        assert responses[0].headers['X-ConcurrencyLimit-Limit'] == '1'
+        assert mock_redis_client._client.keys('concurrency:*') == []
+
+    def test_decorator_returns_429_when_saturated(self, app, mock_redis_client):
+        """Test that a client over its cap gets a 429."""
+        from flask import request
+        from rate_limiter import concurrency_limit
+
+        @concurrency_limit(max_in_flight=1)
+        def view():
+            return 'ok'
+
+        with app.test_request_context('/', environ_base={'REMOTE_ADDR': '10.0.0.2'}):
+            app.rate_limiter.acquire_concurrency(f"{request.endpoint or 'unknown'}:10.0.0.2", 1, timeout=30)
+            response = view()
+
+        assert response.status_code == 429
+        assert response.get_json()['error'] == 'Too Many Concurrent Requests'
+        assert 'trace_id' in response.get_json()
+        assert 29 <= int(response.headers['Retry-After']) <= 31
+        assert response.get_json()['retry_after'] == int(response.headers['Retry-After'])
+
+    def test_routes_keep_separate_counts(self, app, mock_redis_client):
+        """Test that a client at one route's cap can still use another route."""
+        from flask import request
+        from rate_limiter import concurrency_limit
+
+        @concurrency_limit(max_in_flight=1)
+        def view():
+            return 'ok'
+
+        with app.test_request_context('/api/status', environ_base={'REMOTE_ADDR': '10.0.0.3'}):
+            app.rate_limiter.acquire_concurrency(f"{request.endpoint}:10.0.0.3", 1)
+            assert view().status_code == 429
+        with app.test_request_context('/health/live', environ_base={'REMOTE_ADDR': '10.0.0.3'}):
+            assert view().status_code == 200
+
+    def test_short_lease_does_not_expire_longer_ones(self, mock_redis_client):
+        """Test that the key lives as long as its latest lease."""
+        from rate_limiter import RateLimiter
+
+        limiter = RateLimiter(mock_redis_client)
+
+        limiter.acquire_concurrency('test_key', 5, timeout=60)
+        limiter.acquire_concurrency('test_key', 5, timeout=1)
+
+        assert mock_redis_client._client.pttl('concurrency:test_key') > 50000
+
+
+@pytest.mark.unit
+class TestRateLimiterMetrics:
+    """Tests for rate limiter Prometheus instrumentation."""
+
+    @staticmethod
+    def _value(metric, **labels):
+        return metric.labels(**labels)._value.get()
+
+    def test_decisions_counted_by_route_and_outcome(self, app, mock_redis_client):
+        """Test that allow and deny decisions are counted per route."""
+        from rate_limiter import rate_limit, DECISIONS, DECISION_DURATION
+
+        @rate_limit(limit=1, window=60)
+        def view():
+            return 'ok'
+
+        labels = {'route': 'metrics_view'}
+        allowed = self._value(DECISIONS, outcome='allow', backend='redis', **labels)
+        denied = self._value(DECISIONS, outcome='deny', backend='redis', **labels)
+        cached = self._value(DECISIONS, outcome='deny', backend='deny_cache', **labels)
+        observed = DECISION_DURATION.labels(algorithm='sliding_window', **labels)._sum.get()
+
+        with app.test_request_context('/', environ_base={'REMOTE_ADDR': '10.0.0.7'}):
+            from flask import request
+            request.url_rule = Mock(endpoint='metrics_view')
+            for _ in range(3):
+                view()
+
+        assert self._value(DECISIONS, outcome='allow', backend='redis', **labels) == allowed + 1
+        assert self._value(DECISIONS, outcome='deny', backend='redis', **labels) == denied + 1
+        assert self._value(DECISIONS, outcome='deny', backend='deny_cache', **labels) == cached + 1
+        assert DECISION_DURATION.labels(algorithm='sliding_window', **labels)._sum.get() > observed
+
+    def test_fail_open_counted(self, app, mock_redis_client):
+        """Test that fail-open decisions are counted separately."""
+        from rate_limiter import rate_limit, DECISIONS
+
+        @rate_limit(limit=1, window=60)
+        def view():
+            return 'ok'
+
+        app.rate_limiter.local_limiter, local_limiter = None, app.rate_limiter.local_limiter
+        mock_redis_client.is_connected = Mock(return_value=False)
+        before = self._value(DECISIONS, route='fail_open_view', outcome='fail_open', backend='none')
+        try:
+            with app.test_request_context('/'):
+                from flask import request
+                request.url_rule = Mock(endpoint='fail_open_view')
+                view()
+        finally:
+            app.rate_limiter.local_limiter = local_limiter
+
+        assert self._value(DECISIONS, route='fail_open_view', outcome='fail_open', backend='none') == before + 1
+
+    def test_redis_commands_counted_per_algorithm(self, mock_redis_client):
+        """Test that Redis commands per decision are counted."""
+        from rate_limiter import RateLimiter, REDIS_COMMANDS
+
+        limiter = RateLimiter(mock_redis_client)
+        script_before = self._value(REDIS_COMMANDS, algorithm='sliding_window')
+        counter_before = self._value(REDIS_COMMANDS, algorithm='sliding_window_counter')
+
+        limiter.check_rate_limit('test_key')
+        limiter.check_rate_limit('test_key', algorithm='sliding_window_counter')
+
+        assert self._value(REDIS_COMMANDS, algorithm='sliding_window') == script_before + 1
+        assert self._value(REDIS_COMMANDS, algorithm='sliding_window_counter') == counter_before + 1
+
+    def test_tracked_keys_gauge(self, mock_redis_client):
+        """Test that the tracked keys gauge reflects in-process tables."""
+        from rate_limiter import RateLimiter, TRACKED_KEYS
+
+        limiter = RateLimiter(mock_redis_client)
+        limiter.deny_cache.put('a', {'limit': 1, 'remaining': 0, 'reset': 2 ** 40})
+        limiter.deny_cache.put('b', {'limit': 1, 'remaining': 0, 'reset': 2 ** 40})
+
+        samples = [s for m in TRACKED_KEYS.collect() for s in m.samples if s.labels == {'table': 'deny_cache'}]
+        assert samples[0].value == 2
+
+
+@pytest.mark.unit
+class TestCallerDeadlines:
+    """Tests that a caller's deadline headers cannot switch rate limiting off."""
+
+    @pytest.fixture
+    def limited_app(self):
+        """App with a deadline-capped RedisClient and a route allowing 2 requests a minute."""
+        import fakeredis
+        from flask import Flask
+        from rate_limiter import RateLimiter, rate_limit
+        from redis_client import InstrumentedConnectionPool, RedisClient
+        from request_context import RequestContextMiddleware, get_remaining_budget
+
+        server = fakeredis.FakeServer()
+
+        def pool_factory(**kwargs):
+            return InstrumentedConnectionPool(
+                connection_class=fakeredis.FakeRedisConnection, server=server, **kwargs)
+
+        with patch('redis_client.InstrumentedConnectionPool', side_effect=pool_factory):
+            client = RedisClient(host='localhost', port=6379, health_monitor=False,
+                                 budget_getter=get_remaining_budget)
+            client.connect()
+
+        flask_app = Flask(__name__)
+        # No lower clamp, so the header's budget has passed by the time Redis is called
+        RequestContextMiddleware(flask_app, default_timeout=30, min_timeout=0)
+        flask_app.rate_limiter = RateLimiter(client, deny_cache_size=0)
+
+        @flask_app.route('/limited')
+        @rate_limit(limit=2, window=60)
+        def limited():
+            return 'ok'
+
+        yield flask_app.test_client()
+        client.close()
+
+    @pytest.mark.parametrize('headers', [
+        {'X-Request-Timeout': '0.000001'},
+        {'X-Request-Deadline': '1'},
+    ])
+    def test_expired_deadline_after_limit_is_still_denied(self, limited_app, headers):
+        """Test that a request sent with an expired deadline after the limit is used up gets 429."""
+        for _ in range(2):
+            assert limited_app.get('/limited').status_code == 200
+
+        response = limited_app.get('/limited', headers=headers)
+
+        assert response.status_code == 429
+        assert response.headers['X-RateLimit-Remaining'] == '0'
@@ -1,9 +1,29 @@
 """Unit tests for Redis client."""
+import hashlib
+import os
+from functools import partial
 import pytest
 from unittest.mock import Mock, patch, MagicMock
 from redis.exceptions import ConnectionError, TimeoutError, ResponseError
 
 
+def _wait_for(condition, timeout=2.0):
+    """Poll until condition() is true or the timeout expires."""
+    import time
+
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+def _observations(histogram, **labels):
+    """Observations recorded by one child of a labelled histogram."""
+    return sum(bucket.get() for bucket in histogram.labels(**labels)._buckets)
+
+
 @pytest.mark.unit
 class TestRedisClient:
     """Tests for RedisClient class."""
@@ -77,38 +97,1584 @@ class TestRedisClientErrorHandling:
         """Test handling of connection errors."""
         from redis_client import RedisClient
 
-        with patch('redis.Redis') as mock_redis:
+        with patch('redis_client.TimedRedis') as mock_redis:
             # Simulate connection error
             mock_redis.return_value.ping.side_effect = ConnectionError("Connection failed")
 
             # Client should handle error gracefully
             client = RedisClient(host='localhost', port=6379)
+            client.connect()
             assert client._is_connected is False
 
     def test_get_with_connection_error_returns_default(self, mock_redis_client):
         """Test that get() returns default on connection error."""
-        from redis_client import RedisClient
+        from redis_client import CircuitBreaker, RedisClient
 
         client = RedisClient(host='localhost', port=6379)
+        client._breaker = CircuitBreaker()
+        client._monitor = None
         client._client = Mock()
         client._client.get.side_effect = ConnectionError("Connection lost")
         client._is_connected = False
         client._last_health_check = 0
         client._health_check_interval = 30
+        client._pid = os.getpid()
 
         result = client.get('test_key', default='default_value')
         assert result == 'default_value'
 
     def test_set_with_connection_error_returns_false(self, mock_redis_client):
         """Test that set() returns False on connection error."""
-        from redis_client import RedisClient
+        from redis_client import CircuitBreaker, RedisClient
 
         client = RedisClient(host='localhost', port=6379)
+        client._breaker = CircuitBreaker()
+        client._monitor = None
         client._client = Mock()
         client._client.set.side_effect = ConnectionError("Connection lost")
         client._is_connected = False
         client._last_health_check = 0
         client._health_check_interval = 30
+        client._pid = os.getpid()
 
         result = client.set('test_key', 'test_value')
         assert result is False
+
+
+@pytest.mark.unit
+class TestRedisClientBatching:
+    """Tests for multi-key commands and pipelines."""
+
+    def test_mget_returns_defaults_for_missing_keys(self, mock_redis_client):
+        """Test that mget() fills missing keys with the default."""
+        mock_redis_client._client.set('a', '1')
+
+        assert mock_redis_client.mget(['a', 'b'], default=0) == ['1', 0]
+        assert mock_redis_client.mget([]) == []
+
+    def test_mset_stores_all_values(self, mock_redis_client):
+        """Test that mset() stores every key."""
+        assert mock_redis_client.mset({'a': '1', 'b': '2'}) is True
+        assert mock_redis_client._client.mget(['a', 'b']) == ['1', '2']
+
+    def test_mget_with_connection_error_returns_defaults(self, mock_redis_client):
+        """Test that mget() fails soft and counts the failure towards the breaker."""
+        mock_redis_client._client.mget = Mock(side_effect=ConnectionError("Connection lost"))
+
+        assert mock_redis_client.mget(['a', 'b'], default='x') == ['x', 'x']
+        assert mock_redis_client._connection_failures == 1
+        assert mock_redis_client._is_connected is True
+
+    def test_hash_operations(self, mock_redis_client):
+        """Test hset(), hget(), hincrby() and hgetall()."""
+        assert mock_redis_client.hset('stats', {'name': 'worker', 'count': 1}) == 2
+        assert mock_redis_client.hincrby('stats', 'count', 4) == 5
+        assert mock_redis_client.hget('stats', 'name') == 'worker'
+        assert mock_redis_client.hget('stats', 'missing', default='none') == 'none'
+        assert mock_redis_client.hgetall('stats') == {'name': 'worker', 'count': '5'}
+
+    def test_hash_operations_fail_soft_when_disconnected(self, mock_redis_client):
+        """Test hash defaults while Redis is down."""
+        mock_redis_client.is_connected = Mock(return_value=False)
+
+        assert mock_redis_client.hset('stats', {'a': 1}) == 0
+        assert mock_redis_client.hincrby('stats', 'a') is None
+        assert mock_redis_client.hgetall('stats') == {}
+
+    def test_pipeline_sends_commands_in_one_round_trip(self, mock_redis_client):
+        """Test that pipeline() executes queued commands together on exit."""
+        fake = mock_redis_client._client
+
+        with patch.object(fake, 'execute_command', wraps=fake.execute_command) as execute:
+            with mock_redis_client.pipeline() as pipe:
+                pipe.incr('counter')
+                pipe.set('last', 'value')
+                pipe.get('last')
+
+        assert execute.call_count == 0
+        assert pipe.results == [1, True, 'value']
+        assert fake.get('counter') == '1'
+
+    def test_pipeline_connection_error_leaves_results_none(self, mock_redis_client):
+        """Test that a failed pipeline is logged and disconnects the client once the breaker opens."""
+        from redis_client import CircuitBreaker
+
+        mock_redis_client._breaker = CircuitBreaker(failure_threshold=2)
+        mock_redis_client._client.pipeline = Mock(side_effect=TimeoutError("Timed out"))
+
+        with mock_redis_client.pipeline() as pipe:
+            pipe.incr('counter')
+        assert pipe.results is None
+        assert mock_redis_client._is_connected is True
+
+        with mock_redis_client.pipeline() as pipe:
+            pipe.incr('counter')
+        assert pipe.results is None
+        assert mock_redis_client._is_connected is False
+
+    def test_pipeline_skipped_when_disconnected(self, mock_redis_client):
+        """Test that nothing is sent while Redis is down."""
+        mock_redis_client.is_connected = Mock(return_value=False)
+
+        with mock_redis_client.pipeline() as pipe:
+            pipe.incr('counter')
+
+        assert pipe.results is None
+        assert mock_redis_client._client.get('counter') is None
+
+    def test_pipeline_is_not_sent_when_block_raises(self, mock_redis_client):
+        """Test that an exception inside the block discards the batch."""
+        with pytest.raises(RuntimeError):
+            with mock_redis_client.pipeline() as pipe:
+                pipe.incr('counter')
+                raise RuntimeError('boom')
+
+        assert pipe.results is None
+        assert mock_redis_client._client.get('counter') is None
+
+    def test_pipeline_rejects_unknown_commands(self, mock_redis_client):
+        """Test that typos fail when queued rather than on execute."""
+        with mock_redis_client.pipeline() as pipe:
+            with pytest.raises(AttributeError):
+                pipe.incrr('counter')
+
+
+@pytest.mark.unit
+class TestCircuitBreaker:
+    """Tests for the circuit breaker state machine."""
+
+    def test_opens_after_consecutive_failures(self):
+        """Test that the breaker opens at the failure threshold and refuses calls."""
+        from redis_client import CircuitBreaker
+
+        breaker = CircuitBreaker(name='test', failure_threshold=3)
+        breaker.record_failure()
+        breaker.record_failure()
+        assert breaker.state == CircuitBreaker.CLOSED
+        assert breaker.allow_request() is True
+
+        breaker.record_failure()
+        assert breaker.state == CircuitBreaker.OPEN
+        assert breaker.allow_request() is False
+
+    def test_half_open_allows_single_probe(self):
+        """Test that one probe is let through once the backoff elapses."""
+        from redis_client import CircuitBreaker
+
+        breaker = CircuitBreaker(name='test', failure_threshold=1, backoff_base=1.0, jitter=0)
+        with patch('redis_client.time.monotonic', return_value=100.0):
+            breaker.record_failure()
+        with patch('redis_client.time.monotonic', return_value=100.5):
+            assert breaker.allow_request() is False
+        with patch('redis_client.time.monotonic', return_value=101.0):
+            assert breaker.state == CircuitBreaker.HALF_OPEN
+            assert breaker.allow_request() is True
+            assert breaker.allow_request() is False
+
+        breaker.record_success()
+        assert breaker.state == CircuitBreaker.CLOSED
+        assert breaker.allow_request() is True
+
+    def test_released_probe_lets_the_next_caller_probe(self):
+        """Test that a half-open probe that never reached the server frees its slot."""
+        from redis_client import CircuitBreaker
+
+        breaker = CircuitBreaker(name='test', failure_threshold=1, backoff_base=1.0, jitter=0)
+        with patch('redis_client.time.monotonic', return_value=100.0):
+            breaker.record_failure()
+        with patch('redis_client.time.monotonic', return_value=101.0):
+            assert breaker.allow_request() is True
+            breaker.release_probe()
+            assert breaker.state == CircuitBreaker.HALF_OPEN
+            assert breaker.allow_request() is True
+
+    def test_backoff_doubles_up_to_max(self):
+        """Test exponential backoff between failed probes."""
+        from redis_client import CircuitBreaker
+
+        breaker = CircuitBreaker(name='test', failure_threshold=1, backoff_base=1.0, backoff_max=3.0, jitter=0)
+        now = 0.0
+        backoffs = []
+        for _ in range(4):
+            with patch('redis_client.time.monotonic', return_value=now):
+                # Each failure after the first is a failed half-open probe
+                assert breaker.allow_request() is True
+                breaker.record_failure()
+            backoffs.append(breaker._open_until - now)
+            now = breaker._open_until
+
+        assert backoffs == [1.0, 2.0, 3.0, 3.0]
+
+    def test_jitter_shortens_backoff(self):
+        """Test that jitter randomizes the open time within its fraction."""
+        from redis_client import CircuitBreaker
+
+        breaker = CircuitBreaker(name='test', failure_threshold=1, backoff_base=10.0, jitter=0.5)
+        with patch('redis_client.time.monotonic', return_value=0.0), \
+                patch('redis_client.random.random', return_value=1.0):
+            breaker.record_failure()
+
+        assert breaker._open_until == 5.0
+
+    def test_transitions_are_counted(self):
+        """Test that every state change is exported as a metric."""
+        from redis_client import CircuitBreaker, CIRCUIT_STATE, CIRCUIT_TRANSITIONS
+
+        def transitions(from_state, to_state):
+            return CIRCUIT_TRANSITIONS.labels(
+                target='metrics', from_state=from_state, to_state=to_state)._value.get()
+
+        before = transitions('closed', 'open')
+        breaker = CircuitBreaker(name='metrics', failure_threshold=1, backoff_base=0, jitter=0)
+        breaker.record_failure()
+        assert CIRCUIT_STATE.labels(target='metrics')._value.get() == 1
+        breaker.allow_request()
+        breaker.record_success()
+
+        assert transitions('closed', 'open') == before + 1
+        assert transitions('open', 'half_open') >= 1
+        assert transitions('half_open', 'closed') >= 1
+        assert CIRCUIT_STATE.labels(target='metrics')._value.get() == 0
+
+
+@pytest.mark.unit
+class TestRedisClientCircuitBreaker:
+    """Tests for RedisClient behaviour while Redis is down."""
+
+    @pytest.fixture
+    def down_client(self):
+        """RedisClient whose server refuses every connection."""
+        from redis_client import RedisClient
+
+        with patch('redis_client.TimedRedis') as mock_redis:
+            mock_redis.return_value.ping.side_effect = ConnectionError("Connection refused")
+            client = RedisClient(
+                host='down', port=6379, failure_threshold=3, backoff_base=60, health_monitor=False)
+            client.connect()
+            yield client, mock_redis.return_value
+
+    def test_open_circuit_returns_defaults_without_io(self, down_client):
+        """Test that calls stop touching Redis once the circuit opens."""
+        import statistics
+        import time
+        from redis_client import CircuitBreaker
+
+        client, redis_mock = down_client
+        for _ in range(2):
+            client._check_health()
+        assert client._breaker.state == CircuitBreaker.OPEN
+        assert client._check_health() is False
+        pings = redis_mock.ping.call_count
+
+        latencies = []
+        for _ in range(1000):
+            start = time.perf_counter()
+            assert client.get('key', default='fallback') == 'fallback'
+            latencies.append(time.perf_counter() - start)
+
+        assert redis_mock.ping.call_count == pings
+        assert redis_mock.get.call_count == 0
+        assert statistics.quantiles(latencies, n=100)[98] < 0.001
+
+    def test_half_open_probe_recovers(self, down_client):
+        """Test that a successful probe closes the circuit with the configured pool."""
+        from redis_client import CircuitBreaker
+
+        client, redis_mock = down_client
+        for _ in range(2):
+            client._check_health()
+        client._breaker._open_until = 0
+        redis_mock.ping.side_effect = None
+        redis_mock.get.return_value = 'value'
+
+        with patch('redis_client.InstrumentedConnectionPool') as pool:
+            assert client._check_health() is True
+
+        assert client._breaker.state == CircuitBreaker.CLOSED
+        assert client.get('key') == 'value'
+        assert pool.call_args.kwargs['max_connections'] == 50
+        assert pool.call_args.kwargs['socket_timeout'] == 5
+
+    def test_reconnect_uses_configured_pool_settings(self):
+        """Test that reconnecting does not fall back to hardcoded pool settings."""
+        from redis_client import RedisClient
+
+        with patch('redis_client.TimedRedis'), patch('redis_client.InstrumentedConnectionPool') as pool:
+            client = RedisClient(
+                host='localhost', port=6379, max_connections=7, socket_timeout=1, health_monitor=False)
+            client.connect()
+            client._reconnect()
+
+        assert pool.call_count == 2
+        assert pool.call_args.kwargs['max_connections'] == 7
+        assert pool.call_args.kwargs['socket_timeout'] == 1
+
+    def test_client_recovers_when_redis_was_down_at_startup(self, down_client):
+        """Test that a client created during an outage connects once Redis is up."""
+        client, redis_mock = down_client
+        assert client.is_connected() is False
+        redis_mock.ping.side_effect = None
+
+        assert client._check_health() is True
+        assert client.is_connected() is True
+
+    def test_failures_below_threshold_keep_commands_flowing(self, mock_redis_client):
+        """Test that one dropped connection does not make every caller fail soft."""
+        from redis_client import RedisClient
+
+        mock_redis_client.is_connected = RedisClient.is_connected.__get__(mock_redis_client)
+        incr = mock_redis_client._client.incr
+        mock_redis_client._client.incr = Mock(side_effect=[ConnectionError("Connection closed by server"), 1, 2])
+
+        assert mock_redis_client.incr('counter') is None
+        assert mock_redis_client.is_connected()
+        assert [mock_redis_client.incr('counter') for _ in range(2)] == [1, 2]
+        assert mock_redis_client._breaker.state == 'closed'
+        mock_redis_client._client.incr = incr
+
+    def test_rate_limiter_errors_open_the_circuit(self, mock_redis_client):
+        """Test that a failing rate limit script stops the limiter hitting Redis."""
+        from local_limiter import LocalRateLimiter
+        from rate_limiter import RateLimiter
+        from redis_client import CircuitBreaker, RedisClient
+
+        mock_redis_client.is_connected = RedisClient.is_connected.__get__(mock_redis_client)
+        mock_redis_client._breaker = CircuitBreaker(failure_threshold=2, backoff_base=60)
+        mock_redis_client._client.evalsha = Mock(side_effect=TimeoutError("Timed out"))
+        mock_redis_client._client.ping = Mock(side_effect=TimeoutError("Timed out"))
+        limiter = RateLimiter(mock_redis_client, default_limit=5, local_limiter=LocalRateLimiter())
+
+        results = [limiter.check_rate_limit('10.0.0.1') for _ in range(5)]
+        mock_redis_client._check_health()
+
+        assert all(info['backend'] == 'local' for _, info in results)
+        assert mock_redis_client._breaker.state == CircuitBreaker.OPEN
+        assert mock_redis_client._client.evalsha.call_count == 2
+
+
+@pytest.mark.unit
+class TestHealthMonitor:
+    """Tests for the background Redis health monitor."""
+
+    @pytest.fixture
+    def monitored_client(self):
+        """RedisClient with a fast background monitor and a mocked server."""
+        from redis_client import RedisClient
+
+        with patch('redis_client.TimedRedis') as mock_redis:
+            client = RedisClient(host='localhost', port=6379, health_check_interval=0.05)
+            client.connect()
+            yield client, mock_redis.return_value
+            client.close()
+
+    def test_is_connected_does_not_ping(self, monitored_client):
+        """Test that is_connected() only reads the monitored state."""
+        client, redis_mock = monitored_client
+        client._monitor.stop()
+        client._monitor._thread.join(timeout=1)
+        pings = redis_mock.ping.call_count
+
+        for _ in range(100):
+            assert client.is_connected() is True
+
+        assert redis_mock.ping.call_count == pings
+
+    def test_monitor_pings_in_background_until_closed(self, monitored_client):
+        """Test that the monitor pings periodically and stops on close()."""
+        client, redis_mock = monitored_client
+
+        assert _wait_for(lambda: redis_mock.ping.call_count >= 3)
+
+        client.close()
+        client._monitor._thread.join(timeout=1)
+        assert client._monitor.is_alive() is False
+
+    def test_command_failure_wakes_monitor(self):
+        """Test that a failed command triggers a prompt background probe."""
+        from redis_client import RedisClient
+
+        with patch('redis_client.TimedRedis') as mock_redis:
+            redis_mock = mock_redis.return_value
+            client = RedisClient(host='localhost', port=6379, health_check_interval=3600)
+            client.connect()
+            redis_mock.get.side_effect = [ConnectionError("Connection reset"), 'value']
+
+            assert client.get('key', default='fallback') == 'fallback'
+            assert _wait_for(lambda: redis_mock.ping.call_count == 2)
+            assert client.is_connected()
+            assert client.get('key') == 'value'
+            client.close()
+
+    @pytest.mark.skipif(not hasattr(os, 'fork'), reason='requires fork()')
+    def test_monitor_restarts_in_forked_child(self, monitored_client):
+        """Test that a forked worker gets its own pool and monitor thread on first use."""
+        client, _ = monitored_client
+        parent_pool = client._pool
+        read_fd, write_fd = os.pipe()
+
+        pid = os.fork()
+        if pid == 0:
+            try:
+                lazy = not client._monitor.is_alive()
+                client.is_connected()
+                rebuilt = client._monitor.is_alive() and client._pool is not parent_pool
+                os.write(write_fd, b'1' if lazy and rebuilt else b'0')
+            finally:
+                os._exit(0)
+
+        os.close(write_fd)
+        alive_in_child = os.read(read_fd, 1)
+        os.close(read_fd)
+        os.waitpid(pid, 0)
+
+        assert alive_in_child == b'1'
+        assert client._monitor.is_alive() is True
+
+
+@pytest.mark.unit
+class TestReadCache:
+    """Tests for the LRU/TTL read cache."""
+
+    @pytest.fixture
+    def cache(self):
+        """Live ReadCache holding up to two entries."""
+        from redis_client import ReadCache
+
+        cache = ReadCache(target='cache-test', max_entries=2, ttl=60, prefixes=['worker:'])
+        cache.set_live(True)
+        return cache
+
+    def test_hit_after_put(self, cache):
+        """Test that a stored value (including a missing key) is served."""
+        cache.put('worker:a', '1', cache.generation)
+        cache.put('worker:missing', None, cache.generation)
+
+        assert cache.get('worker:a') == (True, '1')
+        assert cache.get('worker:missing') == (True, None)
+        assert cache.get('worker:b') == (False, None)
+
+    def test_only_caches_prefixes(self, cache):
+        """Test that keys outside the configured prefixes are never stored."""
+        cache.put('rate_limit:a', '1', cache.generation)
+
+        assert cache.get('rate_limit:a') == (False, None)
+        assert len(cache) == 0
+
+    def test_lru_eviction(self, cache):
+        """Test that the least recently used entry is evicted first."""
+        for key in ('worker:a', 'worker:b'):
+            cache.put(key, key, cache.generation)
+        cache.get('worker:a')
+        cache.put('worker:c', 'c', cache.generation)
+
+        assert cache.get('worker:b') == (False, None)
+        assert cache.get('worker:a') == (True, 'worker:a')
+        assert cache.get('worker:c') == (True, 'c')
+
+    def test_ttl_expiry(self, cache):
+        """Test that entries expire after the TTL."""
+        with patch('redis_client.time.monotonic', return_value=1000.0):
+            cache.put('worker:a', '1', cache.generation)
+        with patch('redis_client.time.monotonic', return_value=1061.0):
+            assert cache.get('worker:a') == (False, None)
+        assert len(cache) == 0
+
+    def test_fill_across_invalidation_is_dropped(self, cache):
+        """Test that a value read before a concurrent invalidation is not stored."""
+        generation = cache.generation
+        cache.invalidate('worker:a')
+        cache.put('worker:a', 'stale', generation)
+
+        assert cache.get('worker:a') == (False, None)
+
+    def test_not_live_serves_nothing(self, cache):
+        """Test that entries are dropped and not stored while not subscribed."""
+        cache.put('worker:a', '1', cache.generation)
+        cache.set_live(False)
+        cache.put('worker:a', '1', cache.generation)
+
+        assert cache.get('worker:a') == (False, None)
+
+    def test_metrics(self, cache):
+        """Test hit, miss and eviction counters."""
+        from redis_client import READ_CACHE_EVICTIONS, READ_CACHE_REQUESTS
+
+        def count(metric, **labels):
+            return metric.labels(target='cache-test', **labels)._value.get()
+
+        hits, misses = count(READ_CACHE_REQUESTS, result='hit'), count(READ_CACHE_REQUESTS, result='miss')
+        size = count(READ_CACHE_EVICTIONS, reason='size')
+        invalidated = count(READ_CACHE_EVICTIONS, reason='invalidated')
+
+        cache.get('worker:a')
+        for key in ('worker:a', 'worker:b', 'worker:c'):
+            cache.put(key, key, cache.generation)
+        cache.get('worker:c')
+        cache.invalidate('worker:c')
+
+        assert count(READ_CACHE_REQUESTS, result='hit') == hits + 1
+        assert count(READ_CACHE_REQUESTS, result='miss') == misses + 1
+        assert count(READ_CACHE_EVICTIONS, reason='size') == size + 1
+        assert count(READ_CACHE_EVICTIONS, reason='invalidated') == invalidated + 1
+
+
+@pytest.mark.unit
+class TestRedisClientReadCache:
+    """Tests for RedisClient with the read cache and its invalidator."""
+
+    @pytest.fixture
+    def server(self):
+        """Shared fakeredis server."""
+        import fakeredis
+
+        return fakeredis.FakeServer()
+
+    @pytest.fixture
+    def make_cached_client(self, server):
+        """Build RedisClients on fakeredis with a read cache for worker: keys.
+
+        fakeredis has no CONFIG command; the clients see ``keyspace_events``
+        as the server's notify-keyspace-events (None: CONFIG is refused).
+        """
+        import fakeredis
+        from redis.exceptions import ResponseError
+        from redis_client import RedisClient
+
+        clients = []
+
+        def make(keyspace_events='Kg$xe'):
+            class ConfiguredFakeRedis(fakeredis.FakeRedis):
+                def config_get(self, pattern='*', *args, **kwargs):
+                    if keyspace_events is None:
+                        raise ResponseError("unknown command 'CONFIG'")
+                    return {'notify-keyspace-events': keyspace_events}
+
+                def config_set(self, *args, **kwargs):
+                    raise AssertionError('CONFIG SET sent')
+
+            def fake_redis(**kwargs):
+                return ConfiguredFakeRedis(server=server, decode_responses=True)
+
+            with patch('redis_client.TimedRedis', side_effect=fake_redis):
+                client = RedisClient(
+                    host='cache', port=6379, health_monitor=False,
+                    read_cache_size=100, read_cache_ttl=60, read_cache_prefixes=['worker:']
+                )
+                client.connect()
+            clients.append(client)
+            return client
+
+        yield make
+        for client in clients:
+            client.close()
+
+    @pytest.fixture
+    def cached_client(self, make_cached_client, server):
+        """RedisClient with a live read cache, and a second client to change keys with."""
+        import fakeredis
+
+        client = make_cached_client()
+        assert _wait_for(lambda: client._read_cache._live)
+        return client, fakeredis.FakeRedis(server=server, decode_responses=True)
+
+    @pytest.mark.parametrize('keyspace_events', ['', 'Kx', None], ids=['off', 'partial', 'config-refused'])
+    def test_cache_stays_off_without_keyspace_events(self, make_cached_client, keyspace_events):
+        """Test that the cache never serves unless the server publishes the events it relies on."""
+        import time
+
+        client = make_cached_client(keyspace_events)
+        client.set('worker:last_task', 'a')
+        client.get('worker:last_task')
+        time.sleep(0.1)
+
+        assert client._invalidator.is_alive()
+        assert client._read_cache._live is False
+        assert client._read_cache.get('worker:last_task') == (False, None)
+
+    def test_get_served_from_cache(self, cached_client):
+        """Test that repeated reads of a hot key skip Redis."""
+        client, other = cached_client
+        other.set('worker:last_task', 'a')
+
+        assert client.get('worker:last_task') == 'a'
+        with patch.object(client._client, 'get', side_effect=AssertionError('GET sent')):
+            assert client.get('worker:last_task') == 'a'
+
+    def test_mget_fetches_only_misses(self, cached_client):
+        """Test that MGET asks Redis only for keys not cached."""
+        client, other = cached_client
+        generation = client._read_cache.generation
+        other.mset({'worker:tasks:a': '1', 'worker:tasks:b': '2'})
+        # A late notification for the MSET would drop the entry cached below
+        assert _wait_for(lambda: client._read_cache.generation >= generation + 2)
+        client.get('worker:tasks:a')
+
+        with patch.object(client._client, 'mget', wraps=client._client.mget) as mget:
+            assert client.mget(['worker:tasks:a', 'worker:tasks:b', 'worker:tasks:c'], default=0) == ['1', '2', 0]
+            assert client.mget(['worker:tasks:a', 'worker:tasks:b', 'worker:tasks:c'], default=0) == ['1', '2', 0]
+
+        mget.assert_called_once_with(['worker:tasks:b', 'worker:tasks:c'])
+
+    def test_own_writes_invalidate(self, cached_client):
+        """Test that writes through the client are visible immediately."""
+        client, _ = cached_client
+        client.set('worker:last_task', 'a')
+        assert client.get('worker:last_task') == 'a'
+
+        client.incr('worker:tasks:a')
+        assert client.get('worker:tasks:a') == '1'
+        with client.pipeline() as pipe:
+            pipe.incr('worker:tasks:a')
+            pipe.mset({'worker:last_task': 'b'})
+
+        assert client.get('worker:tasks:a') == '2'
+        assert client.get('worker:last_task') == 'b'
+
+    def test_keyspace_notification_invalidates(self, cached_client):
+        """Test that a change published by Redis evicts the entry."""
+        client, other = cached_client
+        other.set('worker:last_task', 'a')
+        assert client.get('worker:last_task') == 'a'
+
+        # fakeredis does not emit keyspace events; publish what Redis would
+        other.set('worker:last_task', 'b')
+        other.publish('__keyspace@0__:worker:last_task', 'set')
+
+        assert _wait_for(lambda: client.get('worker:last_task') == 'b', timeout=1.0)
+
+    def test_cache_stops_serving_when_stream_is_lost(self, cached_client):
+        """Test that a lost subscription empties the cache until resubscribed."""
+        client, other = cached_client
+        other.set('worker:last_task', 'a')
+        client.get('worker:last_task')
+
+        client._invalidator.stop()
+
+        assert client._read_cache.get('worker:last_task') == (False, None)
+        assert len(client._read_cache) == 0
+
+
+@pytest.mark.unit
+class TestValueCodec:
+    """Tests for the binary value codec."""
+
+    VALUE = {'task': 'cleanup', 'count': 3, 'ratio': 0.5, 'tags': ['a', 'b'], 'done': None}
+
+    def test_json_round_trip(self):
+        """Test the JSON fallback format."""
+        from redis_client import ValueCodec
+
+        codec = ValueCodec(use_msgpack=False)
+        data = codec.encode(self.VALUE)
+
+        assert data[0] == ValueCodec.JSON
+        assert codec.decode(data) == self.VALUE
+
+    def test_msgpack_round_trip(self):
+        """Test that msgpack is preferred when installed."""
+        pytest.importorskip('msgpack')
+        from redis_client import ValueCodec
+
+        codec = ValueCodec()
+        data = codec.encode(self.VALUE)
+
+        assert data[0] == ValueCodec.MSGPACK
+        assert codec.decode(data) == self.VALUE
+        assert len(data) < len(ValueCodec(use_msgpack=False).encode(self.VALUE))
+
+    def test_compresses_large_values(self):
+        """Test that values above the threshold are stored compressed."""
+        from redis_client import ValueCodec
+
+        codec = ValueCodec(compress_threshold=256)
+        value = {'rows': [{'id': i, 'status': 'processed'} for i in range(200)]}
+        data = codec.encode(value)
+
+        assert data[0] & ValueCodec.ZLIB
+        assert len(data) < len(ValueCodec(compress_threshold=None).encode(value)) / 4
+        assert ValueCodec(compress_threshold=None, use_msgpack=False).decode(data) == value
+
+    def test_small_values_are_not_compressed(self):
+        """Test that values below the threshold skip compression."""
+        from redis_client import ValueCodec
+
+        assert not ValueCodec(compress_threshold=256).encode(self.VALUE)[0] & ValueCodec.ZLIB
+
+    @pytest.mark.parametrize('data', [b'', b'\x7fabc', b'\x81not zlib', b'\x01{'])
+    def test_rejects_foreign_data(self, data):
+        """Test that data not written by the codec raises ValueError."""
+        from redis_client import ValueCodec
+
+        with pytest.raises(ValueError):
+            ValueCodec().decode(data)
+
+
+@pytest.mark.unit
+class TestRedisClientTypedAccessors:
+    """Tests for typed and structured RedisClient accessors."""
+
+    def test_numbers_are_stored_natively(self, mock_redis_client):
+        """Test that numbers round-trip as Redis numbers usable by INCR."""
+        mock_redis_client.set('counter', 41)
+        mock_redis_client.set('timestamp', 1700000000.25)
+        mock_redis_client.incr('counter')
+
+        assert mock_redis_client.get_int('counter') == 42
+        assert mock_redis_client.get_float('timestamp') == 1700000000.25
+        assert mock_redis_client.get_int('missing', default=0) == 0
+
+    def test_invalid_number_returns_default(self, mock_redis_client):
+        """Test that a non-numeric value falls back to the default."""
+        mock_redis_client.set('counter', 'abc')
+
+        assert mock_redis_client.get_int('counter', default=-1) == -1
+
+    def test_mget_int(self, mock_redis_client):
+        """Test typed multi-key reads."""
+        mock_redis_client.mset({'a': 1, 'b': 'x'})
+
+        assert mock_redis_client.mget_int(['a', 'b', 'c']) == [1, 0, 0]
+
+    def test_object_round_trip_is_binary_safe(self, mock_redis_client):
+        """Test that compressed structured values survive the decoding pool."""
+        value = {'rows': [{'id': i, 'status': 'processed'} for i in range(200)]}
+
+        assert mock_redis_client.set_object('report', value, ex=60) is True
+        raw = mock_redis_client._client.execute_command('STRLEN', 'report')
+
+        assert mock_redis_client.get_object('report') == value
+        assert raw < len(str(value)) / 4
+        assert mock_redis_client.get_object('missing', default={}) == {}
+
+    def test_undecodable_object_returns_default(self, mock_redis_client):
+        """Test that plain strings are not mistaken for encoded objects."""
+        mock_redis_client.set('plain', 'hello')
+
+        assert mock_redis_client.get_object('plain', default='fallback') == 'fallback'
+
+    def test_object_connection_error_returns_default(self, mock_redis_client):
+        """Test fail-soft defaults for structured reads and writes."""
+        mock_redis_client._client.execute_command = Mock(side_effect=ConnectionError("Connection lost"))
+        mock_redis_client._client.set = Mock(side_effect=ConnectionError("Connection lost"))
+
+        assert mock_redis_client.get_object('report', default={}) == {}
+        assert mock_redis_client.set_object('report', {'a': 1}) is False
+
+
+@pytest.mark.unit
+class TestInstrumentedConnectionPool:
+    """Tests for the instrumented blocking connection pool."""
+
+    @pytest.fixture
+    def pool(self):
+        """Two-connection pool on a fakeredis server."""
+        import fakeredis
+        from redis_client import InstrumentedConnectionPool
+
+        return InstrumentedConnectionPool(
+            target='pool-test',
+            max_connections=2,
+            timeout=0.05,
+            connection_class=fakeredis.FakeRedisConnection,
+            server=fakeredis.FakeServer(),
+            decode_responses=True
+        )
+
+    def test_stats_track_checkouts(self, pool):
+        """Test in-use, idle and created counts across checkouts."""
+        import redis
+
+        client = redis.Redis(connection_pool=pool)
+        client.set('key', 'value')
+        connection = pool.get_connection('GET')
+
+        assert pool.stats() == {'available': 0, 'in_use': 1, 'created': 1, 'max_connections': 2}
+        pool.release(connection)
+        assert pool.stats() == {'available': 1, 'in_use': 0, 'created': 1, 'max_connections': 2}
+
+    def test_metrics(self, pool):
+        """Test checkout wait, idle age, creation and gauge metrics."""
+        import redis
+        from redis_client import (
+            POOL_CHECKOUT_WAIT, POOL_CONNECTIONS, POOL_CONNECTIONS_CREATED, POOL_IDLE_AGE)
+
+        created = POOL_CONNECTIONS_CREATED.labels(target='pool-test')._value.get()
+        checkouts = _observations(POOL_CHECKOUT_WAIT, target='pool-test')
+        reuses = _observations(POOL_IDLE_AGE, target='pool-test')
+
+        client = redis.Redis(connection_pool=pool)
+        for _ in range(3):
+            client.ping()
+
+        assert POOL_CONNECTIONS_CREATED.labels(target='pool-test')._value.get() == created + 1
+        assert _observations(POOL_CHECKOUT_WAIT, target='pool-test') == checkouts + 3
+        assert _observations(POOL_IDLE_AGE, target='pool-test') == reuses + 2
+        assert POOL_CONNECTIONS.labels(target='pool-test', state='idle')._value.get() == 1
+        assert POOL_CONNECTIONS.labels(target='pool-test', state='max')._value.get() == 2
+
+    def test_exhaustion_waits_then_raises(self, pool):
+        """Test that checkouts block for the timeout and are counted when none frees up."""
+        import time
+        from redis_client import POOL_EXHAUSTED, PoolExhaustedError
+
+        exhausted = POOL_EXHAUSTED.labels(target='pool-test')._value.get()
+        held = [pool.get_connection('GET') for _ in range(2)]
+
+        start = time.perf_counter()
+        with pytest.raises(PoolExhaustedError):
+            pool.get_connection('GET')
+
+        assert time.perf_counter() - start >= 0.05
+        assert POOL_EXHAUSTED.labels(target='pool-test')._value.get() == exhausted + 1
+        for connection in held:
+            pool.release(connection)
+        assert pool.get_connection('GET') is not None
+
+    def test_exhaustion_does_not_trip_the_circuit(self, mock_redis_client):
+        """Test that a busy pool returns defaults without marking Redis down."""
+        from redis_client import CircuitBreaker, PoolExhaustedError, RedisClient
+
+        mock_redis_client._breaker = CircuitBreaker(failure_threshold=1)
+        mock_redis_client.is_connected = RedisClient.is_connected.__get__(mock_redis_client)
+        mock_redis_client._client.get = Mock(side_effect=PoolExhaustedError("No connection"))
+
+        assert mock_redis_client.get('key', default='fallback') == 'fallback'
+        assert mock_redis_client.is_connected() is True
+        assert mock_redis_client._breaker.state == CircuitBreaker.CLOSED
+
+    def test_reap_closes_only_long_idle_connections(self, pool):
+        """Test that reaping keeps in-use, recently used and ``keep`` connections."""
+        import time
+        from redis_client import POOL_CONNECTIONS, POOL_CONNECTIONS_REAPED
+
+        reaped = POOL_CONNECTIONS_REAPED.labels(target='pool-test')._value.get()
+        stale, busy = pool.get_connection('GET'), pool.get_connection('GET')
+        pool.release(stale)
+        stale._pool_released_at = time.monotonic() - 120
+
+        assert pool.reap(60, keep=2) == 0
+        assert pool.reap(60) == 1
+        assert pool.stats() == {'available': 0, 'in_use': 1, 'created': 1, 'max_connections': 2}
+        assert stale._sock is None
+        assert POOL_CONNECTIONS_REAPED.labels(target='pool-test')._value.get() == reaped + 1
+        assert POOL_CONNECTIONS.labels(target='pool-test', state='idle')._value.get() == 0
+
+        # The freed slot opens a new connection on demand
+        fresh = pool.get_connection('GET')
+        assert fresh is not stale and pool.stats()['created'] == 2
+        pool.release(fresh)
+        pool.release(busy)
+        assert pool.reap(60) == 0
+
+    def test_client_reaps_after_health_checks(self):
+        """Test that the client reaps its pool but keeps its warm connections."""
+        import time
+        import fakeredis
+        from redis_client import InstrumentedConnectionPool, RedisClient
+
+        server = fakeredis.FakeServer()
+
+        def pool_factory(**kwargs):
+            return InstrumentedConnectionPool(
+                connection_class=fakeredis.FakeRedisConnection, server=server, **kwargs)
+
+        with patch('redis_client.InstrumentedConnectionPool', side_effect=pool_factory):
+            client = RedisClient(host='localhost', port=6379, health_monitor=False,
+                                 warm_connections=1, idle_timeout=60)
+            client.connect()
+        assert client._warmer.wait(timeout=5)
+        client._pool.warm(3)
+        for connection in client._pool._connections:
+            connection._pool_released_at = time.monotonic() - 120
+
+        assert client._reap_idle() == 2
+        assert client.get_pool_stats()['created'] == 1
+        client.close()
+
+    @pytest.mark.parametrize('threads,processes,replicas,budget,expected', [
+        (4, 2, 10, None, 6),
+        (4, 2, 10, 200, 6),
+        (4, 2, 10, 100, 5),
+        (16, 4, 10, 40, 1),
+    ])
+    def test_pool_size_for(self, threads, processes, replicas, budget, expected):
+        """Test pool sizing from the thread count and the deployment budget."""
+        from redis_client import pool_size_for
+
+        assert pool_size_for(threads, processes, replicas, budget) == expected
+
+    def test_client_pool_stats(self):
+        """Test that RedisClient reports the instrumented pool's stats."""
+        from redis_client import RedisClient
+
+        with patch('redis_client.TimedRedis'):
+            client = RedisClient(host='localhost', port=6379, max_connections=7, health_monitor=False)
+            client.connect()
+
+        assert client.get_pool_stats() == {'available': 0, 'in_use': 0, 'created': 0, 'max_connections': 7}
+        assert client._pool.timeout == 1.0
+
+
+@pytest.mark.unit
+class TestCommandTiming:
+    """Tests for per-command latency metrics and the slow-command log."""
+
+    @pytest.fixture
+    def timed_client(self):
+        """TimedRedis on fakeredis logging every command as slow."""
+        import fakeredis
+        from redis_client import CommandTimer, InstrumentedConnectionPool, SlowCommandLog, TimedRedis
+
+        pool = InstrumentedConnectionPool(
+            target='timing-test',
+            connection_class=fakeredis.FakeRedisConnection,
+            server=fakeredis.FakeServer(),
+            decode_responses=True
+        )
+        slow_log = SlowCommandLog(threshold_ms=0, size=3)
+        timer = CommandTimer('timing-test', slow_log, trace_id_getter=lambda: 'trace-1')
+        return TimedRedis(connection_pool=pool, timer=timer), slow_log
+
+    @pytest.mark.parametrize('key,pattern', [
+        ('worker:tasks:cleanup', 'worker:tasks:cleanup'),
+        ('rate_limit:10.0.0.1', 'rate_limit:*'),
+        ('rate_limit:swc:user:42:28333', 'rate_limit:swc:user:*:*'),
+        (b'concurrency:abc123', 'concurrency:*'),
+    ])
+    def test_key_pattern(self, key, pattern):
+        """Test that IDs, IPs and timestamps are masked in key patterns."""
+        from redis_client import key_pattern
+
+        assert key_pattern(key) == pattern
+
+    def test_commands_feed_histogram(self, timed_client):
+        """Test that each command is observed under its own label."""
+        from redis_client import COMMAND_DURATION
+
+        client, _ = timed_client
+        count = partial(_observations, COMMAND_DURATION, target='timing-test')
+        gets, sets = count(command='GET'), count(command='SET')
+
+        client.set('key', 'value')
+        client.get('key')
+        client.get('key')
+
+        assert count(command='SET') == sets + 1
+        assert count(command='GET') == gets + 2
+
+    def test_pipeline_timed_once(self, timed_client):
+        """Test that a pipeline is one PIPELINE observation, not one per command."""
+        from redis_client import COMMAND_DURATION
+
+        client, slow_log = timed_client
+        count = partial(_observations, COMMAND_DURATION, target='timing-test')
+        pipelines, incrs = count(command='PIPELINE'), count(command='INCR')
+
+        pipe = client.pipeline(transaction=False)
+        pipe.incr('worker:tasks:cleanup')
+        pipe.set('worker:last_task', 'cleanup')
+        assert pipe.execute() == [1, True]
+
+        assert count(command='PIPELINE') == pipelines + 1
+        assert count(command='INCR') == incrs
+        assert slow_log.entries()[0]['key'] == 'worker:tasks:cleanup'
+
+    def test_slow_log_entries(self, timed_client):
+        """Test entry contents, script key extraction and the ring buffer bound."""
+        client, slow_log = timed_client
+        script = client.register_script("return redis.call('GET', KEYS[1])")
+        script(keys=['rate_limit:10.0.0.1'])
+        for i in range(3):
+            client.get(f'session:{i}')
+
+        entries = slow_log.entries()
+        assert len(entries) == 3
+        assert all(entry['trace_id'] == 'trace-1' for entry in entries)
+        assert {entry['key'] for entry in entries} == {'session:*'}
+        assert entries == sorted(entries, key=lambda entry: entry['duration_ms'], reverse=True)
+
+    def test_script_key_is_logged(self, timed_client):
+        """Test that EVALSHA entries name the script's first key."""
+        client, slow_log = timed_client
+        script = client.register_script("return redis.call('GET', KEYS[1])")
+        script(keys=['rate_limit:10.0.0.1'])
+
+        assert ('EVALSHA', 'rate_limit:*') in [(e['command'], e['key']) for e in slow_log.entries()]
+
+    def test_fast_commands_are_not_logged(self):
+        """Test the slow-command threshold."""
+        from redis_client import SlowCommandLog, CommandTimer
+
+        slow_log = SlowCommandLog(threshold_ms=10)
+        timer = CommandTimer('timing-test', slow_log)
+        timer.record(('GET', 'fast'), 1_000_000)
+        timer.record(('GET', 'slow'), 15_000_000)
+
+        assert [entry['key'] for entry in slow_log.entries()] == ['slow']
+        assert slow_log.entries()[0]['duration_ms'] == 15.0
+
+
+class TestReplicaRouting:
+    """Tests for read routing across replicas."""
+
+    @pytest.fixture
+    def servers(self):
+        """fakeredis servers keyed by host."""
+        import fakeredis
+
+        return {host: fakeredis.FakeServer() for host in ('primary', 'replica-a', 'replica-b')}
+
+    @pytest.fixture
+    def make_client(self, servers):
+        """Build RedisClients whose pools connect to the fakeredis server of their host."""
+        import fakeredis
+        from redis_client import InstrumentedConnectionPool, RedisClient
+
+        def pool_factory(**kwargs):
+            return InstrumentedConnectionPool(
+                connection_class=fakeredis.FakeRedisConnection,
+                server=servers[kwargs['host']],
+                **kwargs
+            )
+
+        clients = []
+
+        def make(**kwargs):
+            client = RedisClient(host='primary', port=6379, health_monitor=False, **kwargs)
+            client.connect()
+            clients.append(client)
+            return client
+
+        # Sentinel rediscovery and reconnects build new pools too
+        with patch('redis_client.InstrumentedConnectionPool', side_effect=pool_factory):
+            yield make
+        for client in clients:
+            client.close()
+
+    def test_reads_go_to_replica_and_writes_to_primary(self, make_client, servers):
+        """Test that reads are served by the replica and writes land on the primary."""
+        import fakeredis
+
+        replica = fakeredis.FakeRedis(server=servers['replica-a'], decode_responses=True)
+        replica.set('key', 'from-replica')
+        replica.hset('hash', mapping={'field': 'replica'})
+        replica.zadd('zset', {'a': 1, 'b': 2})
+        client = make_client(replicas=[('replica-a', 6379)])
+
+        assert client.set('key', 'from-primary')
+        assert client.get('key') == 'from-replica'
+        assert client.mget(['key', 'missing'], default='-') == ['from-replica', '-']
+        assert client.hget('hash', 'field') == 'replica'
+        assert client.hgetall('hash') == {'field': 'replica'}
+        assert client.zcard('zset') == 2
+        assert client.get('key', primary=True) == 'from-primary'
+        assert replica.get('key') == 'from-replica'
+
+    def test_half_open_replica_probe_past_the_deadline_is_retried(self, make_client):
+        """Test that a replica whose probe read ran out of request time is probed again."""
+        from redis_client import CircuitBreaker, DeadlineExceededError
+
+        client = make_client(replicas=[('replica-a', 6379)])
+        replica = client._replicas.replicas[0]
+        replica.breaker.jitter = 0
+        with patch('redis_client.time.monotonic', return_value=100.0):
+            for _ in range(replica.breaker.failure_threshold):
+                replica.breaker.record_failure()
+
+        with patch('redis_client.time.monotonic', return_value=1000.0):
+            probe = client._replicas.acquire()
+            assert probe is replica
+            client._replicas.release(probe, DeadlineExceededError("Request deadline passed"))
+            assert replica.breaker.state == CircuitBreaker.HALF_OPEN
+
+            assert client._replicas.acquire() is replica
+
+    def test_least_outstanding_replica_is_chosen(self, make_client):
+        """Test that the replica with fewer reads in flight is picked."""
+        client = make_client(replicas=[('replica-a', 6379), ('replica-b', 6379)])
+        replicas = client._replicas
+
+        busy = replicas.acquire()
+        chosen = replicas.acquire()
+
+        assert chosen is not busy
+        assert (busy.outstanding, chosen.outstanding) == (1, 1)
+        replicas.release(busy)
+        replicas.release(chosen)
+        assert [replica.outstanding for replica in replicas.replicas] == [0, 0]
+
+    def test_replica_failure_falls_back_to_primary(self, make_client, servers):
+        """Test that a failing replica is skipped once its breaker opens."""
+        client = make_client(replicas=[('replica-a', 6379)], failure_threshold=2)
+        client.set('key', 'from-primary')
+        servers['replica-a'].connected = False
+
+        for _ in range(2):
+            assert client.get('key') == 'from-primary'
+
+        replica = client._replicas.replicas[0]
+        assert replica.breaker.state == 'open'
+        assert replica.outstanding == 0
+        assert client._replicas.acquire() is None
+        assert client.is_connected()
+        assert client.get_pool_stats()['replicas'][0]['state'] == 'open'
+
+    def test_replica_reads_do_not_fill_read_cache(self, make_client, servers):
+        """Test that only values read from the primary are cached."""
+        import fakeredis
+
+        fakeredis.FakeRedis(server=servers['replica-a']).set('worker:key', 'stale')
+        with patch('redis_client.CacheInvalidator'):
+            client = make_client(replicas=[('replica-a', 6379)], read_cache_size=10)
+        client._read_cache.set_live(True)
+
+        assert client.get('worker:key') == 'stale'
+        assert len(client._read_cache) == 0
+        client.set('worker:key', 'fresh')
+        assert client.get('worker:key', primary=True) == 'fresh'
+        assert len(client._read_cache) == 1
+
+    def test_sentinel_discovery(self, make_client):
+        """Test that Sentinel supplies the primary and the replicas."""
+        with patch('redis_client.Sentinel') as sentinel:
+            sentinel.return_value.discover_master.return_value = ('primary', 6380)
+            sentinel.return_value.discover_slaves.return_value = [('replica-b', 6379)]
+            client = make_client(sentinels=[('sentinel', 26379)], replicas=[('replica-a', 6379)])
+
+        sentinel.assert_called_once()
+        assert (client.host, client.port) == ('primary', 6380)
+        assert client._replicas.addresses == [('replica-b', 6379)]
+
+    def test_parse_addresses(self):
+        """Test parsing of REDIS_REPLICAS-style address lists."""
+        from redis_client import parse_addresses
+
+        assert parse_addresses('') == []
+        assert parse_addresses('a:6380, b') == [('a', 6380), ('b', 6379)]
+        assert parse_addresses('s1', default_port=26379) == [('s1', 26379)]
+
+
+class TestConnectionWarmer:
+    """Tests for connection pre-warming and script preloading."""
+
+    @pytest.fixture
+    def server(self):
+        import fakeredis
+
+        return fakeredis.FakeServer()
+
+    @pytest.fixture
+    def make_client(self, server):
+        """Build RedisClients on a fakeredis server."""
+        import fakeredis
+        from redis_client import InstrumentedConnectionPool, RedisClient
+
+        def pool_factory(**kwargs):
+            return InstrumentedConnectionPool(
+                connection_class=fakeredis.FakeRedisConnection, server=server, **kwargs)
+
+        clients = []
+
+        def make(**kwargs):
+            client = RedisClient(host='localhost', port=6379, health_monitor=False, **kwargs)
+            client.connect()
+            clients.append(client)
+            return client
+
+        # Pools are rebuilt in forked children, so keep the factory patched
+        with patch('redis_client.InstrumentedConnectionPool', side_effect=pool_factory):
+            yield make
+        for client in clients:
+            client.close()
+
+    def test_warm_up_opens_connections_and_loads_scripts(self, make_client):
+        """Test that warm-up leaves idle connections and cached scripts behind."""
+        script = "return 1"
+        client = make_client(warm_connections=3, warm_scripts=(script,), max_connections=10)
+
+        assert client._warmer.wait(timeout=5)
+        assert client.is_warm()
+        stats = client.get_pool_stats()
+        assert (stats['created'], stats['in_use'], stats['available']) == (3, 0, 3)
+        import hashlib
+        assert client._client.script_exists(hashlib.sha1(script.encode()).hexdigest()) == [True]
+
+    def test_warm_up_is_capped_by_pool_size(self, make_client):
+        """Test that warm-up never holds more than max_connections."""
+        client = make_client(warm_connections=8, max_connections=2)
+
+        assert client._warmer.wait(timeout=5)
+        assert client.get_pool_stats()['created'] == 2
+
+    def test_warm_up_gives_up_when_redis_is_down(self, make_client, server):
+        """Test that an unreachable Redis ends warm-up after the timeout."""
+        from redis_client import ConnectionWarmer
+
+        server.connected = False
+        with patch.object(ConnectionWarmer, 'RETRY_DELAY', 0.01):
+            client = make_client(warm_connections=2, warm_up_timeout=0.05)
+            assert client._warmer.wait(timeout=5)
+
+        assert client.is_warm()
+        assert not client.is_connected()
+
+    def test_is_warm_without_warm_up(self, make_client):
+        """Test that clients without warm-up are always warm."""
+        client = make_client()
+
+        assert client._warmer is None
+        assert client.is_warm()
+
+    @pytest.mark.skipif(not hasattr(os, 'fork'), reason='requires fork()')
+    def test_warm_up_reruns_after_fork(self, make_client):
+        """Test that a forked child warms its own pool before reporting warm."""
+        client = make_client(warm_connections=2)
+        assert client._warmer.wait(timeout=5)
+        read_fd, write_fd = os.pipe()
+
+        pid = os.fork()
+        if pid == 0:
+            try:
+                cold = not client._warmer.is_done()
+                client.is_warm()
+                warm = client._warmer.wait(timeout=5) and client.get_pool_stats()['created'] == 2
+                os.write(write_fd, b'1' if cold and warm else b'0')
+            finally:
+                os._exit(0)
+
+        os.close(write_fd)
+        result = os.read(read_fd, 1)
+        os.close(read_fd)
+        os.waitpid(pid, 0)
+
+        assert result == b'1'
+
+
+@pytest.mark.unit
+class TestScripts:
+    """Tests for the script registry and RedisClient.run_script."""
+
+    GET_OR_SET = "return redis.call('SET', KEYS[1], ARGV[1], 'GET') or ARGV[1]"
+
+    @pytest.fixture
+    def client(self):
+        """RedisClient on fakeredis with a test script registered."""
+        import fakeredis
+        from redis_client import InstrumentedConnectionPool, RedisClient, register_script
+
+        register_script('test:get_or_set', self.GET_OR_SET)
+        server = fakeredis.FakeServer()
+
+        def pool_factory(**kwargs):
+            return InstrumentedConnectionPool(
+                connection_class=fakeredis.FakeRedisConnection, server=server, **kwargs)
+
+        with patch('redis_client.InstrumentedConnectionPool', side_effect=pool_factory):
+            client = RedisClient(host='localhost', port=6379, health_monitor=False, preload_scripts=True)
+            client.connect()
+            yield client
+        client.close()
+
+    def test_registry_rejects_a_changed_source(self):
+        """Test that a name keeps its source and re-registering it is a no-op."""
+        from redis_client import ScriptRegistry
+
+        registry = ScriptRegistry()
+        sha = registry.register('touch', "return 1")
+
+        assert registry.register('touch', "return 1") == sha
+        assert registry.get('touch') == ("return 1", hashlib.sha1(b"return 1").hexdigest())
+        with pytest.raises(ValueError):
+            registry.register('touch', "return 2")
+        assert len(registry) == 1
+
+    def test_run_script_uses_evalsha(self, client):
+        """Test that a warm client sends only the SHA1."""
+        assert client._warmer.wait(timeout=5)
+
+        with patch.object(client._client, 'script_load', wraps=client._client.script_load) as script_load:
+            assert client.run_script('test:get_or_set', keys=['k'], args=['a']) == 'a'
+            assert client.run_script('test:get_or_set', keys=['k'], args=['b']) == 'a'
+
+        script_load.assert_not_called()
+
+    def test_run_script_reloads_on_noscript(self, client):
+        """Test that a flushed script cache is refilled transparently."""
+        assert client._warmer.wait(timeout=5)
+        client._client.script_flush()
+
+        assert client.run_script('test:get_or_set', keys=['k'], args=['a']) == 'a'
+        sha = hashlib.sha1(self.GET_OR_SET.encode()).hexdigest()
+        assert client._client.script_exists(sha) == [True]
+
+    def test_run_script_failures_return_default(self, client):
+        """Test that script errors fall back to the default and trip the breaker."""
+        client._client.evalsha = Mock(side_effect=ResponseError("ERR user_script:1: boom"))
+        assert client.run_script('test:get_or_set', keys=['k'], args=['a'], default='d') == 'd'
+        assert client.is_connected()
+
+        client._client.evalsha = Mock(side_effect=TimeoutError("Timed out"))
+        assert client.run_script('test:get_or_set', keys=['k'], args=['a'], default='d') == 'd'
+        assert client.is_connected()
+        for _ in range(3):
+            assert client.run_script('test:get_or_set', keys=['k'], args=['a'], default='d') == 'd'
+        assert not client.is_connected()
+        assert client._client.evalsha.call_count == 3
+
+    def test_unknown_script_raises(self, client):
+        """Test that running an undeclared script is a programming error."""
+        with pytest.raises(KeyError):
+            client.run_script('test:undeclared', keys=['k'])
+
+
+@pytest.mark.unit
+class TestDeadlines:
+    """Tests for request deadlines capping Redis calls."""
+
+    @pytest.fixture
+    def silent_server(self):
+        """TCP server that accepts connections and never answers."""
+        import socket
+        import threading
+
+        listener = socket.socket()
+        listener.bind(('127.0.0.1', 0))
+        listener.listen()
+        accepted = []
+
+        def accept():
+            while True:
+                try:
+                    accepted.append(listener.accept()[0])
+                except OSError:
+                    return
+
+        threading.Thread(target=accept, daemon=True).start()
+        yield listener.getsockname()[1]
+        listener.close()
+        for sock in accepted:
+            sock.close()
+
+    @pytest.fixture
+    def make_timed(self, silent_server):
+        """TimedRedis on the silent server with a 5s socket timeout and a retry."""
+        from redis_client import CommandTimer, TimedRedis
+
+        def make(budget):
+            return TimedRedis(
+                port=silent_server, socket_timeout=5, retry_on_timeout=True,
+                lib_name=None, lib_version=None,
+                timer=CommandTimer('deadline-test'), budget_getter=lambda: budget
+            )
+        return make
+
+    def test_command_gives_up_at_the_deadline(self, make_timed):
+        """Test that one slow command cannot outlive the request's budget."""
+        import time
+        from redis_client import DEADLINE_EXCEEDED, DeadlineExceededError
+
+        exceeded = DEADLINE_EXCEEDED.labels(target='deadline-test')._value.get()
+        client = make_timed(0.2)
+
+        start = time.monotonic()
+        with pytest.raises(DeadlineExceededError):
+            client.get('key')
+        assert time.monotonic() - start < 1
+        with pytest.raises(DeadlineExceededError):
+            with client.pipeline(transaction=False) as pipe:
+                pipe.get('key')
+                pipe.execute()
+        assert time.monotonic() - start < 2
+        assert DEADLINE_EXCEEDED.labels(target='deadline-test')._value.get() == exceeded + 2
+
+    def test_connection_settings_are_restored(self, make_timed):
+        """Test that a capped pipeline leaves the pooled connection as it found it."""
+        from redis_client import DeadlineExceededError
+
+        client = make_timed(0.2)
+        connection = client.connection_pool.get_connection('GET')
+        retry = connection.retry
+        client.connection_pool.release(connection)
+
+        with patch.object(connection, 'disconnect', wraps=connection.disconnect) as disconnect:
+            with pytest.raises(DeadlineExceededError):
+                with client.pipeline(transaction=False) as pipe:
+                    pipe.get('key')
+                    pipe.execute()
+
+        assert client.connection_pool.get_connection('GET') is connection
+        assert connection.retry is retry
+        # The unanswered command's reply must not reach the next one
+        disconnect.assert_called()
+
+    def test_capped_calls_still_answer_in_time(self, fake_redis_client):
+        """Test that commands and pipelines capped by a deadline return their replies."""
+        import fakeredis
+        from redis_client import CommandTimer, TimedRedis
+
+        client = TimedRedis(
+            connection_pool=fake_redis_client.connection_pool, timer=CommandTimer('deadline-test'),
+            budget_getter=lambda: 0.5
+        )
+        client.connection_pool.connection_kwargs.update(socket_timeout=5, retry_on_timeout=True)
+        assert isinstance(client.connection_pool.get_connection('GET'), fakeredis.FakeRedisConnection)
+
+        assert client.set('key', 'value') is True
+        assert client.get('key') == 'value'
+        with client.pipeline() as pipe:
+            pipe.incr('counter')
+            pipe.get('key')
+            assert pipe.execute() == [1, 'value']
+
+    def test_half_open_probe_past_the_deadline_is_retried(self):
+        """Test that a primary probe which runs out of request time does not block later probes."""
+        import fakeredis
+        import redis
+        from redis_client import CircuitBreaker, DeadlineExceededError, InstrumentedConnectionPool, RedisClient
+
+        server = fakeredis.FakeServer()
+
+        def pool_factory(**kwargs):
+            return InstrumentedConnectionPool(
+                connection_class=fakeredis.FakeRedisConnection, server=server, **kwargs)
+
+        with patch('redis_client.InstrumentedConnectionPool', side_effect=pool_factory):
+            client = RedisClient(host='localhost', port=6379, health_monitor=False, failure_threshold=1,
+                                 backoff_base=1.0)
+            client.connect()
+            client._breaker.jitter = 0
+            with patch('redis_client.time.monotonic', return_value=100.0):
+                client._mark_disconnected()
+
+            with patch('redis_client.time.monotonic', return_value=101.0):
+                with patch.object(redis.Redis, 'ping', side_effect=DeadlineExceededError("Request deadline passed")):
+                    assert client._check_health() is False
+                assert client._breaker.state == CircuitBreaker.HALF_OPEN
+                assert client._check_health() is True
+        assert client._breaker.state == CircuitBreaker.CLOSED
+        client.close()
+
+    def test_passed_deadline_skips_redis_without_tripping_the_breaker(self):
+        """Test that an expired budget returns defaults and leaves Redis healthy."""
+        import fakeredis
+        from redis_client import CircuitBreaker, InstrumentedConnectionPool, RedisClient
+
+        server = fakeredis.FakeServer()
+        budget = {'remaining': None}
+
+        def pool_factory(**kwargs):
+            return InstrumentedConnectionPool(
+                connection_class=fakeredis.FakeRedisConnection, server=server, **kwargs)
+
+        with patch('redis_client.InstrumentedConnectionPool', side_effect=pool_factory):
+            client = RedisClient(host='localhost', port=6379, health_monitor=False, failure_threshold=1,
+                                 budget_getter=lambda: budget['remaining'])
+            client.connect()
+        client.set('key', 'value')
+
+        budget['remaining'] = -0.1
+        assert client.get('key', default='late') == 'late'
+        with client.pipeline() as pipe:
+            pipe.incr('counter')
+        assert pipe.results is None
+        assert client.is_connected()
+        assert client._breaker.state == CircuitBreaker.CLOSED
+
+        budget['remaining'] = 10
+        assert client.get('key') == 'value'
+        client.close()
+
+
+@pytest.mark.unit
+class TestBulkheads:
+    """Tests for per-workload bulkhead pools."""
+
+    @pytest.fixture
+    def client(self):
+        """RedisClient on fakeredis with ratelimit and health bulkheads."""
+        import fakeredis
+        from redis_client import InstrumentedConnectionPool, RedisClient
+
+        server = fakeredis.FakeServer()
+
+        def pool_factory(**kwargs):
+            return InstrumentedConnectionPool(
+                connection_class=fakeredis.FakeRedisConnection, server=server, **kwargs)
+
+        with patch('redis_client.InstrumentedConnectionPool', side_effect=pool_factory):
+            client = RedisClient(host='localhost', port=6379, health_monitor=False, bulkheads={
+                'ratelimit': {'max_connections': 2, 'pool_timeout': 0.05},
+                'health': {'max_connections': 1}
+            })
+            client.connect()
+            yield client
+        client.close()
+
+    @pytest.mark.parametrize('value,expected', [
+        ('', {}),
+        ('ratelimit:8', {'ratelimit': {'max_connections': 8}}),
+        ('ratelimit:8:0.25, health:1:1:2', {
+            'ratelimit': {'max_connections': 8, 'pool_timeout': 0.25},
+            'health': {'max_connections': 1, 'pool_timeout': 1.0, 'socket_timeout': 2.0}
+        }),
+    ])
+    def test_parse_bulkheads(self, value, expected):
+        """Test parsing REDIS_BULKHEADS-style settings."""
+        from redis_client import parse_bulkheads
+
+        assert parse_bulkheads(value) == expected
+
+    def test_rejects_bad_settings(self):
+        """Test that a bulkhead needs a size and only known settings."""
+        from redis_client import RedisClient, parse_bulkheads
+
+        with pytest.raises(ValueError):
+            parse_bulkheads('ratelimit')
+        with pytest.raises(ValueError):
+            RedisClient(host='localhost', port=6379, health_monitor=False,
+                        bulkheads={'ratelimit': {'max_conections': 2}})
+
+    def test_workload_selects_the_pool(self, client):
+        """Test that commands use their workload's pool, health checks the health pool."""
+        from redis_client import workload
+
+        assert client.incr('shared') == 1
+        with workload('ratelimit'):
+            assert client.incr('limited') == 1
+        with workload('data'):
+            assert client.incr('shared') == 2
+
+        stats = client.get_pool_stats()
+        assert stats['created'] == 1
+        assert stats['bulkheads']['ratelimit']['created'] == 1
+        assert stats['bulkheads']['health']['created'] == 1
+
+    def test_exhausted_bulkhead_does_not_starve_the_others(self, client):
+        """Test that a full ratelimit pool fails fast while data and health keep working."""
+        from redis_client import POOL_SATURATION, workload
+
+        saturation = POOL_SATURATION.labels(target='localhost:6379/ratelimit')
+        pool = client._bulkheads['ratelimit'].connection_pool
+        held = [pool.get_connection('PING') for _ in range(2)]
+        try:
+            assert saturation._value.get() == 1.0
+            with workload('ratelimit'):
+                assert client.incr('limited') is None
+            assert client._breaker.state == 'closed'
+            assert client._check_health()
+            assert client.incr('shared') == 1
+        finally:
+            for connection in held:
+                pool.release(connection)
+        assert saturation._value.get() == 0.0
+
+    def test_rate_limiter_uses_its_workload(self, client):
+        """Test that RateLimiter sends its commands through its bulkhead."""
+        from rate_limiter import RateLimiter
+
+        limiter = RateLimiter(client, default_limit=5, redis_workload='ratelimit')
+        allowed, _ = limiter.check_rate_limit('10.0.0.1')
+
+        assert allowed
+        assert client.get_pool_stats()['bulkheads']['ratelimit']['created'] == 1
+        assert client.get_pool_stats()['created'] == 0
@@ -115,3 +115,71 @@ class TestRequestLogging:
             if 'extra' in kwargs:
                 assert 'status_code' in kwargs['extra']
                 assert kwargs['extra']['status_code'] == 200
+
+
+@pytest.mark.unit
+class TestDeadline:
+    """Tests for the per-request time budget."""
+
+    @pytest.fixture
+    def budget_app(self):
+        """Flask app reporting the budget seen by its view."""
+        from flask import Flask, jsonify
+        from request_context import RequestContextMiddleware, deadline_headers, downstream_timeout, get_remaining_budget
+
+        flask_app = Flask(__name__)
+        RequestContextMiddleware(flask_app, default_timeout=30)
+
+        @flask_app.route('/budget')
+        def budget():
+            return jsonify({
+                'remaining': get_remaining_budget(),
+                'downstream': downstream_timeout(3),
+                'headers': deadline_headers(downstream_timeout(3))
+            })
+
+        return flask_app.test_client()
+
+    @pytest.mark.parametrize('timeout,deadline_in,expected', [
+        ('2.5', None, 2.5),
+        (None, 1.5, 1.5),
+        ('2.5', 1.5, 1.5),
+        ('soon', None, 30),
+        (None, None, 30),
+        ('0.000001', None, 0.1),
+        (None, -60, 0.1),
+        ('60', None, 30),
+    ])
+    def test_budget_from_headers(self, budget_app, timeout, deadline_in, expected):
+        """Test that the tighter header wins, clamped to [min_timeout, default], and bad values are ignored."""
+        import time
+
+        headers = {}
+        if timeout is not None:
+            headers['X-Request-Timeout'] = timeout
+        if deadline_in is not None:
+            headers['X-Request-Deadline'] = str(time.time() + deadline_in)
+        remaining = budget_app.get('/budget', headers=headers).get_json()['remaining']
+
+        assert expected - 0.5 < remaining <= expected
+
+    def test_downstream_calls_get_the_reduced_deadline(self, budget_app):
+        """Test that outbound timeouts are capped and passed on with the trace ID."""
+        import time
+
+        data = budget_app.get('/budget', headers={'X-Request-Timeout': '1', 'X-Trace-ID': 'trace-1'}).get_json()
+        headers = data['headers']
+
+        assert 0.5 < data['downstream'] <= 1
+        assert 0.5 < float(headers['X-Request-Timeout']) <= 1
+        assert 0 < float(headers['X-Request-Deadline']) - time.time() < 1.01
+        assert headers['X-Trace-ID'] == 'trace-1'
+
+        assert budget_app.get('/budget', headers={'X-Request-Timeout': '60'}).get_json()['downstream'] == 3
+
+    def test_no_budget_outside_a_request(self):
+        """Test that background threads see no deadline."""
+        from request_context import downstream_timeout, get_remaining_budget
+
+        assert get_remaining_budget() is None
+        assert downstream_timeout(3) == 3
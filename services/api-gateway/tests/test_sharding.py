@@ -0,0 +1,300 @@
+"""Tests for client-side sharding across several Redis nodes.
+
+Unit tests run every node on its own FakeServer. The integration tests
+start real ``redis-server`` processes on local ports and are skipped when
+the binary is not installed.
+"""
+import shutil
+import socket
+import subprocess
+import threading
+import time
+from collections import Counter
+from unittest.mock import patch
+
+import fakeredis
+import pytest
+import redis
+
+from redis_client import SCRIPTS, HashRing, InstrumentedConnectionPool, ShardedRedisClient
+
+NODES = [('shard-a', 6379), ('shard-b', 6379), ('shard-c', 6379)]
+
+
+@pytest.fixture
+def servers():
+    """One FakeServer per node host."""
+    return {host: fakeredis.FakeServer() for host, _ in NODES}
+
+
+@pytest.fixture
+def sharded(servers):
+    """ShardedRedisClient whose node pools connect to the FakeServer of their host."""
+    def pool_factory(**kwargs):
+        return InstrumentedConnectionPool(
+            connection_class=fakeredis.FakeRedisConnection,
+            server=servers[kwargs['host']],
+            **kwargs
+        )
+
+    with patch('redis_client.InstrumentedConnectionPool', side_effect=pool_factory):
+        client = ShardedRedisClient(NODES, health_monitor=False)
+        client.connect()
+        yield client
+        client.close()
+
+
+@pytest.fixture
+def scripts():
+    """Shared script registry, restored after the test so test scripts do not leak."""
+    with patch.dict(SCRIPTS._scripts):
+        yield SCRIPTS
+
+
+def _server_keys(servers):
+    """Keys stored on each FakeServer."""
+    return {
+        host: set(fakeredis.FakeRedis(server=server, decode_responses=True).keys())
+        for host, server in servers.items()
+    }
+
+
+@pytest.mark.unit
+class TestHashRing:
+    """Tests for the consistent hash ring."""
+
+    def test_keys_spread_evenly(self):
+        """Test that virtual nodes give every node a fair share of keys."""
+        ring = HashRing(['a', 'b', 'c'], vnodes=160)
+        counts = Counter(ring.get_node(f"rate_limit:10.0.{i // 256}.{i % 256}") for i in range(30000))
+
+        assert set(counts) == {'a', 'b', 'c'}
+        assert max(counts.values()) / min(counts.values()) < 1.3
+
+    def test_adding_a_node_moves_only_its_share(self):
+        """Test that a new node takes keys only from the others, about 1/N of them."""
+        keys = [f"user:{i}" for i in range(20000)]
+        before = HashRing(['a', 'b', 'c'])
+        after = HashRing(['a', 'b', 'c', 'd'])
+
+        moved = [key for key in keys if before.get_node(key) != after.get_node(key)]
+
+        assert all(after.get_node(key) == 'd' for key in moved)
+        assert 0.15 < len(moved) / len(keys) < 0.35
+
+    @pytest.mark.parametrize('key,hashed', [
+        ('user:{42}:profile', '42'),
+        ('{42}', '42'),
+        ('user:{}:profile', 'user:{}:profile'),
+        ('user:{42', 'user:{42'),
+        (b'user:{42}:sessions', '42'),
+    ])
+    def test_hash_tags(self, key, hashed):
+        """Test that only the first non-empty {tag} is hashed, as in Redis Cluster."""
+        assert HashRing.hash_key(key) == hashed
+
+    def test_hash_tags_colocate_keys(self):
+        """Test that keys sharing a tag always share a node."""
+        ring = HashRing(['a', 'b', 'c'])
+
+        for user in range(200):
+            assert ring.get_node(f"user:{{{user}}}:profile") == ring.get_node(f"session:{{{user}}}")
+
+
+@pytest.mark.unit
+class TestShardedRedisClient:
+    """Tests for routing through ShardedRedisClient."""
+
+    def test_single_key_commands_use_the_owning_node(self, sharded, servers):
+        """Test that each key is stored only on its node."""
+        for i in range(60):
+            assert sharded.set(f"key:{i}", i)
+
+        stored = _server_keys(servers)
+        assert sum(len(keys) for keys in stored.values()) == 60
+        assert all(stored[host] for host, _ in NODES)
+        for i in range(60):
+            key = f"key:{i}"
+            assert key in stored[sharded.node_for(key).host]
+            assert sharded.get_int(key) == i
+
+    def test_multi_key_commands_are_split_per_node(self, sharded):
+        """Test that mget, mset and delete span nodes and keep key order."""
+        mapping = {f"counter:{i}": i for i in range(30)}
+        assert sharded.mset(mapping)
+
+        keys = list(mapping) + ['missing']
+        assert sharded.mget_int(keys, default=-1) == list(range(30)) + [-1]
+        assert sharded.mget(['counter:3', 'counter:1']) == ['3', '1']
+        assert sharded.delete(*keys) == 30
+        assert sharded.mget(keys[:3], default='gone') == ['gone'] * 3
+
+    def test_pipeline_spans_nodes(self, sharded):
+        """Test that a pipeline is split per node and replies come back in order."""
+        with sharded.pipeline() as pipe:
+            for i in range(10):
+                pipe.incr(f"hits:{i}", i + 1)
+            pipe.hset('stats:{global}', mapping={'runs': 1})
+            pipe.hincrby('stats:{global}', 'runs', 2)
+
+        assert pipe.results == list(range(1, 11)) + [1, 3]
+
+    def test_pipeline_rejects_cross_node_mset(self, sharded):
+        """Test that one command may not touch keys on different nodes."""
+        spread = [key for key in (f"k:{i}" for i in range(50))
+                  if sharded.node_for(key) is not sharded.node_for('k:0')]
+
+        with pytest.raises(ValueError):
+            with sharded.pipeline() as pipe:
+                pipe.mset({'k:0': 1, spread[0]: 2})
+
+    def test_down_node_only_fails_its_keys(self, sharded, servers):
+        """Test per-node breakers: keys on healthy nodes keep working."""
+        down = sharded.node_for('k:0')
+        servers[down.host].connected = False
+        healthy_key = next(key for key in (f"k:{i}" for i in range(50)) if sharded.node_for(key) is not down)
+
+        for _ in range(3):
+            assert sharded.incr('k:0') is None
+            down._check_health()
+
+        assert down._breaker.state == 'open'
+        assert sharded.incr(healthy_key) == 1
+        assert sharded.is_connected() is False
+        stats = sharded.get_pool_stats()
+        assert stats['nodes'][f"{down.host}:6379"]['state'] == 'open'
+        assert stats['max_connections'] == 3 * 50
+
+    def test_rate_limiter_keeps_client_keys_on_one_node(self, sharded, servers):
+        """Test that the sliding window counter's two windows share the client's node."""
+        from rate_limiter import RateLimiter
+
+        limiter = RateLimiter(sharded, default_limit=5, default_algorithm='sliding_window_counter')
+        for client in ('10.0.0.1', '10.0.0.2', '10.0.0.3', '10.0.0.4'):
+            with patch('rate_limiter.time.time', return_value=59.5):
+                limiter.check_rate_limit(client, window=60)
+            # time.time is patched for fakeredis too, so look before the keys expire
+            with patch('rate_limiter.time.time', return_value=60.5):
+                allowed, _ = limiter.check_rate_limit(client, window=60)
+                stored = _server_keys(servers)
+            assert allowed
+
+            home = sharded.node_for(client).host
+            assert {f"rate_limit:swc:{client}:0", f"rate_limit:swc:{client}:1"} <= stored[home]
+
+    def test_run_script_on_the_keys_node(self, sharded, servers, scripts):
+        """Test that scripts run where their keys live and may not span nodes."""
+        scripts.register('test:incr_both', "return {redis.call('INCR', KEYS[1]), redis.call('INCR', KEYS[2])}")
+        keys = ['user:{7}:hits', 'user:{7}:misses']
+
+        assert sharded.run_script('test:incr_both', keys=keys) == [1, 1]
+        assert set(keys) <= _server_keys(servers)[sharded.node_for('{7}').host]
+        spread = next(key for key in (f"k:{i}" for i in range(50))
+                      if sharded.node_for(key) is not sharded.node_for('k:0'))
+        with pytest.raises(ValueError):
+            sharded.run_script('test:incr_both', keys=['k:0', spread])
+
+    def test_rejects_replicas(self):
+        """Test that replicas cannot be combined with sharding."""
+        with pytest.raises(ValueError):
+            ShardedRedisClient(NODES, replicas=[('replica', 6379)])
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+@pytest.fixture(scope='module')
+def redis_servers():
+    """Three local redis-server processes."""
+    binary = shutil.which('redis-server')
+    if binary is None:
+        pytest.skip('redis-server is not installed')
+
+    ports = [_free_port() for _ in range(3)]
+    processes = [
+        subprocess.Popen(
+            [binary, '--port', str(port), '--save', '', '--appendonly', 'no'],
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+        )
+        for port in ports
+    ]
+    try:
+        for port in ports:
+            deadline = time.monotonic() + 5
+            while True:
+                try:
+                    redis.Redis(port=port).ping()
+                    break
+                except redis.ConnectionError:
+                    if time.monotonic() > deadline:
+                        raise
+                    time.sleep(0.05)
+        yield [('127.0.0.1', port) for port in ports]
+    finally:
+        for process in processes:
+            process.terminate()
+            process.wait(timeout=5)
+
+
+@pytest.mark.redis
+@pytest.mark.slow
+class TestShardingWithRedisServers:
+    """Distribution and throughput against real redis-server processes."""
+
+    # Server-side work per request, so the servers rather than this
+    # process bound throughput
+    BUSY_SCRIPT = "for i = 1, 20000 do end return redis.call('INCR', KEYS[1])"
+    THREADS = 12
+    SECONDS = 2.0
+
+    def _throughput(self, client) -> float:
+        """Busy-script calls per second from THREADS threads."""
+        done = []
+        stop = time.monotonic() + self.SECONDS
+
+        def run(thread):
+            count = 0
+            while time.monotonic() < stop:
+                key = f"bench:{thread}:{count}"
+                client.node_for(key)._client.eval(self.BUSY_SCRIPT, 1, key)
+                count += 1
+            done.append(count)
+
+        threads = [threading.Thread(target=run, args=(i,)) for i in range(self.THREADS)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return sum(done) / self.SECONDS
+
+    def test_keys_are_distributed(self, redis_servers):
+        """Test that keys written through the client spread over all servers."""
+        client = ShardedRedisClient(redis_servers, health_monitor=False)
+        try:
+            client.mset({f"dist:{i}": i for i in range(3000)})
+            counts = [redis.Redis(host=host, port=port).dbsize() for host, port in redis_servers]
+        finally:
+            client.close()
+
+        assert sum(counts) >= 3000
+        assert min(counts) > 700
+
+    @pytest.mark.benchmark
+    def test_throughput_scales_with_nodes(self, redis_servers):
+        """Test that three nodes serve server-bound requests faster than one."""
+        single = ShardedRedisClient(redis_servers[:1], health_monitor=False)
+        sharded = ShardedRedisClient(redis_servers, health_monitor=False)
+        try:
+            single.connect()
+            sharded.connect()
+            single_rate = self._throughput(single)
+            sharded_rate = self._throughput(sharded)
+        finally:
+            single.close()
+            sharded.close()
+
+        print(f"\nbusy-script throughput: 1 node {single_rate:.0f}/s, 3 nodes {sharded_rate:.0f}/s")
+        assert sharded_rate > 1.5 * single_rate
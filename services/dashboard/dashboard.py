@@ -5,7 +5,7 @@ import os
 from flask import Flask, render_template, jsonify
 import requests
 from structured_logger import setup_logger, LoggerAdapter
-from request_context import RequestContextMiddleware, get_trace_id
+from request_context import RequestContextMiddleware, deadline_headers, downstream_timeout, get_trace_id
 
 # Configuration
 DEBUG = os.getenv('DEBUG', 'False').lower() == 'true'
@@ -13,6 +13,10 @@ HOST = os.getenv('HOST', '0.0.0.0')
 PORT = int(os.getenv('PORT', '3000'))
 APP_ENV = os.getenv('APP_ENV', 'development')
 LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
+# Time budget (seconds) for requests without a deadline header (empty = none)
+REQUEST_TIMEOUT = float(os.getenv('REQUEST_TIMEOUT') or 0) or None
+# Timeout of each call to the other services
+SERVICE_TIMEOUT = float(os.getenv('SERVICE_TIMEOUT', '3'))
 
 # Service URLs
 API_GATEWAY_URL = os.getenv('API_GATEWAY_URL', 'http://api-gateway-service:8080')
@@ -32,7 +36,28 @@ base_logger = setup_logger(
 logger = LoggerAdapter(base_logger, {})
 
 # Initialize request context middleware for trace ID management
-RequestContextMiddleware(app)
+RequestContextMiddleware(app, default_timeout=REQUEST_TIMEOUT)
+
+
+def get_service(url):
+    """GET another service within what is left of this request's deadline.
+
+    The call times out after SERVICE_TIMEOUT or the remaining budget,
+    whichever is sooner, and passes that deadline and the trace ID on.
+
+    Args:
+        url: Service URL
+
+    Returns:
+        requests.Response: Service response
+
+    Raises:
+        requests.Timeout: If the deadline has already passed
+    """
+    timeout = downstream_timeout(SERVICE_TIMEOUT)
+    if timeout <= 0:
+        raise requests.Timeout(f"Request deadline passed before calling {url}")
+    return requests.get(url, timeout=timeout, headers=deadline_headers(timeout))
 
 
 def check_service_health(service_name, url):
@@ -46,7 +71,7 @@ def check_service_health(service_name, url):
         dict: Service health information
     """
     try:
-        response = requests.get(url, timeout=3)
+        response = get_service(url)
         if response.status_code == 200:
             return {
                 'name': service_name,
@@ -114,11 +139,11 @@ def system_info():
     """Get detailed system information."""
     try:
         # Get API Gateway status
-        api_response = requests.get(f'{API_GATEWAY_URL}/api/status', timeout=3)
+        api_response = get_service(f'{API_GATEWAY_URL}/api/status')
         api_data = api_response.json() if api_response.status_code == 200 else {}
 
         # Get Worker status
-        worker_response = requests.get(f'{WORKER_SERVICE_URL}/status', timeout=3)
+        worker_response = get_service(f'{WORKER_SERVICE_URL}/status')
         worker_data = worker_response.json() if worker_response.status_code == 200 else {}
 
         return jsonify({
@@ -150,7 +175,7 @@ def readiness():
     """Readiness probe endpoint."""
     # Check if we can reach API Gateway
     try:
-        response = requests.get(f'{API_GATEWAY_URL}/health/live', timeout=3)
+        response = get_service(f'{API_GATEWAY_URL}/health/live')
         if response.status_code == 200:
             return jsonify({
                 'status': 'ready',
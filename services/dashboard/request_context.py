@@ -1,10 +1,13 @@
-"""Request context management with trace ID.
+"""Request context management with trace ID and deadline.
 
 This module provides request context management including trace ID generation
-for distributed tracing across microservices.
+for distributed tracing across microservices, and a per-request time budget
+taken from the caller's deadline so downstream calls stop when the caller
+has given up.
 """
+import time
 import uuid
-from flask import request, g
+from flask import request, g, has_app_context
 from functools import wraps
 from typing import Optional, Callable
 
@@ -22,8 +25,10 @@ def get_trace_id() -> Optional[str]:
     """Get the current request's trace ID.
 
     Returns:
-        str: Current trace ID or None
+        str: Current trace ID, or None outside a request
     """
+    if not has_app_context():
+        return None
     return getattr(g, 'trace_id', None)
 
 
@@ -36,6 +41,86 @@ def set_trace_id(trace_id: str) -> None:
     g.trace_id = trace_id
 
 
+def set_deadline(timeout: Optional[float]) -> None:
+    """Give the current request a time budget.
+
+    Args:
+        timeout: Seconds from now the request may take (None for no deadline)
+    """
+    g.deadline = None if timeout is None else time.monotonic() + timeout
+
+
+def get_remaining_budget() -> Optional[float]:
+    """Seconds left before the current request's deadline.
+
+    Returns:
+        float: Remaining budget (0 or less once it has passed), or None
+        outside a request or without a deadline
+    """
+    if not has_app_context():
+        return None
+    deadline = getattr(g, 'deadline', None)
+    if deadline is None:
+        return None
+    return deadline - time.monotonic()
+
+
+def downstream_timeout(timeout: float) -> float:
+    """Timeout for an outbound call: ``timeout``, capped by the remaining budget.
+
+    Args:
+        timeout: Timeout the call would use without a deadline
+
+    Returns:
+        float: Seconds the call may take (0 or less if the deadline passed)
+    """
+    remaining = get_remaining_budget()
+    return timeout if remaining is None else min(timeout, remaining)
+
+
+def deadline_headers(timeout: float) -> dict:
+    """Headers passing the trace ID and a call's deadline downstream.
+
+    Args:
+        timeout: Seconds the outbound call may take (see downstream_timeout)
+
+    Returns:
+        dict: X-Trace-ID, X-Request-Timeout and X-Request-Deadline headers
+    """
+    headers = {
+        'X-Request-Timeout': f"{max(timeout, 0):.3f}",
+        'X-Request-Deadline': f"{time.time() + max(timeout, 0):.3f}"
+    }
+    trace_id = get_trace_id()
+    if trace_id:
+        headers['X-Trace-ID'] = trace_id
+    return headers
+
+
+def extract_deadline_from_request() -> Optional[float]:
+    """Extract the caller's time budget from request headers.
+
+    X-Request-Timeout gives seconds left; X-Request-Deadline gives the
+    Unix time at which the caller gives up. The tighter of the two wins.
+    Malformed values are ignored.
+
+    Returns:
+        float: Seconds the request may take, or None without a deadline
+    """
+    budgets = []
+    for header, to_budget in (
+        ('X-Request-Timeout', float),
+        ('X-Request-Deadline', lambda value: float(value) - time.time()),
+    ):
+        value = request.headers.get(header)
+        if value:
+            try:
+                budgets.append(to_budget(value))
+            except ValueError:
+                pass
+    return min(budgets) if budgets else None
+
+
 def extract_trace_id_from_request() -> str:
     """Extract or generate trace ID from request headers.
 
@@ -75,15 +160,22 @@ def with_trace_id(func: Callable) -> Callable:
 
 
 class RequestContextMiddleware:
-    """Middleware to manage request context and trace IDs."""
+    """Middleware to manage request context, trace IDs and deadlines."""
 
-    def __init__(self, app):
+    def __init__(self, app, default_timeout: Optional[float] = None, min_timeout: float = 0.1):
         """Initialize middleware.
 
         Args:
             app: Flask application instance
+            default_timeout: Budget in seconds for requests that carry no
+                deadline header, and the most a header can ask for (None
+                leaves them unbounded)
+            min_timeout: Least budget a deadline header can set, so a tiny
+                or past deadline cannot make the request skip its work
         """
         self.app = app
+        self.default_timeout = default_timeout
+        self.min_timeout = min_timeout
         self.app.before_request(self.before_request)
         self.app.after_request(self.after_request)
 
@@ -93,8 +185,19 @@ class RequestContextMiddleware:
         trace_id = extract_trace_id_from_request()
         set_trace_id(trace_id)
 
+        # Time budget from the caller's deadline, if any; headers come from
+        # the client, so they are clamped to [min_timeout, default_timeout]
+        timeout = extract_deadline_from_request()
+        if timeout is None:
+            timeout = self.default_timeout
+        else:
+            timeout = max(timeout, self.min_timeout)
+            if self.default_timeout is not None:
+                timeout = min(timeout, self.default_timeout)
+        set_deadline(timeout)
+
         # Store request start time
-        g.request_start_time = __import__('time').time()
+        g.request_start_time = time.time()
 
     def after_request(self, response):
         """Process response after handling.
@@ -0,0 +1,21 @@
+"""Pytest configuration and shared fixtures for Dashboard."""
+import pytest
+import sys
+import os
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+
+@pytest.fixture
+def app():
+    """Provide the Dashboard Flask app in testing mode."""
+    from dashboard import app
+    app.config['TESTING'] = True
+    return app
+
+
+@pytest.fixture
+def client(app):
+    """Provide a Flask test client."""
+    return app.test_client()
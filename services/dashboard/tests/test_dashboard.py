@@ -0,0 +1,86 @@
+"""Tests for Dashboard calls to the other services."""
+import pytest
+import requests
+from unittest.mock import Mock, patch
+
+import dashboard
+from request_context import set_deadline
+
+
+@pytest.fixture
+def requests_get():
+    """Patch requests.get with a 200 response."""
+    response = Mock(status_code=200)
+    response.elapsed.total_seconds.return_value = 0.01
+    response.json.return_value = {'status': 'ready'}
+    with patch.object(dashboard.requests, 'get', return_value=response) as get:
+        yield get
+
+
+class TestGetService:
+    """Deadline propagation in get_service."""
+
+    def call(self, app, headers=None):
+        """Run get_service as part of a request with the given headers."""
+        with app.test_request_context('/api/system-info', headers=headers or {}):
+            app.preprocess_request()
+            return dashboard.get_service('http://worker-service:8081/status')
+
+    def test_without_deadline_uses_service_timeout(self, app, requests_get):
+        """Requests with no budget call out with SERVICE_TIMEOUT."""
+        self.call(app)
+
+        kwargs = requests_get.call_args.kwargs
+        assert kwargs['timeout'] == dashboard.SERVICE_TIMEOUT
+        assert float(kwargs['headers']['X-Request-Timeout']) == pytest.approx(dashboard.SERVICE_TIMEOUT)
+
+    def test_timeout_is_capped_by_the_remaining_budget(self, app, requests_get):
+        """A budget shorter than SERVICE_TIMEOUT caps the call's timeout."""
+        self.call(app, {'X-Request-Timeout': '0.5'})
+
+        timeout = requests_get.call_args.kwargs['timeout']
+        assert 0.4 < timeout <= 0.5
+
+    def test_sends_deadline_and_trace_headers(self, app, requests_get):
+        """The downstream call carries the trace ID and its own deadline."""
+        with patch('request_context.time.time', return_value=1000.0):
+            self.call(app, {'X-Request-Timeout': '0.5', 'X-Trace-ID': 'trace-1'})
+
+        kwargs = requests_get.call_args.kwargs
+        headers = kwargs['headers']
+        assert headers['X-Trace-ID'] == 'trace-1'
+        assert float(headers['X-Request-Timeout']) == pytest.approx(kwargs['timeout'], abs=0.001)
+        assert float(headers['X-Request-Deadline']) == pytest.approx(1000.0 + kwargs['timeout'], abs=0.001)
+
+    def test_passed_deadline_raises_without_calling(self, app, requests_get):
+        """Once the budget is spent the call is not made at all."""
+        with app.test_request_context('/api/system-info'):
+            app.preprocess_request()
+            set_deadline(0)
+            with pytest.raises(requests.Timeout):
+                dashboard.get_service('http://worker-service:8081/status')
+
+        requests_get.assert_not_called()
+
+    def test_passed_deadline_reports_service_unreachable(self, app, requests_get):
+        """check_service_health reports the skipped call as unreachable."""
+        with app.test_request_context('/api/health-check'):
+            app.preprocess_request()
+            set_deadline(0)
+            result = dashboard.check_service_health('Worker Service', 'http://worker-service:8081/health/ready')
+
+        assert result['status'] == 'unreachable'
+        requests_get.assert_not_called()
+
+
+class TestHealthCheck:
+    """Health check endpoint."""
+
+    def test_reports_healthy_services(self, client, requests_get):
+        """All services answering 200 make the system healthy."""
+        response = client.get('/api/health-check', headers={'X-Request-Timeout': '2'})
+
+        assert response.status_code == 200
+        assert response.get_json()['system_status'] == 'healthy'
+        for call in requests_get.call_args_list:
+            assert call.kwargs['timeout'] <= 2
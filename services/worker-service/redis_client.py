@@ -1,24 +1,1521 @@
 """Redis Client with Connection Pool and Error Handling.
 
 This module provides a robust Redis client with:
-- Connection pooling for better performance
+- Connection pooling for better performance, with checkout and pool metrics
 - Automatic reconnection on failures
 - Circuit breaker pattern for resilience
 - Comprehensive error handling
-- Health checks
+- Background health checks, so requests never wait on a PING
+- Multi-key commands and pipelines so batches cost one round trip
+- Opt-in local read cache kept consistent by keyspace notifications
+- Typed accessors, and compact binary values (msgpack, zlib) for structured data
+- Per-command latency histograms and a client-side slow-command log
+- Optional read replicas (static list or Sentinel discovery) for read-only commands
+- Connection pre-warming and Lua script preloading at process start
+- Pools sized from the process's thread count, with idle connections reaped
+- Lazy, per-process connection setup, safe to create before a gunicorn fork
+- Client-side sharding over several nodes by consistent hashing
+- Per-request deadlines that cap socket timeouts and retries
+- Named Lua scripts, run via EVALSHA and reloaded on NOSCRIPT
+- Bulkheads: separate pools per workload class, so one cannot starve another
 """
+import bisect
+import hashlib
+import json
 import logging
+import os
+import random
+import re
+import threading
 import time
-from typing import Optional, Any
+import weakref
+import zlib
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import partial
+from queue import Empty, LifoQueue
+from typing import Optional, Any, Callable, Iterator
 import redis
-from redis.connection import ConnectionPool
-from redis.exceptions import ConnectionError, TimeoutError, ResponseError
+from redis.client import NEVER_DECODE, Pipeline
+from redis.connection import BlockingConnectionPool
+from prometheus_client import Counter, Gauge, Histogram
+from redis.backoff import NoBackoff
+from redis.exceptions import ConnectionError, NoScriptError, TimeoutError, ResponseError
+from redis.retry import Retry
+from redis.sentinel import Sentinel
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
 
 logger = logging.getLogger(__name__)
 
+# Circuit breaker metrics, labelled by Redis host:port
+CIRCUIT_STATE = Gauge(
+    'redis_client_circuit_state',
+    'Redis circuit breaker state (0=closed, 1=open, 2=half_open)',
+    ['target']
+)
+
+CIRCUIT_TRANSITIONS = Counter(
+    'redis_client_circuit_transitions_total',
+    'Redis circuit breaker state transitions',
+    ['target', 'from_state', 'to_state']
+)
+
+# Command latency measured by the client (pool wait, network and server time)
+COMMAND_DURATION = Histogram(
+    'redis_client_command_duration_seconds',
+    'Redis command latency seen by the client',
+    ['target', 'command'],
+    buckets=(0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0)
+)
+
+# Connection pool metrics, labelled by Redis host:port
+POOL_CHECKOUT_WAIT = Histogram(
+    'redis_client_pool_checkout_wait_seconds',
+    'Time spent waiting for a free Redis pool connection',
+    ['target'],
+    buckets=(0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+)
+
+POOL_IDLE_AGE = Histogram(
+    'redis_client_pool_connection_idle_seconds',
+    'Time a reused Redis pool connection sat idle before checkout',
+    ['target'],
+    buckets=(0.001, 0.01, 0.1, 1.0, 5.0, 30.0, 60.0, 300.0, 900.0)
+)
+
+POOL_CONNECTIONS_CREATED = Counter(
+    'redis_client_pool_connections_created_total',
+    'Redis pool connections created',
+    ['target']
+)
+
+POOL_EXHAUSTED = Counter(
+    'redis_client_pool_exhausted_total',
+    'Redis pool checkouts that timed out with every connection in use',
+    ['target']
+)
+
+POOL_CONNECTIONS = Gauge(
+    'redis_client_pool_connections',
+    'Redis pool connections (in_use, idle, max)',
+    ['target', 'state']
+)
+
+POOL_SATURATION = Gauge(
+    'redis_client_pool_saturation',
+    'Fraction of the Redis pool\'s connections in use (1 = every checkout waits)',
+    ['target']
+)
+
+DEADLINE_EXCEEDED = Counter(
+    'redis_client_deadline_exceeded_total',
+    'Redis commands abandoned because the request deadline passed',
+    ['target']
+)
+POOL_CONNECTIONS_REAPED = Counter(
+    'redis_client_pool_connections_reaped_total',
+    'Idle Redis connections closed by the reaper',
+    ['target']
+)
+POOL_WARMUP_DURATION = Gauge(
+    'redis_client_pool_warmup_duration_seconds',
+    'Time the last connection warm-up took in this process',
+    ['target']
+)
+
+# Read cache metrics, labelled by Redis host:port
+READ_CACHE_REQUESTS = Counter(
+    'redis_client_read_cache_requests_total',
+    'Redis read cache lookups',
+    ['target', 'result']
+)
+
+READ_CACHE_EVICTIONS = Counter(
+    'redis_client_read_cache_evictions_total',
+    'Redis read cache evictions (size, expired, invalidated)',
+    ['target', 'reason']
+)
+
+READ_CACHE_ENTRIES = Gauge(
+    'redis_client_read_cache_entries',
+    'Entries held in the Redis read cache',
+    ['target']
+)
+
+
+class RedisPipeline:
+    """Commands queued for one round trip through RedisClient.pipeline().
+
+    Commands are recorded locally and sent when the ``with`` block exits;
+    ``results`` then holds one reply per command, or None if the batch
+    could not be executed.
+    """
+
+    def __init__(self, transaction: bool = False):
+        """Initialize an empty batch.
+
+        Args:
+            transaction: Wrap the commands in MULTI/EXEC
+        """
+        self.transaction = transaction
+        self.commands = []
+        self.results: Optional[list] = None
+
+    def __getattr__(self, name: str):
+        if name.startswith('_') or not callable(getattr(redis.client.Pipeline, name, None)):
+            raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'")
+
+        def queue(*args, **kwargs):
+            self.commands.append((name, args, kwargs))
+            return self
+        return queue
+
+    def __len__(self) -> int:
+        return len(self.commands)
+
+    def keys(self) -> list:
+        """Keys named by the queued commands (first argument, or MSET's mapping)."""
+        keys = []
+        for name, args, _ in self.commands:
+            if name == 'mset' and args:
+                keys.extend(args[0])
+            elif args and isinstance(args[0], str):
+                keys.append(args[0])
+        return keys
+
+
+class PoolExhaustedError(ConnectionError):
+    """No pool connection became free within the checkout timeout."""
+
+
+class DeadlineExceededError(TimeoutError):
+    """The request's deadline passed before Redis answered.
+
+    Says nothing about Redis itself, so it is not counted by circuit
+    breakers.
+    """
+
+
+class _CheckoutQueue(LifoQueue):
+    """LifoQueue of pool slots that reports checkouts to its pool."""
+
+    def __init__(self, pool, maxsize: int):
+        super().__init__(maxsize)
+        self._pool = pool
+
+    def get(self, block: bool = True, timeout: Optional[float] = None):
+        start = time.perf_counter()
+        try:
+            connection = super().get(block, timeout)
+        except Empty:
+            self._pool._on_exhausted(time.perf_counter() - start)
+            raise PoolExhaustedError(
+                f"No Redis connection available within {timeout}s "
+                f"({self._pool.max_connections} in use)"
+            )
+        self._pool._on_checkout(connection, time.perf_counter() - start)
+        return connection
+
+
+class InstrumentedConnectionPool(BlockingConnectionPool):
+    """BlockingConnectionPool that exports checkout and connection metrics.
+
+    Threads wait up to ``timeout`` seconds for a free connection and then
+    get PoolExhaustedError. Checkout wait, the idle age of reused
+    connections, connection creation and exhaustion are recorded per
+    target, and stats() reports usage without reading private lists.
+    """
+
+    def __init__(self, target: str = 'redis', **kwargs):
+        """Initialize instrumented pool.
+
+        Args:
+            target: Redis host:port (with "/bulkhead" for bulkhead pools)
+                used in metric labels
+            **kwargs: BlockingConnectionPool arguments (max_connections,
+                timeout, connection settings)
+        """
+        self.target = target
+        self._checkout_wait = POOL_CHECKOUT_WAIT.labels(target=target)
+        self._idle_age = POOL_IDLE_AGE.labels(target=target)
+        self._created = POOL_CONNECTIONS_CREATED.labels(target=target)
+        self._reaped = POOL_CONNECTIONS_REAPED.labels(target=target)
+        self._exhausted = POOL_EXHAUSTED.labels(target=target)
+        self._in_use_gauge = POOL_CONNECTIONS.labels(target=target, state='in_use')
+        self._idle_gauge = POOL_CONNECTIONS.labels(target=target, state='idle')
+        self._saturation = POOL_SATURATION.labels(target=target)
+        super().__init__(queue_class=partial(_CheckoutQueue, self), **kwargs)
+        POOL_CONNECTIONS.labels(target=target, state='max').set(self.max_connections)
+
+    def reset(self) -> None:
+        # Also runs in a forked child; the parent's checkouts are not ours
+        self._stats_lock = threading.Lock()
+        self._in_use = 0
+        super().reset()
+
+    def make_connection(self):
+        self._created.inc()
+        return super().make_connection()
+
+    def release(self, connection) -> None:
+        connection._pool_released_at = time.monotonic()
+        super().release(connection)
+        with self._stats_lock:
+            self._in_use = max(0, self._in_use - 1)
+            self._update_gauges()
+
+    def _on_checkout(self, connection, wait: float) -> None:
+        """Record a slot taken from the queue (connection is None if not yet created)."""
+        self._checkout_wait.observe(wait)
+        released_at = getattr(connection, '_pool_released_at', None)
+        if released_at is not None:
+            self._idle_age.observe(time.monotonic() - released_at)
+        with self._stats_lock:
+            self._in_use += 1
+            self._update_gauges()
+
+    def _on_exhausted(self, wait: float) -> None:
+        """Record a checkout that timed out."""
+        self._checkout_wait.observe(wait)
+        self._exhausted.inc()
+        logger.warning(f"Redis connection pool for {self.target} exhausted ({self.max_connections} in use)")
+
+    def _update_gauges(self) -> None:
+        """Refresh the connection gauges (stats lock held)."""
+        self._in_use_gauge.set(self._in_use)
+        self._idle_gauge.set(max(0, len(self._connections) - self._in_use))
+        self._saturation.set(self._in_use / self.max_connections)
+
+    def warm(self, count: int) -> int:
+        """Open up to ``count`` connections and return them to the pool idle.
+
+        Connections are checked out together, so each one is a separate
+        socket that has completed connect and AUTH/SELECT.
+
+        Returns:
+            int: Connections held at once (capped at max_connections)
+        """
+        connections = []
+        try:
+            for _ in range(min(count, self.max_connections)):
+                connections.append(self.get_connection('PING'))
+        finally:
+            for connection in connections:
+                self.release(connection)
+        return len(connections)
+
+    def reap(self, idle_timeout: float, keep: int = 0) -> int:
+        """Close connections that sat idle in the pool longer than ``idle_timeout``.
+
+        Their slots go back to the queue empty, so a later burst opens new
+        connections up to max_connections again. The ``keep`` most recently
+        used connections stay open, e.g. to hold on to warm-up.
+
+        Args:
+            idle_timeout: Seconds a connection may stay unused
+            keep: Connections to leave open however long they were idle
+
+        Returns:
+            int: Connections closed
+        """
+        cutoff = time.monotonic() - idle_timeout
+        reaped = []
+        with self.pool.mutex:
+            # LIFO: the bottom of the queue has been idle longest
+            slots = self.pool.queue
+            open_count = len(self._connections)
+            for index, connection in enumerate(slots):
+                if open_count - len(reaped) <= keep:
+                    break
+                if connection is not None and getattr(connection, '_pool_released_at', cutoff) < cutoff:
+                    slots[index] = None
+                    reaped.append(connection)
+
+        for connection in reaped:
+            try:
+                self._connections.remove(connection)
+            except ValueError:
+                pass
+            connection.disconnect()
+        if reaped:
+            self._reaped.inc(len(reaped))
+            with self._stats_lock:
+                self._update_gauges()
+            logger.debug(f"Closed {len(reaped)} idle Redis connections to {self.target}")
+        return len(reaped)
+
+    def stats(self) -> dict:
+        """Current pool usage.
+
+        Returns:
+            dict: available (idle connections), in_use, created and max_connections
+        """
+        with self._stats_lock:
+            in_use = self._in_use
+            created = len(self._connections)
+        return {
+            'available': max(0, created - in_use),
+            'in_use': in_use,
+            'created': created,
+            'max_connections': self.max_connections
+        }
+
+
+_KEY_SEGMENT = re.compile(r'^[A-Za-z_][A-Za-z_-]*$')
+
+
+def key_pattern(key: Any) -> Optional[str]:
+    """Reduce a key to its pattern, e.g. ``rate_limit:10.0.0.1`` -> ``rate_limit:*``.
+
+    Segments containing anything but letters, ``_`` and ``-`` (IDs, IPs,
+    timestamps) are replaced with ``*``.
+    """
+    if key is None:
+        return None
+    if isinstance(key, bytes):
+        key = key.decode('utf-8', 'replace')
+    return ':'.join(
+        segment if _KEY_SEGMENT.match(segment) else '*'
+        for segment in str(key).split(':')
+    )
+
+
+def _command_key(args: tuple) -> Any:
+    """First key of a command's arguments, if any."""
+    if str(args[0]).upper() in ('EVAL', 'EVALSHA'):
+        return args[3] if len(args) > 3 and int(args[2]) > 0 else None
+    return args[1] if len(args) > 1 else None
+
+
+class SlowCommandLog:
+    """Ring buffer of recent Redis commands slower than a threshold.
+
+    Like Redis' SLOWLOG, but measured by the client, so durations include
+    pool wait and network time. Keys are stored as patterns.
+    """
+
+    def __init__(self, threshold_ms: float = 10.0, size: int = 128):
+        """Initialize slow-command log.
+
+        Args:
+            threshold_ms: Commands at least this slow are logged
+            size: Entries kept; the oldest are dropped first
+        """
+        self.threshold_ms = threshold_ms
+        self.threshold_ns = int(threshold_ms * 1_000_000)
+        self._entries = deque(maxlen=size)
+        self._lock = threading.Lock()
+
+    def record(self, command: str, key: Any, duration_ns: int, trace_id: Optional[str] = None) -> None:
+        """Log a command that reached the threshold."""
+        entry = {
+            'command': command,
+            'key': key_pattern(key),
+            'duration_ms': round(duration_ns / 1_000_000, 3),
+            'trace_id': trace_id,
+            'timestamp': time.time()
+        }
+        with self._lock:
+            self._entries.append(entry)
+
+    def entries(self, limit: Optional[int] = None) -> list:
+        """Logged commands, slowest first.
+
+        Args:
+            limit: Maximum entries to return (all if None)
+
+        Returns:
+            list: Entries with command, key, duration_ms, trace_id and timestamp
+        """
+        with self._lock:
+            entries = sorted(self._entries, key=lambda entry: entry['duration_ms'], reverse=True)
+        return entries[:limit] if limit is not None else entries
+
+    def clear(self) -> None:
+        """Drop all entries."""
+        with self._lock:
+            self._entries.clear()
+
+
+class CommandTimer:
+    """Feeds command durations to COMMAND_DURATION and a SlowCommandLog."""
+
+    def __init__(
+        self,
+        target: str,
+        slow_log: Optional[SlowCommandLog] = None,
+        trace_id_getter: Optional[Callable[[], Optional[str]]] = None
+    ):
+        """Initialize command timer.
+
+        Args:
+            target: Redis host:port used in metric labels
+            slow_log: Log receiving commands above its threshold
+            trace_id_getter: Returns the current request's trace ID, if any
+        """
+        self.target = target
+        self.slow_log = slow_log
+        self.trace_id_getter = trace_id_getter
+        self._histograms = {}
+
+    def record(self, args: tuple, duration_ns: int) -> None:
+        """Record one command (or pipeline) given its arguments."""
+        command = str(args[0]).upper() if args else 'UNKNOWN'
+        histogram = self._histograms.get(command)
+        if histogram is None:
+            histogram = self._histograms[command] = COMMAND_DURATION.labels(target=self.target, command=command)
+        histogram.observe(duration_ns / 1_000_000_000)
+
+        if self.slow_log is not None and duration_ns >= self.slow_log.threshold_ns:
+            trace_id = None
+            if self.trace_id_getter is not None:
+                try:
+                    trace_id = self.trace_id_getter()
+                except Exception:
+                    trace_id = None
+            self.slow_log.record(command, _command_key(args) if args else None, duration_ns, trace_id)
+
+
+_NO_RETRY = Retry(NoBackoff(), 0)
+
+# Set while commands must not be cut short by the request deadline; see ignore_deadline()
+_IGNORE_DEADLINE: ContextVar[bool] = ContextVar('redis_ignore_deadline', default=False)
+
+
+@contextmanager
+def ignore_deadline() -> Iterator[None]:
+    """Send the Redis commands issued inside the block without the request deadline cap.
+
+    For commands whose outcome must not depend on the caller's deadline
+    headers, such as rate limit checks; they keep the pool's socket and
+    checkout timeouts.
+    """
+    token = _IGNORE_DEADLINE.set(True)
+    try:
+        yield
+    finally:
+        _IGNORE_DEADLINE.reset(token)
+
+
+def _deadline_from(budget_getter: Optional[Callable[[], Optional[float]]], target: str) -> Optional[float]:
+    """Monotonic deadline of the current request, or None without one (or inside ignore_deadline()).
+
+    Raises:
+        DeadlineExceededError: If the deadline already passed
+    """
+    if budget_getter is None or _IGNORE_DEADLINE.get():
+        return None
+    try:
+        remaining = budget_getter()
+    except Exception:
+        return None
+    if remaining is None:
+        return None
+    if remaining <= 0:
+        DEADLINE_EXCEEDED.labels(target=target).inc()
+        raise DeadlineExceededError("Request deadline passed before the Redis command was sent")
+    return time.monotonic() + remaining
+
+
+def _fits_deadline(connection_kwargs: dict, deadline: float) -> bool:
+    """Whether a pool's socket timeout, retries included, ends before the deadline.
+
+    redis-py gives connections built with retry_on_timeout or
+    retry_on_error one retry; a custom ``retry`` is never assumed to fit.
+    """
+    socket_timeout = connection_kwargs.get('socket_timeout')
+    if socket_timeout is None or connection_kwargs.get('retry') is not None:
+        return False
+    attempts = 2 if connection_kwargs.get('retry_on_timeout') or connection_kwargs.get('retry_on_error') else 1
+    return socket_timeout * attempts <= deadline - time.monotonic()
+
+
+def _wait_for_reply(connection, deadline: float, target: str) -> None:
+    """Wait until a reply starts arriving on ``connection`` or the deadline passes.
+
+    Raises:
+        DeadlineExceededError: If no reply came in time; the connection is
+            dropped so the late reply cannot be read by the next command
+    """
+    if connection.can_read(timeout=max(deadline - time.monotonic(), 0)):
+        return
+    connection.disconnect()
+    DEADLINE_EXCEEDED.labels(target=target).inc()
+    raise DeadlineExceededError("Request deadline passed waiting for Redis")
+
+
+class TimedPipeline(Pipeline):
+    """Pipeline that times each execute() as one PIPELINE command."""
+
+    def __init__(self, timer: CommandTimer, *args, budget_getter: Optional[Callable] = None, **kwargs):
+        self._deadline = None
+        self._retry = None
+        super().__init__(*args, **kwargs)
+        self._timer = timer
+        self._budget_getter = budget_getter
+
+    def execute(self, raise_on_error: bool = True) -> list:
+        first_key = None
+        if self.command_stack:
+            first_args = self.command_stack[0][0]
+            first_key = _command_key(first_args) if first_args else None
+        start = time.perf_counter_ns()
+        try:
+            deadline = _deadline_from(self._budget_getter, self._timer.target) if self.command_stack else None
+            if deadline is None or _fits_deadline(self.connection_pool.connection_kwargs, deadline):
+                return super().execute(raise_on_error)
+            return self._execute_before(deadline, raise_on_error)
+        finally:
+            self._timer.record(('PIPELINE', first_key), time.perf_counter_ns() - start)
+
+    def _execute_before(self, deadline: float, raise_on_error: bool) -> list:
+        """Pipeline.execute() in one attempt whose wait for replies ends at the deadline."""
+        if self.connection is None:
+            self.connection = self.connection_pool.get_connection('MULTI', self.shard_hint)
+        self._retry, self.connection.retry = self.connection.retry, _NO_RETRY
+        self._deadline = deadline
+        try:
+            return super().execute(raise_on_error)
+        finally:
+            self.reset()
+
+    def parse_response(self, connection, command_name, **options):
+        if self._deadline is not None:
+            _wait_for_reply(connection, self._deadline, self._timer.target)
+        return super().parse_response(connection, command_name, **options)
+
+    def reset(self) -> None:
+        # The connection gets its retries back before it returns to the pool
+        self._deadline = None
+        if self._retry is not None:
+            if self.connection is not None:
+                self.connection.retry = self._retry
+            self._retry = None
+        super().reset()
+
+
+class TimedRedis(redis.Redis):
+    """redis.Redis that times every command and pipeline with perf_counter_ns.
+
+    Scripts and other helpers built on execute_command are covered too.
+    With a ``budget_getter`` (seconds left for the current request, or
+    None) commands and pipelines never outlive the request's deadline.
+    """
+
+    def __init__(
+        self,
+        *args,
+        timer: Optional[CommandTimer] = None,
+        budget_getter: Optional[Callable[[], Optional[float]]] = None,
+        **kwargs
+    ):
+        super().__init__(*args, **kwargs)
+        self._timer = timer or CommandTimer('redis')
+        self._budget_getter = budget_getter
+
+    def execute_command(self, *args, **options):
+        start = time.perf_counter_ns()
+        try:
+            deadline = _deadline_from(self._budget_getter, self._timer.target)
+            if deadline is None or _fits_deadline(self.connection_pool.connection_kwargs, deadline):
+                return super().execute_command(*args, **options)
+            return self._execute_before(deadline, *args, **options)
+        finally:
+            self._timer.record(args, time.perf_counter_ns() - start)
+
+    def _execute_before(self, deadline: float, *args, **options):
+        """redis.Redis.execute_command() in one attempt whose wait for the reply ends at the deadline."""
+        pool = self.connection_pool
+        command_name = args[0]
+        conn = self.connection or pool.get_connection(command_name, **options)
+        try:
+            conn.send_command(*args)
+            _wait_for_reply(conn, deadline, self._timer.target)
+            return self.parse_response(conn, command_name, **options)
+        except (ConnectionError, TimeoutError):
+            conn.disconnect()
+            raise
+        finally:
+            if not self.connection:
+                pool.release(conn)
+
+    def pipeline(self, transaction: bool = True, shard_hint: Optional[str] = None) -> TimedPipeline:
+        return TimedPipeline(
+            self._timer, self.connection_pool, self.response_callbacks, transaction, shard_hint,
+            budget_getter=self._budget_getter
+        )
+
+
+class ValueCodec:
+    """Binary encoding of structured values stored through RedisClient.
+
+    Values are serialized with msgpack (JSON if msgpack is not installed)
+    and zlib-compressed when the serialized form is larger than
+    ``compress_threshold`` bytes and compression saves space. A one-byte
+    header records how a value was written, so any configuration can read
+    it back (values written with msgpack need msgpack to decode).
+    """
+
+    JSON = 0x01
+    MSGPACK = 0x02
+    ZLIB = 0x80
+
+    def __init__(self, compress_threshold: Optional[int] = 1024, compress_level: int = 6, use_msgpack: bool = True):
+        """Initialize value codec.
+
+        Args:
+            compress_threshold: Serialized size in bytes above which values are
+                compressed (None disables compression)
+            compress_level: zlib compression level
+            use_msgpack: Prefer msgpack over JSON when it is installed
+        """
+        self.compress_threshold = compress_threshold
+        self.compress_level = compress_level
+        self.format = self.MSGPACK if use_msgpack and msgpack is not None else self.JSON
+
+    def encode(self, value: Any) -> bytes:
+        """Serialize a value.
+
+        Raises:
+            TypeError: If the value cannot be serialized
+        """
+        if self.format == self.MSGPACK:
+            payload = msgpack.packb(value, use_bin_type=True)
+        else:
+            payload = json.dumps(value, separators=(',', ':')).encode()
+
+        header = self.format
+        if self.compress_threshold is not None and len(payload) > self.compress_threshold:
+            compressed = zlib.compress(payload, self.compress_level)
+            if len(compressed) < len(payload):
+                payload, header = compressed, header | self.ZLIB
+        return bytes([header]) + payload
+
+    def decode(self, data: bytes) -> Any:
+        """Deserialize a value written by encode().
+
+        Raises:
+            ValueError: If the data was not written by a ValueCodec
+        """
+        if not data:
+            raise ValueError("empty value")
+        header, payload = data[0], data[1:]
+        if header & self.ZLIB:
+            try:
+                payload = zlib.decompress(payload)
+            except zlib.error as e:
+                raise ValueError(f"corrupt compressed value: {e}") from e
+
+        value_format = header & ~self.ZLIB
+        if value_format == self.MSGPACK:
+            if msgpack is None:
+                raise ValueError("value was written with msgpack, which is not installed")
+            return msgpack.unpackb(payload, raw=False)
+        if value_format == self.JSON:
+            return json.loads(payload)
+        raise ValueError(f"unknown value encoding 0x{header:02x}")
+
+
+class CircuitBreaker:
+    """Closed/open/half-open circuit breaker with exponential backoff.
+
+    - closed: calls go through; ``failure_threshold`` consecutive failures
+      open the breaker
+    - open: calls are refused without any I/O until the backoff elapses
+    - half_open: a single probe is let through; success closes the
+      breaker, failure re-opens it with a doubled, jittered backoff
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    STATE_VALUES = {CLOSED: 0, OPEN: 1, HALF_OPEN: 2}
+
+    def __init__(
+        self,
+        name: str = 'redis',
+        failure_threshold: int = 3,
+        backoff_base: float = 0.5,
+        backoff_max: float = 30.0,
+        jitter: float = 0.5
+    ):
+        """Initialize circuit breaker.
+
+        Args:
+            name: Name used in logs and metric labels
+            failure_threshold: Consecutive failures that open the breaker
+            backoff_base: Seconds the breaker stays open the first time
+            backoff_max: Upper bound on the open time
+            jitter: Fraction of the backoff randomized so clients do not
+                probe in lockstep
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.jitter = jitter
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opens = 0
+        self._open_until = 0.0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+        CIRCUIT_STATE.labels(target=name).set(0)
+
+    @property
+    def state(self) -> str:
+        """Current state; an open breaker whose backoff elapsed reads half_open."""
+        with self._lock:
+            if self._state == self.OPEN and time.monotonic() >= self._open_until:
+                return self.HALF_OPEN
+            return self._state
+
+    def retry_after(self) -> float:
+        """Seconds until an open breaker lets a probe through (0 otherwise)."""
+        with self._lock:
+            if self._state != self.OPEN:
+                return 0.0
+            return max(0.0, self._open_until - time.monotonic())
+
+    def allow_request(self) -> bool:
+        """Check whether a call may go to the server.
+
+        In the half-open state only the first caller is allowed and must
+        report back with record_success() or record_failure().
+
+        Returns:
+            bool: True if the call may proceed
+        """
+        with self._lock:
+            if self._state == self.CLOSED:
+                return True
+            if self._state == self.OPEN:
+                if time.monotonic() < self._open_until:
+                    return False
+                self._transition(self.HALF_OPEN)
+            if self._probe_in_flight:
+                return False
+            self._probe_in_flight = True
+            return True
+
+    def record_success(self) -> None:
+        """Record a successful call and close the breaker."""
+        with self._lock:
+            self._failures = 0
+            self._opens = 0
+            self._probe_in_flight = False
+            if self._state != self.CLOSED:
+                self._transition(self.CLOSED)
+
+    def release_probe(self) -> None:
+        """Report a call that says nothing about the server's health.
+
+        Frees the half-open probe slot without changing state, so the next
+        caller may probe; use it when a call gave up before reaching the
+        server (e.g. pool exhausted or request deadline passed).
+        """
+        with self._lock:
+            self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        """Record a failed call, opening the breaker if needed."""
+        with self._lock:
+            self._probe_in_flight = False
+            self._failures += 1
+            if self._state == self.HALF_OPEN or (
+                    self._state == self.CLOSED and self._failures >= self.failure_threshold):
+                backoff = min(self.backoff_max, self.backoff_base * 2 ** self._opens)
+                self._opens += 1
+                self._open_until = time.monotonic() + backoff * (1 - self.jitter * random.random())
+                self._transition(self.OPEN)
+
+    def _transition(self, state: str) -> None:
+        """Move to a new state (lock held)."""
+        CIRCUIT_TRANSITIONS.labels(target=self.name, from_state=self._state, to_state=state).inc()
+        CIRCUIT_STATE.labels(target=self.name).set(self.STATE_VALUES[state])
+        logger.warning(f"Redis circuit breaker for {self.name}: {self._state} -> {state}")
+        self._state = state
+
+
+class HealthMonitor:
+    """Background thread that keeps a RedisClient's connection state fresh.
+
+    While Redis is healthy it pings every ``interval`` seconds and closes
+    pool connections idle past the client's ``idle_timeout``. After a
+    failure (its own or one reported by a command through ``wake()``) it
+    probes as soon as the client's circuit breaker allows. Requests only
+    ever read the resulting state.
+
+    The thread holds a weak reference to its client and exits once the
+    client is closed or garbage collected. Threads do not survive fork();
+    the client starts a new one on first use in the child.
+    """
+
+    # Delay before re-probing a client that failed but whose breaker is
+    # still closed, so a refused connection does not busy-loop
+    MIN_PROBE_DELAY = 0.1
+
+    def __init__(self, client, interval: float):
+        """Initialize health monitor.
+
+        Args:
+            client: RedisClient to monitor
+            interval: Seconds between PINGs while healthy
+        """
+        self.interval = interval
+        self._client_ref = weakref.ref(client)
+        self._wake = threading.Event()
+        self._stopped = False
+        self._thread = None
+        self._pid = None
+        _MONITORS.add(self)
+
+    def start(self) -> None:
+        """Start the monitor thread in the current process."""
+        self._stopped = False
+        self._pid = os.getpid()
+        self._thread = threading.Thread(target=self._run, name='redis-health-monitor', daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the monitor thread."""
+        self._stopped = True
+        self._wake.set()
+
+    def wake(self) -> None:
+        """Probe as soon as the circuit breaker allows."""
+        self._wake.set()
+
+    def is_alive(self) -> bool:
+        """Check whether the monitor thread runs in this process."""
+        return self._pid == os.getpid() and self._thread is not None and self._thread.is_alive()
+
+    def _after_fork_in_child(self) -> None:
+        """Replace the event that may not have survived fork()."""
+        self._wake = threading.Event()
+
+    def _next_delay(self, client) -> float:
+        """Seconds to sleep before the next check."""
+        if client._is_connected:
+            return self.interval
+        return max(client._breaker.retry_after(), self.MIN_PROBE_DELAY)
+
+    def _run(self) -> None:
+        """Monitor loop."""
+        while not self._stopped:
+            client = self._client_ref()
+            if client is None:
+                return
+            delay = self._next_delay(client)
+            del client
+
+            self._wake.wait(delay)
+            self._wake.clear()
+
+            client = self._client_ref()
+            if self._stopped or client is None:
+                return
+            try:
+                if client._check_health():
+                    client._reap_idle()
+            except Exception as e:
+                logger.error(f"Redis health monitor error: {e}")
+            del client
+
+
+class ConnectionWarmer:
+    """Background thread that warms a RedisClient before it takes traffic.
+
+    Opens ``connections`` pool connections per process (and per replica)
+    and loads ``scripts`` into the server's script cache, so the first
+    requests neither connect nor hit NOSCRIPT. It retries while Redis is
+    unreachable and gives up after ``timeout`` seconds, leaving readiness
+    to the connection check. The client starts it in every process that
+    uses it, as each process has its own pools.
+    """
+
+    RETRY_DELAY = 0.5
+
+    def __init__(self, client, connections: int, scripts: tuple = (), timeout: float = 10.0):
+        """Initialize connection warmer.
+
+        Args:
+            client: RedisClient to warm
+            connections: Connections to open per pool
+            scripts: Lua sources to SCRIPT LOAD on the primary
+            timeout: Seconds to keep retrying before giving up
+        """
+        self.connections = connections
+        self.scripts = tuple(scripts)
+        self.timeout = timeout
+        self._client_ref = weakref.ref(client)
+        self._done = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        self._pid = None
+        _MONITORS.add(self)
+
+    def start(self) -> None:
+        """Start warming in the current process."""
+        self._done.clear()
+        self._stop.clear()
+        self._pid = os.getpid()
+        self._thread = threading.Thread(target=self._run, name='redis-connection-warmer', daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop retrying."""
+        self._stop.set()
+
+    def is_done(self) -> bool:
+        """Check whether warm-up finished (or gave up) in this process."""
+        return self._pid == os.getpid() and self._done.is_set()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until warm-up finishes; returns is_done()."""
+        self._done.wait(timeout)
+        return self.is_done()
+
+    def _after_fork_in_child(self) -> None:
+        """Replace the events that may not have survived fork()."""
+        self._done = threading.Event()
+        self._stop = threading.Event()
+
+    def _run(self) -> None:
+        """Warm-up loop."""
+        started = time.monotonic()
+        try:
+            while not self._stop.is_set():
+                client = self._client_ref()
+                if client is None:
+                    return
+                if client._warm_up(self.connections, self.scripts):
+                    POOL_WARMUP_DURATION.labels(target=client._breaker.name).set(time.monotonic() - started)
+                    logger.info(f"Redis warm-up finished in {time.monotonic() - started:.3f}s")
+                    return
+                del client
+                if time.monotonic() - started >= self.timeout:
+                    logger.warning(f"Redis warm-up gave up after {self.timeout}s")
+                    return
+                self._stop.wait(self.RETRY_DELAY)
+        finally:
+            self._done.set()
+
+
+class ReadCache:
+    """Size-bounded LRU cache of GET results with a per-entry TTL.
+
+    Entries are only served while the cache is live, i.e. while a
+    CacheInvalidator is subscribed to keyspace notifications for the
+    cached keys; the TTL bounds staleness should a notification be lost.
+    Misses are filled with the generation read before the Redis call, so
+    a value fetched across a concurrent invalidation is not stored.
+    """
+
+    def __init__(
+        self,
+        target: str,
+        max_entries: int = 1024,
+        ttl: float = 1.0,
+        prefixes: Optional[list] = None
+    ):
+        """Initialize read cache.
+
+        Args:
+            target: Redis host:port used in metric labels
+            max_entries: Entries kept before the least recently used is evicted
+            ttl: Seconds an entry is served without an invalidation
+            prefixes: Only cache keys starting with one of these (all keys if None)
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.prefixes = tuple(prefixes) if prefixes else ()
+        self.generation = 0
+        self._live = False
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+        self._hits = READ_CACHE_REQUESTS.labels(target=target, result='hit')
+        self._misses = READ_CACHE_REQUESTS.labels(target=target, result='miss')
+        self._evicted = {
+            reason: READ_CACHE_EVICTIONS.labels(target=target, reason=reason)
+            for reason in ('size', 'expired', 'invalidated')
+        }
+        self._size = READ_CACHE_ENTRIES.labels(target=target)
+        self._size.set(0)
+
+    def caches(self, key: str) -> bool:
+        """Check whether a key is eligible for caching."""
+        return not self.prefixes or key.startswith(self.prefixes)
+
+    def get(self, key: str) -> tuple:
+        """Look a key up.
+
+        Returns:
+            tuple: (found, value); value may be None for a cached missing key
+        """
+        if not self.caches(key):
+            return False, None
+        with self._lock:
+            entry = self._entries.get(key) if self._live else None
+            if entry is not None:
+                value, expires_at = entry
+                if time.monotonic() < expires_at:
+                    self._entries.move_to_end(key)
+                    self._hits.inc()
+                    return True, value
+                del self._entries[key]
+                self._evicted['expired'].inc()
+                self._size.set(len(self._entries))
+            self._misses.inc()
+            return False, None
+
+    def get_many(self, keys: list) -> dict:
+        """Look several keys up.
+
+        Returns:
+            dict: Cached values of the keys that were found
+        """
+        found = {}
+        for key in keys:
+            hit, value = self.get(key)
+            if hit:
+                found[key] = value
+        return found
+
+    def put(self, key: str, value: Any, generation: int) -> None:
+        """Store a value read from Redis.
+
+        Args:
+            key: Redis key
+            value: Value returned by Redis (None if the key is missing)
+            generation: ``generation`` read before the value was fetched
+        """
+        if not self.caches(key):
+            return
+        with self._lock:
+            if not self._live or generation != self.generation:
+                return
+            self._entries[key] = (value, time.monotonic() + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._evicted['size'].inc()
+            self._size.set(len(self._entries))
+
+    def invalidate(self, key: str) -> None:
+        """Drop a key that changed in Redis."""
+        with self._lock:
+            self.generation += 1
+            if self._entries.pop(key, None) is not None:
+                self._evicted['invalidated'].inc()
+                self._size.set(len(self._entries))
+
+    def set_live(self, live: bool) -> None:
+        """Start or stop serving entries, dropping everything cached so far."""
+        with self._lock:
+            self.generation += 1
+            self._live = live
+            self._evicted['invalidated'].inc(len(self._entries))
+            self._entries.clear()
+            self._size.set(0)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class CacheInvalidator:
+    """Background pub/sub subscriber that evicts changed keys from a ReadCache.
+
+    Subscribes to keyspace notifications (``__keyspace@<db>__:<key>``)
+    for the cached prefixes. The events are a server-wide setting that
+    belongs in the server's configuration; the invalidator only checks
+    them with CONFIG GET and keeps the cache off while they are missing
+    or cannot be read. Notifications sent while the subscription is down
+    are lost, so the cache goes live empty on every (re)subscription and
+    stops serving as soon as the connection fails.
+    """
+
+    # Keyspace events for generic commands, strings, expiry and eviction
+    KEYSPACE_EVENTS = 'Kg$xe'
+    POLL_TIMEOUT = 1.0
+    RETRY_DELAY = 1.0
+
+    def __init__(self, client, cache: ReadCache):
+        """Initialize cache invalidator.
+
+        Args:
+            client: RedisClient whose connection pool is used
+            cache: ReadCache to invalidate
+        """
+        self._client_ref = weakref.ref(client)
+        self._cache = cache
+        self._stop = threading.Event()
+        self._thread = None
+        self._pid = None
+        # Whether missing notifications were already logged
+        self._reported = False
+        _MONITORS.add(self)
+
+    def start(self) -> None:
+        """Start the subscriber thread in the current process."""
+        self._stop.clear()
+        self._pid = os.getpid()
+        self._thread = threading.Thread(target=self._run, name='redis-cache-invalidator', daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the subscriber thread; the cache stops serving entries."""
+        self._stop.set()
+        self._cache.set_live(False)
+
+    def is_alive(self) -> bool:
+        """Check whether the subscriber thread runs in this process."""
+        return self._pid == os.getpid() and self._thread is not None and self._thread.is_alive()
+
+    def _after_fork_in_child(self) -> None:
+        """Replace the locks that did not survive fork(); the cache waits for a new subscription."""
+        self._cache._lock = threading.Lock()
+        self._cache.set_live(False)
+        self._stop = threading.Event()
+
+    def _patterns(self, db: int) -> list:
+        """Keyspace channel patterns covering the cached keys."""
+        return [f"__keyspace@{db}__:{prefix}*" for prefix in self._cache.prefixes or ('',)]
+
+    def _notifications_enabled(self, redis_client) -> bool:
+        """Check that the server publishes the keyspace events the cache depends on."""
+        try:
+            current = redis_client.config_get('notify-keyspace-events').get('notify-keyspace-events', '')
+        except (ConnectionError, TimeoutError, ResponseError) as e:
+            problem = f"could not read notify-keyspace-events ({e})"
+        else:
+            missing = ''.join(
+                flag for flag in self.KEYSPACE_EVENTS
+                if flag not in current and not (flag != 'K' and 'A' in current)
+            )
+            if not missing:
+                self._reported = False
+                return True
+            problem = f"notify-keyspace-events is '{current}', missing '{missing}'"
+
+        log = logger.debug if self._reported else logger.warning
+        log(f"Redis read cache disabled: {problem}; configure the server with '{self.KEYSPACE_EVENTS}'")
+        self._reported = True
+        return False
+
+    def _run(self) -> None:
+        """Subscriber loop, resubscribing after connection failures."""
+        while not self._stop.is_set():
+            client = self._client_ref()
+            if client is None:
+                return
+            connected = client.is_connected()
+            redis_client, db = client._client, client.db
+            del client
+
+            if redis_client is not None and connected and self._notifications_enabled(redis_client):
+                try:
+                    pubsub = redis_client.pubsub()
+                    try:
+                        pubsub.psubscribe(*self._patterns(db))
+                        self._listen(pubsub, len(f"__keyspace@{db}__:"))
+                    finally:
+                        pubsub.close()
+                except Exception as e:
+                    logger.warning(f"Redis read cache invalidation stream lost: {e}")
+                finally:
+                    self._cache.set_live(False)
+            del redis_client
+            self._stop.wait(self.RETRY_DELAY)
+
+    def _listen(self, pubsub, channel_prefix_len: int) -> None:
+        """Apply notifications until stopped or the connection fails."""
+        while not self._stop.is_set():
+            message = pubsub.get_message(timeout=self.POLL_TIMEOUT)
+            if message is None:
+                continue
+            if message['type'] == 'psubscribe':
+                # First subscription, or redis-py resubscribing after a
+                # reconnect: anything cached may have missed notifications
+                self._cache.set_live(True)
+            elif message['type'] == 'pmessage':
+                self._cache.invalidate(message['channel'][channel_prefix_len:])
+
+
+class Replica:
+    """One read replica: its client, circuit breaker and reads in flight."""
+
+    def __init__(self, host: str, port: int, client: redis.Redis, breaker: 'CircuitBreaker'):
+        self.host = host
+        self.port = port
+        self.target = f"{host}:{port}"
+        self.client = client
+        self.breaker = breaker
+        self.outstanding = 0
+
+
+class ReplicaSet:
+    """Read replicas chosen by least outstanding requests.
+
+    Every replica has its own pool and circuit breaker. Replicas whose
+    breaker refuses calls are skipped, and acquire() returns None when no
+    replica can take the read, so the caller falls back to the primary.
+    """
+
+    def __init__(self, replicas: list):
+        """Initialize replica set.
+
+        Args:
+            replicas: Replica instances
+        """
+        self.replicas = replicas
+        self._lock = threading.Lock()
+        self._next = 0
+        _MONITORS.add(self)
+
+    @property
+    def addresses(self) -> list:
+        """(host, port) of every replica."""
+        return [(replica.host, replica.port) for replica in self.replicas]
+
+    def acquire(self) -> Optional[Replica]:
+        """Pick the available replica with the fewest reads in flight.
+
+        Ties rotate so idle replicas share the load. The caller must
+        release() the replica.
+        """
+        with self._lock:
+            count = len(self.replicas)
+            if not count:
+                return None
+            candidates = [self.replicas[(self._next + i) % count] for i in range(count)]
+            self._next = (self._next + 1) % count
+            for replica in sorted(candidates, key=lambda replica: replica.outstanding):
+                if replica.breaker.allow_request():
+                    replica.outstanding += 1
+                    return replica
+        return None
+
+    def release(self, replica: Replica, error: Optional[Exception] = None) -> None:
+        """Return a replica after a read, reporting the outcome to its breaker."""
+        with self._lock:
+            replica.outstanding = max(0, replica.outstanding - 1)
+        if error is None:
+            replica.breaker.record_success()
+        elif isinstance(error, (PoolExhaustedError, DeadlineExceededError)):
+            replica.breaker.release_probe()
+        else:
+            replica.breaker.record_failure()
+
+    def stats(self) -> list:
+        """Pool usage, reads in flight and breaker state of every replica."""
+        return [
+            {
+                'target': replica.target,
+                'outstanding': replica.outstanding,
+                'state': replica.breaker.state,
+                **replica.client.connection_pool.stats()
+            }
+            for replica in self.replicas
+        ]
+
+    def close(self) -> None:
+        """Disconnect every replica pool."""
+        for replica in self.replicas:
+            try:
+                replica.client.connection_pool.disconnect()
+            except Exception as e:
+                logger.error(f"Error closing Redis replica pool {replica.target}: {e}")
+
+    def _after_fork_in_child(self) -> None:
+        """Replace locks and in-flight counts inherited from the parent."""
+        self._lock = threading.Lock()
+        for replica in self.replicas:
+            replica.outstanding = 0
+            replica.breaker._lock = threading.Lock()
+
+
+class ScriptRegistry:
+    """Named Lua scripts, declared once per process.
+
+    A script's SHA1 is computed locally, so registering one never talks
+    to Redis; clients load the sources during warm-up (``preload_scripts``)
+    or on the first NOSCRIPT reply.
+    """
+
+    def __init__(self):
+        """Initialize an empty registry."""
+        self._scripts = {}
+        self._lock = threading.Lock()
+
+    def register(self, name: str, source: str) -> str:
+        """Declare a script under a name.
+
+        Registering the same source again is a no-op.
+
+        Args:
+            name: Name callers pass to RedisClient.run_script()
+            source: Lua source code
+
+        Returns:
+            str: SHA1 of the source
+
+        Raises:
+            ValueError: If the name is taken by a different source
+        """
+        sha = hashlib.sha1(source.encode()).hexdigest()
+        with self._lock:
+            current = self._scripts.get(name)
+            if current is not None and current[1] != sha:
+                raise ValueError(f"Redis script '{name}' is already registered with a different source")
+            self._scripts[name] = (source, sha)
+        return sha
+
+    def get(self, name: str) -> tuple:
+        """(source, sha) of a registered script; KeyError if unknown."""
+        return self._scripts[name]
+
+    def sources(self) -> list:
+        """Sources of every registered script."""
+        return [source for source, _ in self._scripts.values()]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._scripts
+
+    def __len__(self) -> int:
+        return len(self._scripts)
+
+
+# Scripts shared by every RedisClient in the process
+SCRIPTS = ScriptRegistry()
+
+
+def register_script(name: str, source: str) -> str:
+    """Declare a Lua script for RedisClient.run_script(); see ScriptRegistry.register."""
+    return SCRIPTS.register(name, source)
+
+
+def pool_size_for(threads: int, processes: int = 1, replicas: int = 1,
+                  budget: Optional[int] = None, reserve: int = 2) -> int:
+    """Connections one process's pool needs.
+
+    Each request thread holds at most one connection at a time; ``reserve``
+    covers the health check and a pub/sub subscription. With a ``budget``
+    of connections for the whole deployment (e.g. a share of Redis
+    ``maxclients``) the pool is capped at this process's share of it,
+    counting every process of every replica the autoscaler may run.
+
+    Args:
+        threads: Request threads per process
+        processes: Processes per pod (gunicorn workers)
+        replicas: Maximum pods
+        budget: Connections all pods together may open (None for no cap)
+        reserve: Connections on top of one per thread
+
+    Returns:
+        int: max_connections for the pool (at least 1)
+    """
+    size = threads + reserve
+    if budget:
+        share = budget // max(1, processes * replicas)
+        if share < size:
+            logger.warning(
+                f"Redis connection budget {budget} allows {share} per process, "
+                f"fewer than the {size} its {threads} threads may use"
+            )
+        size = min(size, share)
+    return max(1, size)
+
+
+def parse_addresses(value: str, default_port: int = 6379) -> list:
+    """Parse ``"host:port,host:port"`` (port optional) into (host, port) tuples."""
+    addresses = []
+    for item in (value or '').split(','):
+        item = item.strip()
+        if not item:
+            continue
+        host, _, port = item.rpartition(':') if ':' in item else (item, '', '')
+        addresses.append((host, int(port) if port else default_port))
+    return addresses
+
+
+def parse_bulkheads(value: str) -> dict:
+    """Parse ``"name:max_connections[:pool_timeout[:socket_timeout]],..."`` into bulkhead settings.
+
+    For example ``"ratelimit:8:0.25,health:1:1:1"``; see the ``bulkheads``
+    argument of RedisClient.
+
+    Raises:
+        ValueError: If a bulkhead has no connection limit
+    """
+    bulkheads = {}
+    for item in (value or '').split(','):
+        item = item.strip()
+        if not item:
+            continue
+        name, *fields = item.split(':')
+        if not fields or not fields[0]:
+            raise ValueError(f"Redis bulkhead '{name}' needs a connection limit, e.g. '{name}:4'")
+        settings = {'max_connections': int(fields[0])}
+        for setting, field in zip(('pool_timeout', 'socket_timeout'), fields[1:]):
+            settings[setting] = float(field)
+        bulkheads[name.strip()] = settings
+    return bulkheads
+
+
+# Workload class of the commands issued in this thread or task; see workload()
+_WORKLOAD: ContextVar[Optional[str]] = ContextVar('redis_workload', default=None)
+
+
+@contextmanager
+def workload(name: Optional[str]) -> Iterator[None]:
+    """Send the Redis commands issued inside the block through the ``name`` bulkhead.
+
+    Clients without a bulkhead of that name, and ``name=None``, use the
+    shared pool. Like the request context, the choice is per thread and
+    per asyncio task.
+    """
+    token = _WORKLOAD.set(name)
+    try:
+        yield
+    finally:
+        _WORKLOAD.reset(token)
+
+
+# Clients and background helpers to reset in forked children
+_MONITORS = weakref.WeakSet()
+
+
+def _reset_after_fork() -> None:
+    for monitor in list(_MONITORS):
+        monitor._after_fork_in_child()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
 
 class RedisClient:
-    """Enhanced Redis client with connection pooling and error handling."""
+    """Enhanced Redis client with connection pooling and error handling.
+
+    Connectivity is tracked by a background HealthMonitor and guarded by
+    a CircuitBreaker: is_connected() is a plain attribute read, and while
+    Redis is down every accessor returns its default without touching the
+    network until a probe finds Redis back.
+
+    Nothing is opened at construction. Pools, the first PING and the
+    background threads are set up by connect() on first use in each
+    process, so a client created at import in a preloading gunicorn
+    master is rebuilt cleanly in every worker it forks.
+    """
 
     def __init__(
         self,
@@ -28,9 +1525,31 @@ class RedisClient:
         db: int = 0,
         max_connections: int = 50,
         socket_timeout: int = 5,
+        pool_timeout: float = 1.0,
         socket_connect_timeout: int = 5,
         retry_on_timeout: bool = True,
-        health_check_interval: int = 30
+        health_check_interval: int = 30,
+        failure_threshold: int = 3,
+        backoff_base: float = 0.5,
+        backoff_max: float = 30.0,
+        health_monitor: bool = True,
+        read_cache_size: int = 0,
+        read_cache_ttl: float = 1.0,
+        read_cache_prefixes: Optional[list] = None,
+        compress_threshold: Optional[int] = 1024,
+        slow_command_threshold_ms: float = 10.0,
+        slow_log_size: int = 128,
+        trace_id_getter: Optional[Callable[[], Optional[str]]] = None,
+        replicas: Optional[list] = None,
+        sentinels: Optional[list] = None,
+        sentinel_service: str = 'mymaster',
+        warm_connections: int = 0,
+        warm_scripts: tuple = (),
+        warm_up_timeout: float = 10.0,
+        preload_scripts: bool = False,
+        idle_timeout: Optional[float] = None,
+        budget_getter: Optional[Callable[[], Optional[float]]] = None,
+        bulkheads: Optional[dict] = None
     ):
         """Initialize Redis client with connection pool.
 
@@ -41,144 +1560,693 @@ class RedisClient:
             db: Redis database number
             max_connections: Maximum number of connections in the pool
             socket_timeout: Socket timeout in seconds
+            pool_timeout: Seconds a command waits for a free pool connection
             socket_connect_timeout: Socket connection timeout in seconds
             retry_on_timeout: Whether to retry on timeout
             health_check_interval: Health check interval in seconds
+            failure_threshold: Consecutive failures that open the circuit breaker
+            backoff_base: Seconds the circuit stays open after the first trip
+            backoff_max: Maximum seconds the circuit stays open
+            health_monitor: Run health checks on a background thread
+            read_cache_size: Entries in the local GET/MGET cache (0 disables it)
+            read_cache_ttl: Seconds a cached value may be served
+            read_cache_prefixes: Key prefixes to cache; set this to the hot,
+                rarely written keys, as every write under them is published
+                to every client
+            compress_threshold: Size in bytes above which set_object()
+                compresses values (None disables compression)
+            slow_command_threshold_ms: Commands at least this slow go to the slow-command log
+            slow_log_size: Entries kept in the slow-command log
+            trace_id_getter: Returns the current trace ID for slow-command entries
+            replicas: (host, port) read replicas for get, mget, hget, hgetall
+                and zcard; writes always go to the primary
+            sentinels: (host, port) Sentinels to discover the primary and its
+                replicas from, instead of host, port and replicas; metric
+                labels keep the configured host and port
+            sentinel_service: Name of the primary monitored by Sentinel
+            warm_connections: Connections each process opens per pool before
+                is_warm() reports True (0 skips connection warm-up)
+            warm_scripts: Lua sources to SCRIPT LOAD during warm-up
+            warm_up_timeout: Seconds warm-up retries before giving up
+            preload_scripts: Also SCRIPT LOAD every registered script
+                (see register_script) during warm-up
+            idle_timeout: Seconds after which the health monitor closes an
+                unused pool connection (None keeps connections open); the
+                warm_connections most recently used ones are kept
+            budget_getter: Returns the seconds left before the current
+                request's deadline (None without one); commands then get at
+                most that long, retries included, and fail with
+                DeadlineExceededError once it has passed
+            bulkheads: Separate primary pools per workload class, by name,
+                each overriding max_connections, pool_timeout,
+                socket_timeout, socket_connect_timeout or retry_on_timeout;
+                commands inside ``workload(name)`` use that pool, so a burst
+                in one class cannot exhaust the others'. Health checks use
+                the ``health`` bulkhead if there is one.
+
+        Raises:
+            ValueError: If a bulkhead overrides an unknown setting
         """
         self.host = host
         self.port = port
         self.password = password
         self.db = db
+        self._sentinel: Optional[Sentinel] = None
+        self._sentinel_service = sentinel_service
+        if sentinels:
+            self._sentinel = Sentinel(
+                sentinels, socket_timeout=socket_timeout, socket_connect_timeout=socket_connect_timeout)
+        self._replica_addresses = replicas
         self._client: Optional[redis.Redis] = None
-        self._pool: Optional[ConnectionPool] = None
+        self._pool: Optional[InstrumentedConnectionPool] = None
+        # Bulkhead name -> client over its own pool, built with the shared pool
+        self._bulkheads: dict = {}
         self._is_connected = False
         self._last_health_check = 0
         self._health_check_interval = health_check_interval
         self._connection_failures = 0
-        self._max_connection_failures = 3
+        self._pool_kwargs = {
+            'max_connections': max_connections,
+            'pool_timeout': pool_timeout,
+            'socket_timeout': socket_timeout,
+            'socket_connect_timeout': socket_connect_timeout,
+            'retry_on_timeout': retry_on_timeout
+        }
+        self._bulkhead_settings = {}
+        for name, settings in (bulkheads or {}).items():
+            unknown = set(settings) - set(self._pool_kwargs)
+            if unknown:
+                raise ValueError(f"Unknown settings for Redis bulkhead '{name}': {', '.join(sorted(unknown))}")
+            self._bulkhead_settings[name] = {**self._pool_kwargs, **settings}
+        self._breaker = CircuitBreaker(
+            name=f"{self.host}:{self.port}",
+            failure_threshold=failure_threshold,
+            backoff_base=backoff_base,
+            backoff_max=backoff_max
+        )
+        self._monitor: Optional[HealthMonitor] = None
+        self._read_cache: Optional[ReadCache] = None
+        self._invalidator: Optional[CacheInvalidator] = None
+        self._codec = ValueCodec(compress_threshold=compress_threshold)
+        self._slow_log = SlowCommandLog(threshold_ms=slow_command_threshold_ms, size=slow_log_size)
+        self._timer = CommandTimer(f"{self.host}:{self.port}", self._slow_log, trace_id_getter)
+        self._trace_id_getter = trace_id_getter
+        self._budget_getter = budget_getter
+        self._failure_settings = {
+            'failure_threshold': failure_threshold,
+            'backoff_base': backoff_base,
+            'backoff_max': backoff_max
+        }
+        self._replicas: Optional[ReplicaSet] = None
+        self._warmer: Optional[ConnectionWarmer] = None
+        self._preload_scripts = preload_scripts
+        self._idle_timeout = idle_timeout
+        # Process whose pools and threads are set up; see connect()
+        self._pid: Optional[int] = None
+        self._closed = False
+        self._connect_lock = threading.RLock()
+        _MONITORS.add(self)
+
+        if health_monitor:
+            self._monitor = HealthMonitor(self, health_check_interval)
+
+        if read_cache_size > 0:
+            self._read_cache = ReadCache(
+                target=self._breaker.name,
+                max_entries=read_cache_size,
+                ttl=read_cache_ttl,
+                prefixes=read_cache_prefixes
+            )
+            self._invalidator = CacheInvalidator(self, self._read_cache)
+
+        if warm_connections > 0 or warm_scripts or preload_scripts:
+            self._warmer = ConnectionWarmer(self, warm_connections, warm_scripts, warm_up_timeout)
+
+    def connect(self) -> None:
+        """Set up this process's pools, first health check and background threads.
+
+        Runs once per process, on first use (is_connected() calls it) or
+        from a gunicorn ``post_fork`` hook. A process forked after the
+        client was used drops the inherited pools, whose sockets belong to
+        the parent, and builds its own.
+        """
+        pid = os.getpid()
+        if self._pid == pid or self._closed:
+            return
+        with self._connect_lock:
+            if self._pid == pid or self._closed:
+                return
+            if self._pid is not None:
+                logger.info(f"Redis client used in process {self._pid}, rebuilding pools for {pid}")
+                self._replicas = None
+            if self._sentinel is not None:
+                self._replica_addresses = self._discover() or self._replica_addresses
+            self._init_pool(**self._pool_kwargs)
+            self._init_replicas(self._replica_addresses)
+
+            if self._check_health():
+                logger.info(f"Redis connection pool initialized: {self.host}:{self.port}")
+            else:
+                logger.error(f"Failed to initialize Redis connection pool: {self.host}:{self.port}")
+
+            for helper in (self._monitor, self._invalidator, self._warmer):
+                if helper is not None:
+                    helper.start()
+            self._pid = pid
+
+    def _after_fork_in_child(self) -> None:
+        """Replace locks another thread may have held at fork time."""
+        self._connect_lock = threading.RLock()
+        self._breaker._lock = threading.Lock()
+
+    @property
+    def _client(self) -> Optional[redis.Redis]:
+        """Client of the current workload's bulkhead (see workload()), else of the shared pool."""
+        name = _WORKLOAD.get()
+        if name is not None and name in self._bulkheads:
+            return self._bulkheads[name]
+        return self._shared_client
+
+    @_client.setter
+    def _client(self, client: Optional[redis.Redis]) -> None:
+        self._shared_client = client
+
+    def _init_pool(self, **pool_kwargs) -> None:
+        """Initialize Redis connection pool and the bulkhead pools."""
+        self._pool = self._build_pool(self.host, self.port, **pool_kwargs)
+        self._client = TimedRedis(connection_pool=self._pool, timer=self._timer, budget_getter=self._budget_getter)
+        self._bulkheads = {
+            name: TimedRedis(
+                connection_pool=self._build_pool(
+                    self.host, self.port, target=f"{self.host}:{self.port}/{name}", **settings),
+                timer=self._timer,
+                budget_getter=self._budget_getter
+            )
+            for name, settings in self._bulkhead_settings.items()
+        }
+
+    def _primary_pools(self) -> list:
+        """The shared pool and the bulkhead pools of the primary."""
+        pools = [self._pool] if self._pool is not None else []
+        return pools + [client.connection_pool for client in self._bulkheads.values()]
+
+    def _init_replicas(self, addresses: Optional[list]) -> None:
+        """Create clients for the read replicas, replacing any previous set."""
+        if self._replicas is not None:
+            if self._replicas.addresses == list(addresses or []):
+                return
+            self._replicas.close()
+            self._replicas = None
+        if not addresses:
+            return
+
+        replicas = []
+        for host, port in addresses:
+            target = f"{host}:{port}"
+            timer = CommandTimer(target, self._slow_log, self._trace_id_getter)
+            client = TimedRedis(
+                connection_pool=self._build_pool(host, port, **self._pool_kwargs),
+                timer=timer,
+                budget_getter=self._budget_getter
+            )
+            replicas.append(Replica(host, port, client, CircuitBreaker(name=target, **self._failure_settings)))
+        self._replicas = ReplicaSet(replicas)
+        logger.info(f"Redis read replicas: {', '.join(replica.target for replica in replicas)}")
+
+    def _discover(self) -> list:
+        """Ask Sentinel for the current primary (updating host/port) and its replicas.
+
+        Returns:
+            list: (host, port) of the replicas, empty if discovery failed
+        """
+        try:
+            self.host, self.port = self._sentinel.discover_master(self._sentinel_service)
+            return [tuple(address) for address in self._sentinel.discover_slaves(self._sentinel_service)]
+        except Exception as e:
+            logger.error(f"Redis Sentinel discovery of '{self._sentinel_service}' failed: {e}")
+            return []
 
-        # Initialize connection pool
-        self._init_pool(
+    def _build_pool(
+        self,
+        host: str,
+        port: int,
+        max_connections: int,
+        pool_timeout: float,
+        socket_timeout: int,
+        socket_connect_timeout: int,
+        retry_on_timeout: bool,
+        target: Optional[str] = None
+    ) -> InstrumentedConnectionPool:
+        """Create an instrumented connection pool for a Redis server."""
+        return InstrumentedConnectionPool(
+            target=target or f"{host}:{port}",
+            host=host,
+            port=port,
+            password=self.password if self.password else None,
+            db=self.db,
+            decode_responses=True,
             max_connections=max_connections,
+            timeout=pool_timeout,
             socket_timeout=socket_timeout,
             socket_connect_timeout=socket_connect_timeout,
-            retry_on_timeout=retry_on_timeout
+            socket_keepalive=True,
+            socket_keepalive_options={},
+            retry_on_timeout=retry_on_timeout,
+            health_check_interval=self._health_check_interval
         )
 
-    def _init_pool(
+    def node_for(self, key: str) -> 'RedisClient':
+        """Client holding a key: this client (see ShardedRedisClient.node_for)."""
+        return self
+
+    def is_connected(self) -> bool:
+        """Check if Redis is connected.
+
+        Reads the state maintained by the health monitor and by command
+        failures, so it never blocks on the network once connect() has
+        run in this process.
+
+        Returns:
+            bool: True if connected, False otherwise
+        """
+        if self._pid != os.getpid():
+            self.connect()
+        return self._is_connected
+
+    def _check_health(self) -> bool:
+        """Ping Redis and report the outcome to the circuit breaker.
+
+        Called by the health monitor (and once at startup). While the
+        breaker is open nothing is sent; the half-open probe starts from
+        a fresh pool. The PING goes through the ``health`` bulkhead, if
+        configured, so busy request pools cannot delay it.
+
+        Returns:
+            bool: True if Redis answered, False otherwise
+        """
+        if not self._client or not self._breaker.allow_request():
+            return False
+
+        if self._breaker.state == CircuitBreaker.HALF_OPEN:
+            self._reconnect()
+
+        self._last_health_check = time.time()
+        try:
+            with workload('health'):
+                self._client.ping()
+        except (PoolExhaustedError, DeadlineExceededError) as e:
+            # Busy, or out of request time (first use inside a request), not down
+            logger.warning(f"Redis health check skipped: {e}")
+            self._breaker.release_probe()
+            return self._is_connected
+        except (ConnectionError, TimeoutError) as e:
+            logger.warning(f"Redis health check failed: {e}")
+            self._mark_disconnected()
+            return False
+
+        self._is_connected = True
+        self._connection_failures = 0
+        self._breaker.record_success()
+        return True
+
+    def _mark_disconnected(self) -> None:
+        """Record a failed health check or command.
+
+        The client only reads as disconnected once the failure opens the
+        circuit breaker; below ``failure_threshold`` later commands still
+        go through.
+        """
+        self._connection_failures += 1
+        self._breaker.record_failure()
+        if self._breaker.state != CircuitBreaker.CLOSED:
+            self._is_connected = False
+
+    def _record_failure(self, error: Optional[Exception] = None) -> None:
+        """Record a connection-level failure seen by a command.
+
+        Commands are skipped until the health monitor, woken here, finds
+        Redis reachable again. An exhausted pool or a passed request
+        deadline says nothing about Redis itself and is not counted.
+        """
+        if isinstance(error, (PoolExhaustedError, DeadlineExceededError)):
+            return
+        self._mark_disconnected()
+        if self._monitor is not None:
+            self._monitor.wake()
+
+    def is_warm(self) -> bool:
+        """Check whether this process finished warming up.
+
+        True when warm-up is disabled. Meant for readiness probes, so
+        traffic only reaches processes with open connections.
+        """
+        if self._pid != os.getpid():
+            self.connect()
+        return self._warmer is None or self._warmer.is_done()
+
+    def _warm_up(self, connections: int, scripts: tuple) -> bool:
+        """Open pool connections and load scripts once Redis is reachable.
+
+        Returns:
+            bool: True if warm-up succeeded
+        """
+        if not self._is_connected:
+            return False
+        if self._preload_scripts:
+            scripts = tuple(scripts) + tuple(SCRIPTS.sources())
+        try:
+            for pool in self._primary_pools():
+                pool.warm(connections)
+            for source in scripts:
+                self._client.script_load(source)
+        except (ConnectionError, TimeoutError) as e:
+            logger.warning(f"Redis warm-up failed: {e}")
+            self._record_failure(e)
+            return False
+
+        # A cold replica is only slower, and reads fall back to the primary
+        for replica in self._replicas.replicas if self._replicas else []:
+            try:
+                replica.client.connection_pool.warm(connections)
+            except (ConnectionError, TimeoutError) as e:
+                logger.warning(f"Redis warm-up of replica {replica.target} failed: {e}")
+        return True
+
+    def _reap_idle(self) -> int:
+        """Close pool connections idle longer than idle_timeout.
+
+        Returns:
+            int: Connections closed across the primary, bulkhead and replica pools
+        """
+        if self._idle_timeout is None or self._pool is None:
+            return 0
+        keep = self._warmer.connections if self._warmer is not None else 0
+        reaped = sum(pool.reap(self._idle_timeout, keep) for pool in self._primary_pools())
+        for replica in self._replicas.replicas if self._replicas else []:
+            reaped += replica.client.connection_pool.reap(self._idle_timeout, keep)
+        return reaped
+
+    def _invalidate(self, *keys: str) -> None:
+        """Drop keys written through this client from the read cache.
+
+        Called after the write, so a concurrent read that started before
+        it cannot store the old value; other clients' writes arrive as
+        keyspace notifications.
+        """
+        if self._read_cache is not None:
+            for key in keys:
+                self._read_cache.invalidate(key)
+
+    def _read(self, primary: bool, command: Callable[[redis.Redis], Any]) -> tuple:
+        """Run a read-only command on a replica, falling back to the primary.
+
+        Args:
+            primary: Read from the primary, e.g. for read-your-writes
+            command: Called with the redis.Redis client to read from
+
+        Returns:
+            tuple: (result, True if a replica answered)
+        """
+        replica = None if primary or self._replicas is None else self._replicas.acquire()
+        if replica is not None:
+            try:
+                result = command(replica.client)
+            except DeadlineExceededError as e:
+                # No time left for the primary either
+                self._replicas.release(replica, e)
+                raise
+            except (ConnectionError, TimeoutError) as e:
+                self._replicas.release(replica, e)
+                logger.warning(f"Redis replica {replica.target} read failed, using the primary: {e}")
+            except Exception:
+                self._replicas.release(replica)
+                raise
+            else:
+                self._replicas.release(replica)
+                return result, True
+        return command(self._client), False
+
+    def _reconnect(self) -> None:
+        """Attempt to reconnect to Redis."""
+        try:
+            for pool in self._primary_pools():
+                pool.disconnect()
+
+            if self._sentinel is not None:
+                # The primary may have failed over while we were cut off
+                self._replica_addresses = self._discover() or self._replica_addresses
+                self._init_replicas(self._replica_addresses)
+            self._init_pool(**self._pool_kwargs)
+        except Exception as e:
+            logger.error(f"Reconnection attempt failed: {e}")
+
+    def get(self, key: str, default: Any = None, primary: bool = False) -> Any:
+        """Get value from Redis with error handling.
+
+        Args:
+            key: Redis key
+            default: Default value if key not found or error occurs
+            primary: Read from the primary even if replicas are configured
+
+        Returns:
+            Value from Redis or default value
+        """
+        if not self.is_connected():
+            logger.debug(f"Redis not connected, returning default for key: {key}")
+            return default
+
+        cache = self._read_cache
+        if cache is not None:
+            generation = cache.generation
+            found, value = cache.get(key)
+            if found:
+                return value if value is not None else default
+
+        try:
+            value, from_replica = self._read(primary, lambda client: client.get(key))
+            if cache is not None and not from_replica:
+                # A lagging replica could cache a value older than an invalidation
+                cache.put(key, value, generation)
+            return value if value is not None else default
+        except (ConnectionError, TimeoutError) as e:
+            logger.error(f"Redis GET error for key '{key}': {e}")
+            self._record_failure(e)
+            return default
+        except ResponseError as e:
+            logger.error(f"Redis response error for key '{key}': {e}")
+            return default
+
+    def set(
         self,
-        max_connections: int,
-        socket_timeout: int,
-        socket_connect_timeout: int,
-        retry_on_timeout: bool
-    ) -> None:
-        """Initialize Redis connection pool."""
+        key: str,
+        value: Any,
+        ex: Optional[int] = None,
+        px: Optional[int] = None,
+        nx: bool = False,
+        xx: bool = False
+    ) -> bool:
+        """Set value in Redis with error handling.
+
+        Args:
+            key: Redis key
+            value: Value to set
+            ex: Expiration time in seconds
+            px: Expiration time in milliseconds
+            nx: Only set if key does not exist
+            xx: Only set if key exists
+
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        if not self.is_connected():
+            logger.debug(f"Redis not connected, skipping SET for key: {key}")
+            return False
+
         try:
-            self._pool = ConnectionPool(
-                host=self.host,
-                port=self.port,
-                password=self.password if self.password else None,
-                db=self.db,
-                decode_responses=True,
-                max_connections=max_connections,
-                socket_timeout=socket_timeout,
-                socket_connect_timeout=socket_connect_timeout,
-                socket_keepalive=True,
-                socket_keepalive_options={},
-                retry_on_timeout=retry_on_timeout,
-                health_check_interval=self._health_check_interval
-            )
+            result = self._client.set(key, value, ex=ex, px=px, nx=nx, xx=xx)
+            return bool(result)
+        except (ConnectionError, TimeoutError) as e:
+            logger.error(f"Redis SET error for key '{key}': {e}")
+            self._record_failure(e)
+            return False
+        except ResponseError as e:
+            logger.error(f"Redis response error for key '{key}': {e}")
+            return False
+        finally:
+            self._invalidate(key)
+
+    def incr(self, key: str, amount: int = 1) -> Optional[int]:
+        """Increment value in Redis with error handling.
+
+        Args:
+            key: Redis key
+            amount: Amount to increment by
+
+        Returns:
+            int: New value after increment, or None if error
+        """
+        if not self.is_connected():
+            logger.debug(f"Redis not connected, skipping INCR for key: {key}")
+            return None
+
+        try:
+            return self._client.incr(key, amount)
+        except (ConnectionError, TimeoutError) as e:
+            logger.error(f"Redis INCR error for key '{key}': {e}")
+            self._record_failure(e)
+            return None
+        except ResponseError as e:
+            logger.error(f"Redis response error for key '{key}': {e}")
+            return None
+        finally:
+            self._invalidate(key)
+
+    def delete(self, *keys: str) -> int:
+        """Delete keys from Redis with error handling.
+
+        Args:
+            *keys: Keys to delete
+
+        Returns:
+            int: Number of keys deleted, or 0 if error
+        """
+        if not self.is_connected():
+            logger.debug(f"Redis not connected, skipping DELETE for keys: {keys}")
+            return 0
+
+        try:
+            return self._client.delete(*keys)
+        except (ConnectionError, TimeoutError) as e:
+            logger.error(f"Redis DELETE error for keys '{keys}': {e}")
+            self._record_failure(e)
+            return 0
+        except ResponseError as e:
+            logger.error(f"Redis response error for keys '{keys}': {e}")
+            return 0
+        finally:
+            self._invalidate(*keys)
+
+    def mget(self, keys: list, default: Any = None, primary: bool = False) -> list:
+        """Get several values from Redis in one round trip.
+
+        Args:
+            keys: Redis keys
+            default: Value used for missing keys, or for every key if an error occurs
+            primary: Read from the primary even if replicas are configured
 
-            self._client = redis.Redis(connection_pool=self._pool)
+        Returns:
+            list: One value per key
+        """
+        if not keys:
+            return []
+
+        if not self.is_connected():
+            logger.debug(f"Redis not connected, returning defaults for keys: {keys}")
+            return [default] * len(keys)
 
-            # Test connection
-            self._client.ping()
-            self._is_connected = True
-            self._connection_failures = 0
-            logger.info(f"Redis connection pool initialized: {self.host}:{self.port}")
+        cache = self._read_cache
+        values = {}
+        if cache is not None:
+            generation = cache.generation
+            values = cache.get_many(keys)
 
+        try:
+            missing = list(dict.fromkeys(key for key in keys if key not in values))
+            if missing:
+                fetched, from_replica = self._read(primary, lambda client: client.mget(missing))
+                for key, value in zip(missing, fetched):
+                    values[key] = value
+                    if cache is not None and not from_replica:
+                        cache.put(key, value, generation)
+            return [values[key] if values[key] is not None else default for key in keys]
         except (ConnectionError, TimeoutError) as e:
-            logger.error(f"Failed to initialize Redis connection pool: {e}")
-            self._is_connected = False
-            self._connection_failures += 1
-            self._client = None
-            self._pool = None
+            logger.error(f"Redis MGET error for keys '{keys}': {e}")
+            self._record_failure(e)
+            return [default] * len(keys)
+        except ResponseError as e:
+            logger.error(f"Redis response error for keys '{keys}': {e}")
+            return [default] * len(keys)
 
-    def is_connected(self) -> bool:
-        """Check if Redis is connected.
+    def mset(self, mapping: dict) -> bool:
+        """Set several values in Redis in one round trip.
+
+        Args:
+            mapping: Keys and values to set
 
         Returns:
-            bool: True if connected, False otherwise
+            bool: True if successful, False otherwise
         """
-        current_time = time.time()
-
-        # Only check if health_check_interval has passed
-        if current_time - self._last_health_check < self._health_check_interval:
-            return self._is_connected
-
-        self._last_health_check = current_time
+        if not mapping:
+            return True
 
-        if not self._client:
+        if not self.is_connected():
+            logger.debug(f"Redis not connected, skipping MSET for keys: {list(mapping)}")
             return False
 
         try:
-            self._client.ping()
-            self._is_connected = True
-            self._connection_failures = 0
-            return True
+            return bool(self._client.mset(mapping))
         except (ConnectionError, TimeoutError) as e:
-            logger.warning(f"Redis health check failed: {e}")
-            self._is_connected = False
-            self._connection_failures += 1
-
-            # Try to reconnect if failures exceed threshold
-            if self._connection_failures >= self._max_connection_failures:
-                logger.info("Attempting to reconnect to Redis...")
-                self._reconnect()
-
+            logger.error(f"Redis MSET error for keys '{list(mapping)}': {e}")
+            self._record_failure(e)
+            return False
+        except ResponseError as e:
+            logger.error(f"Redis response error for keys '{list(mapping)}': {e}")
             return False
+        finally:
+            self._invalidate(*mapping)
 
-    def _reconnect(self) -> None:
-        """Attempt to reconnect to Redis."""
-        try:
-            if self._pool:
-                self._pool.disconnect()
+    def get_int(self, key: str, default: Optional[int] = None, primary: bool = False) -> Optional[int]:
+        """Get an integer, such as an INCR counter, from Redis.
 
-            self._init_pool(
-                max_connections=50,
-                socket_timeout=5,
-                socket_connect_timeout=5,
-                retry_on_timeout=True
-            )
-        except Exception as e:
-            logger.error(f"Reconnection attempt failed: {e}")
+        Args:
+            key: Redis key
+            default: Value if the key is missing, not an integer, or an error occurs
+            primary: Read from the primary even if replicas are configured
 
-    def get(self, key: str, default: Any = None) -> Any:
-        """Get value from Redis with error handling.
+        Returns:
+            int: Stored value or default
+        """
+        return self._to_number(key, self.get(key, primary=primary), int, default)
+
+    def get_float(self, key: str, default: Optional[float] = None, primary: bool = False) -> Optional[float]:
+        """Get a float, such as a timestamp, from Redis.
 
         Args:
             key: Redis key
-            default: Default value if key not found or error occurs
+            default: Value if the key is missing, not a number, or an error occurs
+            primary: Read from the primary even if replicas are configured
 
         Returns:
-            Value from Redis or default value
+            float: Stored value or default
         """
-        if not self.is_connected():
-            logger.debug(f"Redis not connected, returning default for key: {key}")
-            return default
+        return self._to_number(key, self.get(key, primary=primary), float, default)
 
-        try:
-            value = self._client.get(key)
-            return value if value is not None else default
-        except (ConnectionError, TimeoutError) as e:
-            logger.error(f"Redis GET error for key '{key}': {e}")
-            self._is_connected = False
+    def mget_int(self, keys: list, default: Optional[int] = 0, primary: bool = False) -> list:
+        """Get several integers from Redis in one round trip.
+
+        Args:
+            keys: Redis keys
+            default: Value for keys that are missing or not integers, or for
+                every key if an error occurs
+            primary: Read from the primary even if replicas are configured
+
+        Returns:
+            list: One value per key
+        """
+        return [self._to_number(key, value, int, default) for key, value in zip(keys, self.mget(keys, primary=primary))]
+
+    @staticmethod
+    def _to_number(key: str, value: Any, kind: type, default: Any) -> Any:
+        """Convert a value read from Redis, falling back to default."""
+        if value is None:
             return default
-        except ResponseError as e:
-            logger.error(f"Redis response error for key '{key}': {e}")
+        try:
+            return kind(value)
+        except (TypeError, ValueError):
+            logger.error(f"Redis value for key '{key}' is not a valid {kind.__name__}: {value!r}")
             return default
 
-    def set(
+    def set_object(
         self,
         key: str,
         value: Any,
@@ -187,11 +2255,11 @@ class RedisClient:
         nx: bool = False,
         xx: bool = False
     ) -> bool:
-        """Set value in Redis with error handling.
+        """Store a structured value (dict, list, ...) in compact binary form.
 
         Args:
             key: Redis key
-            value: Value to set
+            value: msgpack/JSON-serializable value
             ex: Expiration time in seconds
             px: Expiration time in milliseconds
             nx: Only set if key does not exist
@@ -199,69 +2267,275 @@ class RedisClient:
 
         Returns:
             bool: True if successful, False otherwise
+
+        Raises:
+            TypeError: If the value cannot be serialized
         """
         if not self.is_connected():
             logger.debug(f"Redis not connected, skipping SET for key: {key}")
             return False
 
+        data = self._codec.encode(value)
         try:
-            result = self._client.set(key, value, ex=ex, px=px, nx=nx, xx=xx)
-            return bool(result)
+            return bool(self._client.set(key, data, ex=ex, px=px, nx=nx, xx=xx))
         except (ConnectionError, TimeoutError) as e:
             logger.error(f"Redis SET error for key '{key}': {e}")
-            self._is_connected = False
+            self._record_failure(e)
             return False
         except ResponseError as e:
             logger.error(f"Redis response error for key '{key}': {e}")
             return False
+        finally:
+            self._invalidate(key)
 
-    def incr(self, key: str, amount: int = 1) -> Optional[int]:
-        """Increment value in Redis with error handling.
+    def get_object(self, key: str, default: Any = None, primary: bool = False) -> Any:
+        """Get a value stored with set_object().
+
+        The reply is read as raw bytes, skipping UTF-8 decoding.
 
         Args:
             key: Redis key
+            default: Value if the key is missing, cannot be decoded, or an error occurs
+            primary: Read from the primary even if replicas are configured
+
+        Returns:
+            Decoded value or default
+        """
+        if not self.is_connected():
+            logger.debug(f"Redis not connected, returning default for key: {key}")
+            return default
+
+        try:
+            data, _ = self._read(primary, lambda client: client.execute_command('GET', key, **{NEVER_DECODE: True}))
+        except (ConnectionError, TimeoutError) as e:
+            logger.error(f"Redis GET error for key '{key}': {e}")
+            self._record_failure(e)
+            return default
+        except ResponseError as e:
+            logger.error(f"Redis response error for key '{key}': {e}")
+            return default
+
+        if data is None:
+            return default
+        try:
+            return self._codec.decode(data)
+        except ValueError as e:
+            logger.error(f"Could not decode Redis value for key '{key}': {e}")
+            return default
+
+    def hget(self, name: str, key: str, default: Any = None, primary: bool = False) -> Any:
+        """Get a hash field from Redis with error handling.
+
+        Args:
+            name: Redis hash key
+            key: Field name
+            default: Default value if field not found or error occurs
+            primary: Read from the primary even if replicas are configured
+
+        Returns:
+            Field value or default value
+        """
+        if not self.is_connected():
+            logger.debug(f"Redis not connected, returning default for hash: {name}")
+            return default
+
+        try:
+            value, _ = self._read(primary, lambda client: client.hget(name, key))
+            return value if value is not None else default
+        except (ConnectionError, TimeoutError) as e:
+            logger.error(f"Redis HGET error for hash '{name}': {e}")
+            self._record_failure(e)
+            return default
+        except ResponseError as e:
+            logger.error(f"Redis response error for hash '{name}': {e}")
+            return default
+
+    def hgetall(self, name: str, primary: bool = False) -> dict:
+        """Get all fields of a hash from Redis with error handling.
+
+        Args:
+            name: Redis hash key
+            primary: Read from the primary even if replicas are configured
+
+        Returns:
+            dict: Hash fields, or an empty dict if missing or error
+        """
+        if not self.is_connected():
+            logger.debug(f"Redis not connected, returning empty hash: {name}")
+            return {}
+
+        try:
+            return self._read(primary, lambda client: client.hgetall(name))[0]
+        except (ConnectionError, TimeoutError) as e:
+            logger.error(f"Redis HGETALL error for hash '{name}': {e}")
+            self._record_failure(e)
+            return {}
+        except ResponseError as e:
+            logger.error(f"Redis response error for hash '{name}': {e}")
+            return {}
+
+    def hset(self, name: str, mapping: dict) -> int:
+        """Set hash fields in Redis with error handling.
+
+        Args:
+            name: Redis hash key
+            mapping: Fields and values to set
+
+        Returns:
+            int: Number of fields added, or 0 if error
+        """
+        if not self.is_connected():
+            logger.debug(f"Redis not connected, skipping HSET for hash: {name}")
+            return 0
+
+        try:
+            return self._client.hset(name, mapping=mapping)
+        except (ConnectionError, TimeoutError) as e:
+            logger.error(f"Redis HSET error for hash '{name}': {e}")
+            self._record_failure(e)
+            return 0
+        except ResponseError as e:
+            logger.error(f"Redis response error for hash '{name}': {e}")
+            return 0
+
+    def hincrby(self, name: str, key: str, amount: int = 1) -> Optional[int]:
+        """Increment a hash field in Redis with error handling.
+
+        Args:
+            name: Redis hash key
+            key: Field name
             amount: Amount to increment by
 
         Returns:
             int: New value after increment, or None if error
         """
         if not self.is_connected():
-            logger.debug(f"Redis not connected, skipping INCR for key: {key}")
+            logger.debug(f"Redis not connected, skipping HINCRBY for hash: {name}")
             return None
 
         try:
-            return self._client.incr(key, amount)
+            return self._client.hincrby(name, key, amount)
         except (ConnectionError, TimeoutError) as e:
-            logger.error(f"Redis INCR error for key '{key}': {e}")
-            self._is_connected = False
+            logger.error(f"Redis HINCRBY error for hash '{name}': {e}")
+            self._record_failure(e)
             return None
         except ResponseError as e:
-            logger.error(f"Redis response error for key '{key}': {e}")
+            logger.error(f"Redis response error for hash '{name}': {e}")
             return None
 
-    def delete(self, *keys: str) -> int:
-        """Delete keys from Redis with error handling.
+    def zcard(self, name: str, primary: bool = False) -> int:
+        """Get the number of members of a sorted set with error handling.
 
         Args:
-            *keys: Keys to delete
+            name: Redis sorted set key
+            primary: Read from the primary even if replicas are configured
 
         Returns:
-            int: Number of keys deleted, or 0 if error
+            int: Number of members, or 0 if missing or error
         """
         if not self.is_connected():
-            logger.debug(f"Redis not connected, skipping DELETE for keys: {keys}")
+            logger.debug(f"Redis not connected, returning 0 for sorted set: {name}")
             return 0
 
         try:
-            return self._client.delete(*keys)
+            return self._read(primary, lambda client: client.zcard(name))[0]
         except (ConnectionError, TimeoutError) as e:
-            logger.error(f"Redis DELETE error for keys '{keys}': {e}")
-            self._is_connected = False
+            logger.error(f"Redis ZCARD error for sorted set '{name}': {e}")
+            self._record_failure(e)
             return 0
         except ResponseError as e:
-            logger.error(f"Redis response error for keys '{keys}': {e}")
+            logger.error(f"Redis response error for sorted set '{name}': {e}")
             return 0
 
+    def run_script(self, name: str, keys: Optional[list] = None, args: Optional[list] = None, default: Any = None) -> Any:
+        """Run a registered Lua script via EVALSHA.
+
+        Only the SHA1 goes over the wire. If Redis does not know the script
+        (NOSCRIPT, e.g. after a restart or SCRIPT FLUSH) it is loaded and
+        the call retried once.
+
+        Args:
+            name: Name the script was registered under (see register_script)
+            keys: Script KEYS
+            args: Script ARGV
+            default: Value returned if the script cannot be run
+
+        Returns:
+            Script result, or default if Redis is unavailable or the script failed
+        """
+        source, sha = SCRIPTS.get(name)
+        keys = list(keys or ())
+        args = list(args or ())
+        if not self.is_connected():
+            logger.debug(f"Redis not connected, skipping script '{name}'")
+            return default
+
+        try:
+            try:
+                return self._client.evalsha(sha, len(keys), *keys, *args)
+            except NoScriptError:
+                logger.info(f"Redis script '{name}' not cached by the server, loading it")
+                self._client.script_load(source)
+                return self._client.evalsha(sha, len(keys), *keys, *args)
+        except (ConnectionError, TimeoutError) as e:
+            logger.error(f"Redis script '{name}' error: {e}")
+            self._record_failure(e)
+            return default
+        except ResponseError as e:
+            logger.error(f"Redis script '{name}' failed: {e}")
+            return default
+        finally:
+            self._invalidate(*keys)
+
+    @contextmanager
+    def pipeline(self, transaction: bool = False) -> Iterator[RedisPipeline]:
+        """Queue commands and send them in one round trip.
+
+        The batch is executed when the ``with`` block exits normally and
+        ``results`` is set on the yielded RedisPipeline. Connection and
+        response errors are logged and leave ``results`` as None, like the
+        single-key accessors' fail-soft defaults.
+
+        Example:
+            with redis_client.pipeline() as pipe:
+                pipe.incr('counter')
+                pipe.set('last_seen', now)
+            count = pipe.results[0] if pipe.results else 0
+
+        Args:
+            transaction: Wrap the commands in MULTI/EXEC
+
+        Yields:
+            RedisPipeline: Batch to queue commands on
+        """
+        batch = RedisPipeline(transaction=transaction)
+        yield batch
+        batch.results = self._execute_pipeline(batch)
+
+    def _execute_pipeline(self, batch: RedisPipeline) -> Optional[list]:
+        """Send a queued batch to Redis."""
+        if not batch:
+            return []
+
+        if not self.is_connected():
+            logger.debug(f"Redis not connected, skipping pipeline of {len(batch)} commands")
+            return None
+
+        try:
+            pipe = self._client.pipeline(transaction=batch.transaction)
+            for name, args, kwargs in batch.commands:
+                getattr(pipe, name)(*args, **kwargs)
+            return pipe.execute()
+        except (ConnectionError, TimeoutError) as e:
+            logger.error(f"Redis pipeline error for {len(batch)} commands: {e}")
+            self._record_failure(e)
+            return None
+        except ResponseError as e:
+            logger.error(f"Redis response error in pipeline: {e}")
+            return None
+        finally:
+            self._invalidate(*batch.keys())
+
     def ping(self) -> bool:
         """Ping Redis server.
 
@@ -271,20 +2545,49 @@ class RedisClient:
         return self.is_connected()
 
     def close(self) -> None:
-        """Close Redis connection pool."""
+        """Close Redis connection pool and stop the background threads."""
+        self._closed = True
+        if self._monitor is not None:
+            self._monitor.stop()
+        if self._invalidator is not None:
+            self._invalidator.stop()
+        if self._warmer is not None:
+            self._warmer.stop()
+        if self._replicas is not None:
+            self._replicas.close()
         try:
             if self._pool:
-                self._pool.disconnect()
+                for pool in self._primary_pools():
+                    pool.disconnect()
                 logger.info("Redis connection pool closed")
         except Exception as e:
             logger.error(f"Error closing Redis connection pool: {e}")
         finally:
             self._client = None
             self._pool = None
+            self._bulkheads = {}
             self._is_connected = False
 
+    def get_slow_commands(self, limit: Optional[int] = None) -> dict:
+        """Get the client-side slow-command log.
+
+        Args:
+            limit: Maximum entries to return (all if None)
+
+        Returns:
+            dict: threshold_ms and the logged commands, slowest first
+        """
+        return {
+            'threshold_ms': self._slow_log.threshold_ms,
+            'commands': self._slow_log.entries(limit)
+        }
+
     def get_pool_stats(self) -> dict:
-        """Get connection pool statistics.
+        """Get connection pool statistics (available, in_use, created, max_connections).
+
+        With read replicas configured, ``replicas`` lists the pool usage,
+        reads in flight and breaker state of each replica; with bulkheads,
+        ``bulkheads`` holds the usage of each bulkhead pool.
 
         Returns:
             dict: Pool statistics
@@ -297,11 +2600,14 @@ class RedisClient:
             }
 
         try:
-            return {
-                'available': len(self._pool._available_connections),
-                'in_use': len(self._pool._in_use_connections),
-                'max_connections': self._pool.max_connections
-            }
+            stats = self._pool.stats()
+            if self._replicas is not None:
+                stats['replicas'] = self._replicas.stats()
+            if self._bulkheads:
+                stats['bulkheads'] = {
+                    name: client.connection_pool.stats() for name, client in self._bulkheads.items()
+                }
+            return stats
         except Exception as e:
             logger.error(f"Error getting pool stats: {e}")
             return {
@@ -312,12 +2618,291 @@ class RedisClient:
             }
 
 
+class HashRing:
+    """Consistent hash ring with virtual nodes.
+
+    Every node is placed at ``vnodes`` points on a 64-bit ring and a key
+    belongs to the first point at or after its hash, so adding or removing
+    a node only moves the keys of that node. As in Redis Cluster, a key
+    containing ``{tag}`` with a non-empty tag is hashed by the tag alone:
+    ``user:{42}:profile`` and ``user:{42}:sessions`` share a node.
+    """
+
+    def __init__(self, nodes: list, vnodes: int = 160):
+        """Initialize hash ring.
+
+        Args:
+            nodes: Node names (e.g. host:port)
+            vnodes: Points per node; more points spread keys more evenly
+        """
+        self.nodes = list(nodes)
+        self.vnodes = vnodes
+        points = sorted(
+            (self._hash(f"{node}#{index}"), node)
+            for node in self.nodes for index in range(vnodes)
+        )
+        self._points = [point for point, _ in points]
+        self._owners = [node for _, node in points]
+
+    @staticmethod
+    def _hash(value: str) -> int:
+        return int.from_bytes(hashlib.md5(value.encode()).digest()[:8], 'big')
+
+    @staticmethod
+    def hash_key(key: Any) -> str:
+        """Part of a key that is hashed: its hash tag if it has one."""
+        if isinstance(key, bytes):
+            key = key.decode('utf-8', 'replace')
+        key = str(key)
+        start = key.find('{')
+        if start != -1:
+            end = key.find('}', start + 1)
+            if end > start + 1:
+                return key[start + 1:end]
+        return key
+
+    def get_node(self, key: Any) -> str:
+        """Node that owns a key."""
+        index = bisect.bisect_left(self._points, self._hash(self.hash_key(key)))
+        return self._owners[index % len(self._owners)]
+
+
+class ShardedRedisClient:
+    """RedisClient interface over several Redis nodes chosen by consistent hashing.
+
+    Every node is a full RedisClient with its own pool, circuit breaker,
+    health monitor and metrics labelled by host:port, so a node that is
+    down only fails (or defaults) its own keys. Single-key calls go to the
+    key's node; mget, mset, delete and pipelines are split per node and
+    reassembled in order. Commands that touch several keys at once inside
+    a pipeline (or a script) need those keys on one node, e.g. through a
+    shared hash tag or by routing explicitly with node_for().
+    """
+
+    def __init__(self, nodes: list, vnodes: int = 160, **client_kwargs):
+        """Initialize sharded client.
+
+        Args:
+            nodes: (host, port) of every node
+            vnodes: Virtual nodes per node on the hash ring
+            **client_kwargs: RedisClient arguments applied to every node
+                (replicas and Sentinel are not supported per node)
+
+        Raises:
+            ValueError: If no node is given or replicas/Sentinel are requested
+        """
+        if not nodes:
+            raise ValueError("ShardedRedisClient needs at least one node")
+        if client_kwargs.get('replicas') or client_kwargs.get('sentinels'):
+            raise ValueError("ShardedRedisClient does not support replicas or Sentinel")
+        client_kwargs.pop('replicas', None)
+        client_kwargs.pop('sentinels', None)
+        self.nodes = {
+            f"{host}:{port}": RedisClient(host=host, port=port, **client_kwargs)
+            for host, port in nodes
+        }
+        self._ring = HashRing(list(self.nodes), vnodes)
+
+    def node_for(self, key: str) -> RedisClient:
+        """RedisClient of the node that owns a key."""
+        return self.nodes[self._ring.get_node(key)]
+
+    def _group(self, keys: list) -> dict:
+        """Positions of the keys, grouped by owning node."""
+        groups = {}
+        for position, key in enumerate(keys):
+            groups.setdefault(self.node_for(key), []).append(position)
+        return groups
+
+    def connect(self) -> None:
+        """Connect every node in this process (see RedisClient.connect)."""
+        for node in self.nodes.values():
+            node.connect()
+
+    def is_connected(self) -> bool:
+        """Check that every node is connected."""
+        return all(node.is_connected() for node in self.nodes.values())
+
+    def is_warm(self) -> bool:
+        """Check that every node finished warming up."""
+        return all(node.is_warm() for node in self.nodes.values())
+
+    def get(self, key: str, *args, **kwargs) -> Any:
+        """RedisClient.get on the key's node."""
+        return self.node_for(key).get(key, *args, **kwargs)
+
+    def set(self, key: str, *args, **kwargs) -> bool:
+        """RedisClient.set on the key's node."""
+        return self.node_for(key).set(key, *args, **kwargs)
+
+    def incr(self, key: str, *args, **kwargs) -> Optional[int]:
+        """RedisClient.incr on the key's node."""
+        return self.node_for(key).incr(key, *args, **kwargs)
+
+    def get_int(self, key: str, *args, **kwargs) -> Optional[int]:
+        """RedisClient.get_int on the key's node."""
+        return self.node_for(key).get_int(key, *args, **kwargs)
+
+    def get_float(self, key: str, *args, **kwargs) -> Optional[float]:
+        """RedisClient.get_float on the key's node."""
+        return self.node_for(key).get_float(key, *args, **kwargs)
+
+    def set_object(self, key: str, *args, **kwargs) -> bool:
+        """RedisClient.set_object on the key's node."""
+        return self.node_for(key).set_object(key, *args, **kwargs)
+
+    def get_object(self, key: str, *args, **kwargs) -> Any:
+        """RedisClient.get_object on the key's node."""
+        return self.node_for(key).get_object(key, *args, **kwargs)
+
+    def hget(self, name: str, *args, **kwargs) -> Any:
+        """RedisClient.hget on the hash's node."""
+        return self.node_for(name).hget(name, *args, **kwargs)
+
+    def hgetall(self, name: str, *args, **kwargs) -> dict:
+        """RedisClient.hgetall on the hash's node."""
+        return self.node_for(name).hgetall(name, *args, **kwargs)
+
+    def hset(self, name: str, *args, **kwargs) -> int:
+        """RedisClient.hset on the hash's node."""
+        return self.node_for(name).hset(name, *args, **kwargs)
+
+    def hincrby(self, name: str, *args, **kwargs) -> Optional[int]:
+        """RedisClient.hincrby on the hash's node."""
+        return self.node_for(name).hincrby(name, *args, **kwargs)
+
+    def zcard(self, name: str, *args, **kwargs) -> int:
+        """RedisClient.zcard on the sorted set's node."""
+        return self.node_for(name).zcard(name, *args, **kwargs)
+
+    def run_script(self, name: str, keys: Optional[list] = None, args: Optional[list] = None, default: Any = None) -> Any:
+        """RedisClient.run_script on the node holding the script's keys.
+
+        Raises:
+            ValueError: If the script has no keys or its keys are on different nodes
+        """
+        nodes = {id(node): node for node in map(self.node_for, keys or ())}
+        if len(nodes) != 1:
+            raise ValueError(f"Redis script '{name}' must name keys on exactly one node (use a {{tag}})")
+        return next(iter(nodes.values())).run_script(name, keys, args, default)
+
+    def delete(self, *keys: str) -> int:
+        """Delete keys from their nodes; returns the number deleted."""
+        return sum(
+            node.delete(*(keys[position] for position in positions))
+            for node, positions in self._group(keys).items()
+        )
+
+    def mget(self, keys: list, default: Any = None, primary: bool = False) -> list:
+        """Get several values with one MGET per node."""
+        return self._gather(keys, lambda node, node_keys: node.mget(node_keys, default, primary))
+
+    def mget_int(self, keys: list, default: Optional[int] = 0, primary: bool = False) -> list:
+        """Get several integers with one MGET per node."""
+        return self._gather(keys, lambda node, node_keys: node.mget_int(node_keys, default, primary))
+
+    def _gather(self, keys: list, fetch: Callable[[RedisClient, list], list]) -> list:
+        """Run a multi-key read per node and put the values back in key order."""
+        values = [None] * len(keys)
+        for node, positions in self._group(keys).items():
+            for position, value in zip(positions, fetch(node, [keys[position] for position in positions])):
+                values[position] = value
+        return values
+
+    def mset(self, mapping: dict) -> bool:
+        """Set several keys with one MSET per node; False if any node failed."""
+        keys = list(mapping)
+        results = [
+            node.mset({keys[position]: mapping[keys[position]] for position in positions})
+            for node, positions in self._group(keys).items()
+        ]
+        return all(results)
+
+    @contextmanager
+    def pipeline(self, transaction: bool = False) -> Iterator[RedisPipeline]:
+        """Queue commands and send one pipeline per node.
+
+        Each command goes to the node of its first key. ``results`` is None
+        if any node's batch failed, although other nodes may have applied
+        theirs. Transactions must stay on one node.
+
+        Args:
+            transaction: Wrap each node's commands in MULTI/EXEC
+
+        Yields:
+            RedisPipeline: Batch to queue commands on
+        """
+        batch = RedisPipeline(transaction=transaction)
+        yield batch
+        batch.results = self._execute_pipeline(batch)
+
+    def _execute_pipeline(self, batch: RedisPipeline) -> Optional[list]:
+        """Split a batch per node, execute the parts and merge the replies."""
+        parts = {}
+        for position, command in enumerate(batch.commands):
+            name, args, _ = command
+            keys = list(args[0]) if name == 'mset' and args else args[:1]
+            nodes = {self.node_for(key) for key in keys} or {self.node_for('')}
+            if len(nodes) > 1:
+                raise ValueError(f"Pipelined {name.upper()} spans several Redis nodes; use a hash tag")
+            node, = nodes
+            part = parts.setdefault(node, (RedisPipeline(transaction=batch.transaction), []))
+            part[0].commands.append(command)
+            part[1].append(position)
+        if batch.transaction and len(parts) > 1:
+            raise ValueError("A pipeline transaction cannot span several Redis nodes")
+
+        results = [None] * len(batch)
+        for node, (part, positions) in parts.items():
+            replies = node._execute_pipeline(part)
+            if replies is None:
+                return None
+            for position, reply in zip(positions, replies):
+                results[position] = reply
+        return results
+
+    def ping(self) -> bool:
+        """Check that every node is connected."""
+        return self.is_connected()
+
+    def close(self) -> None:
+        """Close every node."""
+        for node in self.nodes.values():
+            node.close()
+
+    def get_slow_commands(self, limit: Optional[int] = None) -> dict:
+        """Merged slow-command logs of all nodes, slowest first."""
+        logs = [node.get_slow_commands() for node in self.nodes.values()]
+        commands = sorted(
+            (entry for log in logs for entry in log['commands']),
+            key=lambda entry: entry['duration_ms'],
+            reverse=True
+        )
+        return {
+            'threshold_ms': logs[0]['threshold_ms'],
+            'commands': commands[:limit] if limit is not None else commands
+        }
+
+    def get_pool_stats(self) -> dict:
+        """Pool statistics summed over the nodes, with per-node stats and breaker state under ``nodes``."""
+        nodes = {
+            target: {**node.get_pool_stats(), 'state': node._breaker.state}
+            for target, node in self.nodes.items()
+        }
+        totals = {
+            field: sum(stats.get(field, 0) for stats in nodes.values())
+            for field in ('available', 'in_use', 'created', 'max_connections')
+        }
+        return {**totals, 'nodes': nodes}
+
+
 # Factory function for easier usage
 def create_redis_client(
     host: str,
     port: int,
     password: Optional[str] = None,
     db: int = 0,
+    shards: Optional[list] = None,
     **kwargs
 ) -> RedisClient:
     """Create and return a Redis client instance.
@@ -327,11 +2912,15 @@ def create_redis_client(
         port: Redis server port
         password: Redis password (optional)
         db: Redis database number
+        shards: (host, port) nodes to shard keys over instead of host and
+            port; returns a ShardedRedisClient
         **kwargs: Additional keyword arguments for RedisClient
 
     Returns:
         RedisClient: Configured Redis client instance
     """
+    if shards:
+        return ShardedRedisClient(shards, password=password, db=db, **kwargs)
     return RedisClient(
         host=host,
         port=port,
@@ -18,14 +18,25 @@ def fake_redis_client():
 @pytest.fixture
 def mock_redis_client(fake_redis_client):
     """Mock RedisClient with FakeRedis backend."""
-    from redis_client import RedisClient
+    from redis_client import CircuitBreaker, RedisClient, SlowCommandLog, ValueCodec
 
     with patch.object(RedisClient, '__init__', lambda self, **kwargs: None):
         client = RedisClient(host='localhost', port=6379)
         client._client = fake_redis_client
         client._pool = Mock()
+        client._bulkheads = {}
         client._is_connected = True
         client._connection_failures = 0
+        client._breaker = CircuitBreaker()
+        client._monitor = None
+        client._read_cache = None
+        client._invalidator = None
+        client._codec = ValueCodec()
+        client._slow_log = SlowCommandLog()
+        client._replicas = None
+        client._warmer = None
+        client._pid = os.getpid()
+        client._closed = False
 
         client.get_pool_stats = Mock(return_value={
             'available': 25,
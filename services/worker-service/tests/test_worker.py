@@ -27,6 +27,36 @@ class TestWorkerHealthChecks:
         assert 'status' in data
         assert data['status'] == 'alive'
 
+    def test_readiness_waits_for_redis_warm_up(self, client, mock_redis_client):
+        """Test that readiness reports not ready until Redis connections are warm."""
+        import worker
+
+        worker.last_task_time = time.time()
+        mock_redis_client._warmer = Mock(is_done=Mock(return_value=False))
+
+        with patch('worker.REDIS_PASSWORD', 'test-password'):
+            response = client.get('/health/ready')
+            assert response.status_code == 503
+            assert json.loads(response.data)['redis_warm'] is False
+
+            mock_redis_client._warmer.is_done.return_value = True
+            response = client.get('/health/ready')
+            assert response.status_code == 200
+            assert json.loads(response.data)['redis_warm'] is True
+
+    def test_readiness_does_not_wait_for_warm_up_without_redis(self, client, mock_redis_client):
+        """Test that a dev setup without Redis is ready while warm-up keeps retrying."""
+        import worker
+
+        worker.last_task_time = time.time()
+        mock_redis_client._warmer = Mock(is_done=Mock(return_value=False))
+
+        with patch('worker.REDIS_PASSWORD', ''):
+            response = client.get('/health/ready')
+
+        assert response.status_code == 200
+        assert json.loads(response.data)['redis_warm'] is False
+
 
 @pytest.mark.unit
 class TestWorkerStatus:
@@ -47,3 +77,167 @@ class TestWorkerStatus:
         assert 'available' in pool
         assert 'in_use' in pool
         assert 'max_connections' in pool
+
+    def test_status_reads_task_stats_in_one_round_trip(self, client, mock_redis_client):
+        """Test that task counters are fetched with a single MGET."""
+        fake = mock_redis_client._client
+        fake.set('worker:tasks:cleanup', 3)
+        fake.set('worker:tasks:health_check', 1)
+
+        with patch.object(fake, 'execute_command', wraps=fake.execute_command) as execute:
+            response = client.get('/status')
+
+        data = json.loads(response.data)
+        assert data['task_stats'] == {
+            'data_processing': 0,
+            'cleanup': 3,
+            'health_check': 1,
+            'metrics_collection': 0
+        }
+        assert [call.args[0] for call in execute.call_args_list] == ['MGET']
+
+    def test_status_serves_task_stats_from_read_cache(self, client, mock_redis_client):
+        """Test that cached counters skip Redis until a task updates them."""
+        import worker
+        from redis_client import ReadCache
+
+        mock_redis_client._read_cache = ReadCache(target='worker-test', ttl=60, prefixes=['worker:'])
+        mock_redis_client._read_cache.set_live(True)
+        fake = mock_redis_client._client
+        client.get('/status')
+
+        with patch.object(fake, 'execute_command', wraps=fake.execute_command) as execute:
+            data = json.loads(client.get('/status').data)
+        assert data['task_stats']['cleanup'] == 0
+        assert execute.call_count == 0
+
+        with patch('worker.random.choice', return_value='cleanup'), patch('worker.time.sleep'):
+            worker.process_task()
+        data = json.loads(client.get('/status').data)
+        assert data['task_stats']['cleanup'] == 1
+
+    def test_status_reports_instrumented_pool_usage(self):
+        """Test that /status reads pool usage from the instrumented pool."""
+        from functools import partial
+        import fakeredis
+        import worker
+        from redis_client import InstrumentedConnectionPool, RedisClient
+
+        fake_pool = partial(
+            InstrumentedConnectionPool,
+            connection_class=fakeredis.FakeRedisConnection,
+            server=fakeredis.FakeServer()
+        )
+        with patch('redis_client.InstrumentedConnectionPool', fake_pool):
+            redis_client = RedisClient(host='localhost', port=6379, max_connections=30, health_monitor=False)
+            redis_client.connect()
+        redis_client.set('worker:tasks:cleanup', 2)
+
+        with patch.object(worker, 'redis_client', redis_client):
+            data = json.loads(worker.app.test_client().get('/status').data)
+
+        assert data['task_stats']['cleanup'] == 2
+        assert data['redis_pool'] == {'available': 1, 'in_use': 0, 'max_connections': 30}
+
+
+@pytest.mark.unit
+class TestRedisPoolSize:
+    """Tests for sizing the Redis pool from the worker's concurrency."""
+
+    @pytest.mark.parametrize('budget,expected', [('', 8), ('20', 4)])
+    def test_pool_is_sized_from_worker_concurrency(self, monkeypatch, budget, expected):
+        """Test that the pool holds one connection per thread, within the pod's share of the budget."""
+        import importlib
+        import worker
+
+        monkeypatch.setenv('WORKER_CONCURRENCY', '6')
+        monkeypatch.setenv('WORKER_MAX_REPLICAS', '5')
+        monkeypatch.setenv('WORKER_REDIS_CONNECTION_BUDGET', budget)
+        with patch('redis_client.create_redis_client') as create_redis_client:
+            importlib.reload(worker)
+
+        assert worker.redis_pool_size == expected
+        assert create_redis_client.call_args.kwargs['max_connections'] == expected
+
+
+@pytest.mark.unit
+class TestSlowRedisCommands:
+    """Tests for the slow Redis command debug endpoint."""
+
+    def test_lists_slow_commands(self, client, mock_redis_client):
+        """Test that the client-side slow-command log is served."""
+        mock_redis_client._slow_log.record('MGET', 'worker:tasks:cleanup', 25_000_000)
+
+        data = json.loads(client.get('/debug/redis/slow-commands').data)
+
+        assert data['threshold_ms'] == 10.0
+        assert data['commands'][0]['command'] == 'MGET'
+        assert data['commands'][0]['duration_ms'] == 25.0
+
+
+@pytest.mark.unit
+class TestProcessTask:
+    """Tests for background task processing."""
+
+    def test_process_task_updates_redis_in_one_round_trip(self, app, mock_redis_client):
+        """Test that a task's counter and last-task keys are written in one pipeline."""
+        import worker
+
+        fake = mock_redis_client._client
+        with patch('worker.random.choice', return_value='cleanup'), patch('worker.time.sleep'), \
+                patch.object(fake, 'execute_command', wraps=fake.execute_command) as execute, \
+                patch.object(fake, 'pipeline', wraps=fake.pipeline) as pipeline:
+            worker.process_task()
+
+        assert execute.call_count == 0
+        assert pipeline.call_count == 1
+        assert fake.get('worker:tasks:cleanup') == '1'
+        assert fake.get('worker:last_task') == 'cleanup'
+        assert float(fake.get('worker:last_task_time')) > 0
+
+    def test_process_task_with_sharded_redis(self):
+        """Test that a task's keys may live on different nodes when Redis is sharded."""
+        import fakeredis
+        import worker
+        from redis_client import InstrumentedConnectionPool, ShardedRedisClient
+
+        nodes = [('redis-0', 6379), ('redis-1', 6379), ('redis-2', 6379)]
+        servers = {host: fakeredis.FakeServer() for host, _ in nodes}
+
+        def pool_factory(**kwargs):
+            return InstrumentedConnectionPool(
+                connection_class=fakeredis.FakeRedisConnection, server=servers[kwargs['host']], **kwargs)
+
+        with patch('redis_client.InstrumentedConnectionPool', side_effect=pool_factory):
+            sharded = ShardedRedisClient(nodes, health_monitor=False)
+            sharded.connect()
+        assert sharded.node_for('worker:last_task') is not sharded.node_for('worker:last_task_time')
+
+        worker.redis_client, previous = sharded, worker.redis_client
+        success = worker.TASKS_PROCESSED.labels(task_type='cleanup', status='success')._value.get()
+        started = time.time()
+        try:
+            with patch('worker.random.choice', return_value='cleanup'), patch('worker.time.sleep'):
+                worker.process_task()
+        finally:
+            worker.redis_client = previous
+            sharded.close()
+
+        assert worker.TASKS_PROCESSED.labels(task_type='cleanup', status='success')._value.get() == success + 1
+        assert worker.last_task_time >= started
+        stored = {}
+        for server in servers.values():
+            fake = fakeredis.FakeRedis(server=server, decode_responses=True)
+            stored.update({key: fake.get(key) for key in fake.keys()})
+        assert stored['worker:tasks:cleanup'] == '1'
+        assert stored['worker:last_task'] == 'cleanup'
+
+    def test_process_task_skips_redis_when_disconnected(self, app, mock_redis_client):
+        """Test that tasks still complete while Redis is down."""
+        import worker
+
+        mock_redis_client.is_connected = Mock(return_value=False)
+        with patch('worker.random.choice', return_value='cleanup'), patch('worker.time.sleep'):
+            worker.process_task()
+
+        assert mock_redis_client._client.get('worker:tasks:cleanup') is None
@@ -4,10 +4,10 @@ import time
 import os
 import random
 import threading
-from flask import Flask, jsonify
+from flask import Flask, jsonify, request
 import schedule
 from prometheus_client import Counter, Gauge, generate_latest, CONTENT_TYPE_LATEST
-from redis_client import RedisClient
+from redis_client import create_redis_client, parse_addresses, pool_size_for
 from structured_logger import setup_logger
 
 # Configuration
@@ -18,6 +18,28 @@ REDIS_HOST = os.getenv('REDIS_HOST', 'localhost')
 REDIS_PORT = int(os.getenv('REDIS_PORT', '6379'))
 REDIS_PASSWORD = os.getenv('REDIS_PASSWORD', '')
 REDIS_DB = int(os.getenv('REDIS_DB', '0'))
+# Local cache for worker:* reads such as /status task counters (0 disables)
+REDIS_READ_CACHE_SIZE = int(os.getenv('REDIS_READ_CACHE_SIZE', '0'))
+REDIS_READ_CACHE_TTL = float(os.getenv('REDIS_READ_CACHE_TTL', '1.0'))
+# Commands at least this slow are kept for /debug/redis/slow-commands
+REDIS_SLOW_COMMAND_MS = float(os.getenv('REDIS_SLOW_COMMAND_MS', '10'))
+# Read replicas as "host:port,host:port"; Sentinels, if set, discover both
+REDIS_REPLICAS = os.getenv('REDIS_REPLICAS', '')
+REDIS_SENTINELS = os.getenv('REDIS_SENTINELS', '')
+REDIS_SENTINEL_SERVICE = os.getenv('REDIS_SENTINEL_SERVICE', 'mymaster')
+# Shard keys over these nodes ("host:port,host:port") instead of REDIS_HOST
+REDIS_SHARDS = os.getenv('REDIS_SHARDS', '')
+# Connections opened before /health/ready reports ready
+REDIS_WARM_CONNECTIONS = int(os.getenv('REDIS_WARM_CONNECTIONS', '2'))
+# Close pool connections unused for this many seconds (0 keeps them open)
+REDIS_IDLE_TIMEOUT = float(os.getenv('REDIS_IDLE_TIMEOUT', '300'))
+# Threads that use Redis at once: the task scheduler plus concurrent
+# /status requests; sizes the Redis pool
+WORKER_CONCURRENCY = int(os.getenv('WORKER_CONCURRENCY', '4'))
+# Connections all worker pods together may open, shared over
+# WORKER_MAX_REPLICAS pods (the HPA maximum); empty for no cap
+WORKER_REDIS_CONNECTION_BUDGET = int(os.getenv('WORKER_REDIS_CONNECTION_BUDGET') or 0) or None
+WORKER_MAX_REPLICAS = int(os.getenv('WORKER_MAX_REPLICAS', '5'))
 APP_ENV = os.getenv('APP_ENV', 'development')
 LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
 
@@ -31,17 +53,37 @@ logger = setup_logger(
     use_json=True
 )
 
+# One pooled connection per thread using Redis, within this pod's share
+# of the worker deployment's connection budget
+redis_pool_size = pool_size_for(
+    threads=WORKER_CONCURRENCY,
+    replicas=WORKER_MAX_REPLICAS,
+    budget=WORKER_REDIS_CONNECTION_BUDGET
+)
+
 # Initialize Redis connection with connection pool
-redis_client = RedisClient(
+redis_client = create_redis_client(
     host=REDIS_HOST,
     port=REDIS_PORT,
     password=REDIS_PASSWORD if REDIS_PASSWORD else None,
     db=REDIS_DB,
-    max_connections=30,
+    shards=parse_addresses(REDIS_SHARDS),
+    max_connections=redis_pool_size,
     socket_timeout=5,
     socket_connect_timeout=5,
     retry_on_timeout=True,
-    health_check_interval=30
+    health_check_interval=30,
+    read_cache_size=REDIS_READ_CACHE_SIZE,
+    read_cache_ttl=REDIS_READ_CACHE_TTL,
+    read_cache_prefixes=['worker:'],
+    slow_command_threshold_ms=REDIS_SLOW_COMMAND_MS,
+    replicas=parse_addresses(REDIS_REPLICAS),
+    sentinels=parse_addresses(REDIS_SENTINELS, default_port=26379),
+    sentinel_service=REDIS_SENTINEL_SERVICE,
+    warm_connections=REDIS_WARM_CONNECTIONS,
+    idle_timeout=REDIS_IDLE_TIMEOUT or None,
+    # Health checks keep a connection of their own while tasks hold the pool
+    bulkheads={'health': {'max_connections': 1, 'socket_timeout': 2}}
 )
 
 # Prometheus metrics
@@ -82,6 +124,9 @@ REDIS_POOL_MAX = Gauge(
 )
 
 
+TASK_TYPES = ['data_processing', 'cleanup', 'health_check', 'metrics_collection']
+
+
 # Global state (protected by lock for thread safety)
 worker_running = True
 last_task_time = time.time()
@@ -107,7 +152,7 @@ def process_task():
     global last_task_time
 
     TASKS_IN_PROGRESS.inc()
-    task_type = random.choice(['data_processing', 'cleanup', 'health_check', 'metrics_collection'])
+    task_type = random.choice(TASK_TYPES)
 
     try:
         logger.info(f"Processing task: {task_type}")
@@ -116,11 +161,13 @@ def process_task():
         processing_time = random.uniform(0.1, 2.0)
         time.sleep(processing_time)
 
-        # Update Redis if connected
+        # Update Redis if connected, in one round trip (one per node when
+        # sharded, so every command names a single key)
         if update_redis_status():
-            redis_client.incr(f'worker:tasks:{task_type}')
-            redis_client.set('worker:last_task', task_type)
-            redis_client.set('worker:last_task_time', str(time.time()))
+            with redis_client.pipeline() as pipe:
+                pipe.incr(f'worker:tasks:{task_type}')
+                pipe.set('worker:last_task', task_type)
+                pipe.set('worker:last_task_time', time.time())
 
         # Record metrics
         TASKS_PROCESSED.labels(task_type=task_type, status='success').inc()
@@ -172,13 +219,17 @@ def readiness():
     with state_lock:
         time_since_last_task = time.time() - last_task_time
     redis_ready = update_redis_status()
+    redis_warm = redis_client.is_warm()
+    # Without a configured Redis (dev) warm-up would retry forever
+    warm_enough = redis_warm or not REDIS_PASSWORD
 
-    # Consider ready if last task was within 30 seconds
-    if time_since_last_task < 30:
+    # Consider ready if last task was within 30 seconds and Redis is warm
+    if time_since_last_task < 30 and warm_enough:
         return jsonify({
             'status': 'ready',
             'service': 'worker-service',
             'redis_connected': redis_ready,
+            'redis_warm': redis_warm,
             'last_task_seconds_ago': round(time_since_last_task, 2),
             'timestamp': time.time()
         }), 200
@@ -187,8 +238,9 @@ def readiness():
             'status': 'not_ready',
             'service': 'worker-service',
             'redis_connected': redis_ready,
+            'redis_warm': redis_warm,
             'last_task_seconds_ago': round(time_since_last_task, 2),
-            'message': 'No recent task processing',
+            'message': 'No recent task processing' if warm_enough else 'Redis connections warming up',
             'timestamp': time.time()
         }), 503
 
@@ -199,6 +251,13 @@ def metrics():
     return generate_latest(), 200, {'Content-Type': CONTENT_TYPE_LATEST}
 
 
+@app.route('/debug/redis/slow-commands', methods=['GET'])
+def slow_redis_commands():
+    """Recent Redis commands slower than REDIS_SLOW_COMMAND_MS, slowest first."""
+    limit = request.args.get('limit', type=int)
+    return jsonify(redis_client.get_slow_commands(limit)), 200
+
+
 @app.route('/status', methods=['GET'])
 def status():
     """Get worker status."""
@@ -209,9 +268,8 @@ def status():
     task_stats = {}
     if redis_ready:
         try:
-            for task_type in ['data_processing', 'cleanup', 'health_check', 'metrics_collection']:
-                count = redis_client.get(f'worker:tasks:{task_type}')
-                task_stats[task_type] = int(count) if count else 0
+            counts = redis_client.mget_int([f'worker:tasks:{task_type}' for task_type in TASK_TYPES])
+            task_stats = dict(zip(TASK_TYPES, counts))
         except Exception as e:
             logger.error(f"Error getting task stats from Redis: {e}")
 
@@ -239,6 +297,9 @@ if __name__ == '__main__':
     logger.info(f"Environment: {APP_ENV}")
     logger.info(f"Health check server on {HOST}:{PORT}")
 
+    # Connect and start warm-up before the health server takes probes
+    redis_client.connect()
+
     # Start scheduler in background thread
     scheduler_thread = threading.Thread(target=run_scheduler, daemon=True)
     scheduler_thread.start()